@@ -4,12 +4,18 @@ COMMANDS = {
     "status":                       "Display the current login status.",
     "menu":                         "Display the interactive menu.",
     "login":                        "Log in to the system.",
+    "run-script <file_path>":       "Run the commands of a script file in one session.",
+    "serve":                        "Start the read-only JSON API server.",
+    "sync":                         "Sync the offline replica with the central "
+                                    "database.",
 
     # --- Employee Administration (Management Role) ---
     "create-employee":              "Create a new employee.",
     "update-employee <employee_id>": "Update an existing employee.",
     "delete-employee <employee_id>": "Delete an employee.",
+    "audit <entity> <entity_id>":   "Show the change history of a record.",
     "list-employees":               "List all employees.",
+    "import-employees <file_path>": "Create employees from a CSV file.",
 
     # --- Client Management ---
     "create-client":                "Create a new client.",
@@ -20,6 +26,9 @@ COMMANDS = {
     "create-contract":              "Create a new contract.",
     "update-contract <contract_id>": "Update an existing contract.",
     "list-contracts":               "List all contracts.",
+    "record-payment <contract_id> <amount>": "Record a payment against a contract.",
+    "import-payments <file_path>":  "Import payments from a CSV file.",
+    "archive --before <date>":      "Archive the paid contracts and past events.",
 
     # --- Event Management ---
     "create-event":                 "Create a new event.",
@@ -1,5 +1,6 @@
 from EpicEventsCRM.utils.permissions import get_available_commands
 from auth import get_current_user
+from db import query_cache
 from rich.console import Console
 from rich.prompt import Prompt
 from rich.table import Table
@@ -90,6 +91,10 @@ def _get_user_choice(commands_keys: list) -> tuple:
 
                 if len(parts) > 1:
                     for arg_placeholder in parts[1:]:
+                        # Option name: its value is the next placeholder
+                        if arg_placeholder.startswith("--"):
+                            execution_args.append(arg_placeholder)
+                            continue
                         prompt_text = arg_placeholder.replace(
                             '<', '').replace('>', '').replace('_', ' ').title()
                         user_input = Prompt.ask(
@@ -110,6 +115,8 @@ def run_menu_loop(cli_runner: click.Group):
     This is the main public function that runs the interactive menu loop.
     It orchestrates the display, command retrieval, and execution.
     """
+    # Repeated list commands are served from memory until the data changes
+    query_cache.enable_query_cache()
     while True:
         # 1. Get user and display welcome panel
         employee = get_current_user()
@@ -0,0 +1,139 @@
+from EpicEventsCRM.views.messages import track_errors
+from auth import pinned_user
+from contextlib import contextmanager, nullcontext
+from rich.console import Console
+from rich.table import Table
+from rich import box
+import sentry_sdk
+import shlex
+import sys
+import io
+import click
+
+console = Console()
+
+# Commands that cannot run unattended or would change the session mid-script
+FORBIDDEN_IN_SCRIPTS = {"menu", "login", "logout", "run-script", "serve"}
+
+
+def _parse_line(line: str):
+    """Returns the arguments of a script line, or None for blanks and comments."""
+    stripped = line.strip()
+    if not stripped or stripped.startswith("#"):
+        return None
+    args = shlex.split(stripped, comments=True)
+    if args and args[0] == "epicevents":
+        args = args[1:]
+    return args or None
+
+
+def _report_error(line_number: int, line: str, message: str):
+    console.print(
+        f"[bold red]❌ Line {line_number}:[/bold red] [dim]{line.strip()}[/dim]\n"
+        f"   [red]{message}[/red]"
+    )
+
+
+def _run_line(cli_runner: click.Group, args: list):
+    """
+    Runs one command and returns an error message, or None on success.
+
+    A command fails if it raises, exits with a non-zero status or reports an
+    error (services print their errors instead of raising, see display_error).
+    """
+    if args[0] in FORBIDDEN_IN_SCRIPTS:
+        return f"'{args[0]}' cannot be used in a script."
+    try:
+        with track_errors() as errors:
+            # ctx.exit(n) returns n instead of raising without standalone mode
+            status = cli_runner.main(args=args, standalone_mode=False)
+    except click.ClickException as e:
+        return e.format_message()
+    except (click.exceptions.Abort, EOFError):
+        return "Aborted (input required)."
+    except SystemExit as e:
+        if e.code:
+            return f"Exited with status {e.code}."
+    except Exception as e:
+        sentry_sdk.capture_exception(e)
+        return str(e)
+    else:
+        if errors:
+            return errors[-1]
+        if isinstance(status, int) and status:
+            return f"Exited with status {status}."
+    return None
+
+
+@contextmanager
+def _no_input():
+    """
+    Gives the commands an empty stdin, so that a command prompting for input
+    aborts instead of reading the next lines of a script read from stdin.
+    """
+    stdin = sys.stdin
+    sys.stdin = io.StringIO()
+    try:
+        yield
+    finally:
+        sys.stdin = stdin
+
+
+def run_script(cli_runner: click.Group, lines, stop_on_error: bool = False,
+               from_stdin: bool = False) -> int:
+    """
+    Executes CLI commands, one per line, in the current process.
+
+    The interpreter, the database engine and its connection pool are shared by
+    all the commands, and the user is authenticated once for the whole script.
+    Errors are reported with their line number. Returns the number of failed
+    lines.
+
+    With ``from_stdin`` (``lines`` read from stdin), the commands cannot prompt
+    for input: the ones that would are reported as failed.
+    """
+    executed = 0
+    failed = 0
+    with pinned_user() as user:
+        if not user:
+            console.print(
+                "[bold red]❌ Authentication required. Please log in before "
+                "running a script.[/bold red]"
+            )
+            return 1
+
+        for line_number, line in enumerate(lines, start=1):
+            try:
+                args = _parse_line(line)
+            except ValueError as e:
+                error = f"Invalid syntax: {e}"
+            else:
+                if args is None:
+                    continue
+                with _no_input() if from_stdin else nullcontext():
+                    error = _run_line(cli_runner, args)
+
+            executed += 1
+            if error is None:
+                continue
+            failed += 1
+            _report_error(line_number, line, error)
+            if stop_on_error:
+                console.print("[bold yellow]Stopping at the first error.[/bold yellow]")
+                break
+
+    _display_summary(executed, failed)
+    return failed
+
+
+def _display_summary(executed: int, failed: int):
+    table = Table(
+        title="[bold cyan]Script Summary[/bold cyan]",
+        box=box.ROUNDED,
+        header_style="bold white",
+    )
+    table.add_column("Commands", justify="center", style="cyan")
+    table.add_column("Succeeded", justify="center", style="green")
+    table.add_column("Failed", justify="center", style="red")
+    table.add_row(str(executed), str(executed - failed), str(failed))
+    console.print(table)
@@ -2,4 +2,7 @@ from .employee_model import Employee, DepartmentEnum  # noqa
 from .client_model import Client  # noqa
 from .contract_model import Contract  # noqa
 from .event_model import Event  # noqa
+from .payment_model import Payment  # noqa
 from .base_model import Base  # noqa
+from .table_version_model import TableVersion  # noqa
+from .audit_log_model import AuditLog  # noqa
@@ -0,0 +1,31 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, Index
+from .base_model import Base, utcnow
+
+
+class AuditLog(Base):
+    """
+    Append-only trail of the changes made to the audited entities: one row
+    per created, updated or deleted row, with its changed fields.
+    """
+
+    __tablename__ = "audit_log"
+
+    audit_id = Column(Integer, primary_key=True, autoincrement=True)
+    entity = Column(String(20), nullable=False)
+    entity_id = Column(Integer, nullable=False)
+    changed_at = Column(DateTime, nullable=False, server_default=utcnow())
+    # No foreign key: the trail outlives the employees it mentions
+    employee_id = Column(Integer)
+    operation = Column(String(10), nullable=False)
+    # JSON object: field -> [old value, new value]
+    changes = Column(Text, nullable=False)
+
+    __table_args__ = (
+        Index("ix_audit_log_entity", "entity", "entity_id", "changed_at"),
+    )
+
+    def __repr__(self):
+        return (
+            f"<AuditLog {self.audit_id}: {self.operation} "
+            f"{self.entity} {self.entity_id}>"
+        )
@@ -1,3 +1,46 @@
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import FunctionElement
+from sqlalchemy import Column, DateTime
 
 Base = declarative_base()
+
+
+class utcnow(FunctionElement):
+    """Current UTC time, computed by the database."""
+
+    type = DateTime()
+    inherit_cache = True
+
+
+@compiles(utcnow)
+def _utcnow_default(element, compiler, **kw):
+    return "CURRENT_TIMESTAMP"
+
+
+@compiles(utcnow, "postgresql")
+def _utcnow_postgresql(element, compiler, **kw):
+    return "TIMEZONE('utc', CURRENT_TIMESTAMP)"
+
+
+@compiles(utcnow, "sqlite")
+def _utcnow_sqlite(element, compiler, **kw):
+    # Same text format as the datetimes stored by SQLAlchemy (microseconds
+    # included), so that comparisons with bound datetimes stay correct
+    return "(strftime('%Y-%m-%d %H:%M:%f000', 'now'))"
+
+
+class TimestampMixin:
+    """
+    Creation and modification timestamps, set by the database clock (UTC).
+
+    ``updated_at`` is refreshed by every ORM flush and every Core ``UPDATE``
+    issued by the application (the bulk update and payment paths included),
+    so ``updated_at >= :since`` selects the rows changed since a point in time.
+    """
+
+    created_at = Column(DateTime, nullable=False, server_default=utcnow(), index=True)
+    updated_at = Column(
+        DateTime, nullable=False, server_default=utcnow(), onupdate=utcnow(),
+        index=True,
+    )
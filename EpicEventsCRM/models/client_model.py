@@ -6,19 +6,24 @@ from ..utils.validators import (
 from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, event
 from sqlalchemy.orm import relationship, validates
 from datetime import datetime, timezone
-from .base_model import Base
+from .base_model import Base, TimestampMixin, utcnow
 
 
-class Client(Base):
+class Client(TimestampMixin, Base):
     __tablename__ = "clients"
 
     client_id = Column(Integer, primary_key=True, autoincrement=True)
-    full_name = Column(String(100), nullable=False)
+    full_name = Column(String(100), nullable=False, index=True)
     email = Column(String(120), unique=True, nullable=False)
     phone_number = Column(String(20), nullable=False)
-    company_name = Column(String(100), nullable=False)
-    date_created = Column(DateTime, default=datetime.now(timezone.utc))
-    last_contact_date = Column(DateTime, default=datetime.now(timezone.utc))
+    company_name = Column(String(100), nullable=False, index=True)
+    # Set by the database for each row, bulk inserts included
+    date_created = Column(DateTime, server_default=utcnow())
+    last_contact_date = Column(DateTime, server_default=utcnow(), index=True)
+
+    # Contrôle de concurrence optimiste
+    version_id = Column(Integer, nullable=False, server_default="1")
+    __mapper_args__ = {"version_id_col": version_id}
 
     sales_contact_id = Column(
         Integer, ForeignKey("employees.employee_id"), nullable=False
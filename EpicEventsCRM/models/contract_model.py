@@ -1,19 +1,23 @@
-from sqlalchemy import Column, Integer, Float, Boolean, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, Float, Boolean, DateTime, ForeignKey, Index
 from ..utils.validators import validate_positive_amount
 from sqlalchemy.orm import relationship, validates
-from datetime import datetime, timezone
-from .base_model import Base
+from .base_model import Base, TimestampMixin, utcnow
 
 
-class Contract(Base):
+class Contract(TimestampMixin, Base):
     __tablename__ = "contracts"
 
     contract_id = Column(Integer, primary_key=True, autoincrement=True)
     total_amount = Column(Float, nullable=False)
     remaining_amount = Column(Float, nullable=False)
-    date_created = Column(DateTime, default=datetime.now(timezone.utc))
+    # Set by the database for each row, bulk inserts included
+    date_created = Column(DateTime, server_default=utcnow())
     is_signed = Column(Boolean, default=False)
 
+    # Contrôle de concurrence optimiste
+    version_id = Column(Integer, nullable=False, server_default="1")
+    __mapper_args__ = {"version_id_col": version_id}
+
     client_id = Column(Integer, ForeignKey("clients.client_id"), nullable=False)
     client = relationship("Client", back_populates="contracts")
 
@@ -24,6 +28,33 @@ class Contract(Base):
 
     # Relations
     events = relationship("Event", back_populates="contract")
+    payments = relationship("Payment", back_populates="contract")
+
+    # Set by the archive command: archived contracts are left out of the lists
+    archived_at = Column(DateTime)
+
+    # Index partiel utilisé par le filtre --not-paid
+    __table_args__ = (
+        Index(
+            "ix_contracts_not_paid",
+            "contract_id",
+            postgresql_where=remaining_amount > 0,
+            sqlite_where=remaining_amount > 0,
+        ),
+        # Only the active contracts: these indexes do not grow with the history
+        Index(
+            "ix_contracts_active",
+            "contract_id",
+            postgresql_where=archived_at.is_(None),
+            sqlite_where=archived_at.is_(None),
+        ),
+        Index(
+            "ix_contracts_active_sales_contact",
+            "sales_contact_id",
+            postgresql_where=archived_at.is_(None),
+            sqlite_where=archived_at.is_(None),
+        ),
+    )
 
     # Validation des champs
     @validates("total_amount", "remaining_amount")
@@ -6,7 +6,7 @@ from ..utils.validators import (
 from sqlalchemy import Column, String, Integer, Enum
 from sqlalchemy.orm import relationship, validates
 from argon2 import PasswordHasher
-from .base_model import Base
+from .base_model import Base, TimestampMixin
 import argon2.exceptions
 import enum
 
@@ -14,23 +14,32 @@ import enum
 ph = PasswordHasher()
 
 
+def hash_password(password):
+    """Returns the argon2 hash of a password."""
+    return ph.hash(password)
+
+
 class DepartmentEnum(enum.Enum):
     COMMERCIAL = "Commercial"
     SUPPORT = "Support"
     MANAGEMENT = "Management"
 
 
-class Employee(Base):
+class Employee(TimestampMixin, Base):
     __tablename__ = "employees"
 
     employee_id = Column(Integer, primary_key=True, autoincrement=True)
     first_name = Column(String(50), nullable=False)
-    last_name = Column(String(50), nullable=False)
+    last_name = Column(String(50), nullable=False, index=True)
     email = Column(String(120), unique=True, nullable=False)
     password_hash = Column(String(200), nullable=False)
     phone_number = Column(String(20), nullable=False)
     department = Column(Enum(DepartmentEnum), nullable=False)
 
+    # Contrôle de concurrence optimiste
+    version_id = Column(Integer, nullable=False, server_default="1")
+    __mapper_args__ = {"version_id_col": version_id}
+
     # Relations
     clients = relationship("Client", back_populates="sales_contact")
     contracts = relationship("Contract", back_populates="sales_contact")
@@ -38,7 +47,7 @@ class Employee(Base):
 
     # Password management
     def set_password(self, password):
-        self.password_hash = ph.hash(password)
+        self.password_hash = hash_password(password)
 
     def verify_password(self, password):
         if isinstance(self.password_hash, Column):
@@ -1,21 +1,25 @@
 from ..utils.validators import validate_string_length, validate_positive_integer
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship, validates
 from datetime import datetime, timezone
-from .base_model import Base
+from .base_model import Base, TimestampMixin
 
 
-class Event(Base):
+class Event(TimestampMixin, Base):
     __tablename__ = "events"
 
     event_id = Column(Integer, primary_key=True, autoincrement=True)
     event_name = Column(String(100), nullable=False)
-    event_start_date = Column(DateTime, nullable=False)
+    event_start_date = Column(DateTime, nullable=False, index=True)
     event_end_date = Column(DateTime, nullable=False)
     location = Column(String(200), nullable=False)
     attendees = Column(Integer, nullable=False)
     notes = Column(String(1000))
 
+    # Contrôle de concurrence optimiste
+    version_id = Column(Integer, nullable=False, server_default="1")
+    __mapper_args__ = {"version_id_col": version_id}
+
     client_id = Column(Integer, ForeignKey("clients.client_id"), nullable=False)
     client = relationship("Client", back_populates="events")
 
@@ -27,6 +31,26 @@ class Event(Base):
     )
     support_contact = relationship("Employee", back_populates="events")
 
+    # Set by the archive command: archived events are left out of the lists
+    archived_at = Column(DateTime)
+
+    __table_args__ = (
+        # Only the active events: these indexes do not grow with the history
+        Index(
+            "ix_events_active_start_date",
+            "event_start_date",
+            "event_id",
+            postgresql_where=archived_at.is_(None),
+            sqlite_where=archived_at.is_(None),
+        ),
+        Index(
+            "ix_events_active_support_contact",
+            "support_contact_id",
+            postgresql_where=archived_at.is_(None),
+            sqlite_where=archived_at.is_(None),
+        ),
+    )
+
     # Validation des champs
     @validates("event_name")
     def validate_event_name(self, key, value):
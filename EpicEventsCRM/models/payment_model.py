@@ -0,0 +1,31 @@
+from sqlalchemy import Column, Integer, Float, DateTime, ForeignKey, func
+from ..utils.validators import validate_positive_amount
+from sqlalchemy.orm import relationship, validates
+from .base_model import Base, TimestampMixin
+
+
+class Payment(TimestampMixin, Base):
+    __tablename__ = "payments"
+
+    payment_id = Column(Integer, primary_key=True, autoincrement=True)
+    amount = Column(Float, nullable=False)
+    payment_date = Column(DateTime, nullable=False, server_default=func.now())
+
+    contract_id = Column(
+        Integer, ForeignKey("contracts.contract_id"), nullable=False, index=True
+    )
+    contract = relationship("Contract", back_populates="payments")
+
+    recorded_by_id = Column(Integer, ForeignKey("employees.employee_id"))
+    recorded_by = relationship("Employee")
+
+    # Validation des champs
+    @validates("amount")
+    def validate_amount(self, key, value):
+        return validate_positive_amount(value, key)
+
+    def __repr__(self):
+        return (
+            f"<Payment {self.payment_id}: {self.amount} "
+            f"on Contract {self.contract_id}>"
+        )
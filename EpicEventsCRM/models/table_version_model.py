@@ -0,0 +1,17 @@
+from sqlalchemy import Column, Integer, String
+from .base_model import Base
+
+
+class TableVersion(Base):
+    """
+    Write counter of a table, incremented by every transaction that changes
+    it. Lets a process know whether its cached query results are still valid.
+    """
+
+    __tablename__ = "table_versions"
+
+    table_name = Column(String(50), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<TableVersion {self.table_name}: {self.version}>"
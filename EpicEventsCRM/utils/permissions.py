@@ -9,6 +9,7 @@ ROLE_PERMISSIONS = {
         "create_client",
         "update_client",
         "update_contract",
+        "record_payment",
         "create_event",
         "list_clients",
         "list_contracts",
@@ -16,11 +17,16 @@ ROLE_PERMISSIONS = {
     },
     "Management": {
         "create_employee",
+        "import_employees",
         "update_employee",
         "delete_employee",
         "list_employees",
         "create_contract",
         "update_contract",
+        "record_payment",
+        "import_payments",
+        "archive",
+        "audit",
         "update_event",
         "assign_support",
         "list_clients",
@@ -62,7 +68,7 @@ def get_available_commands(employee: Employee) -> list:
         A list of (command_name, description) tuples for available commands.
     """
     commands = get_command_list()
-    always_available = {"menu", "logout", "status"}
+    always_available = {"menu", "logout", "status", "run-script", "sync"}
 
     available_commands = []
     for command, description in commands.items():
@@ -0,0 +1,145 @@
+from contextlib import contextmanager
+import threading
+import tempfile
+import hashlib
+import socket
+import json
+import math
+import time
+import os
+
+try:
+    import fcntl
+except ImportError:  # Windows: only the threads of a process are serialized
+    fcntl = None
+
+
+# Local file keeping the login attempt counters of this machine
+LOGIN_ATTEMPTS_FILE = os.getenv("LOGIN_ATTEMPTS_FILE", ".epicevents_login_attempts")
+
+# Token buckets: (capacity, seconds to regain one attempt)
+LOGIN_RATE_RULES = {
+    # Attempts for one email, whatever the outcome
+    "email": (5, 60),
+    # Attempts from this host, whatever the email
+    "host": (20, 10),
+}
+
+# Consecutive failures for an email before each new one doubles the wait
+BACKOFF_AFTER = 3
+BACKOFF_BASE_SECONDS = 2
+BACKOFF_MAX_SECONDS = 900
+
+
+class LoginThrottledError(Exception):
+    """Raised when a login attempt is refused before the password is checked."""
+
+    def __init__(self, retry_after: float):
+        self.retry_after = retry_after
+        super().__init__(
+            f"Too many login attempts. Try again in {math.ceil(retry_after)} s."
+        )
+
+
+def _key(kind: str, value: str) -> str:
+    # Hashed: the file holds no email address
+    return f"{kind}:{hashlib.sha256(value.encode()).hexdigest()[:16]}"
+
+
+class LoginRateLimiter:
+    """
+    Per-email and per-host token buckets, plus an exponential backoff after
+    repeated failures for an email.
+
+    Each counter is stored as ``[tokens, refilled_at, failures, blocked_until]``
+    in a JSON file shared by the processes of the host (or in memory when
+    ``path`` is None). Full, failure-free counters are dropped.
+    """
+
+    def __init__(self, path: str = LOGIN_ATTEMPTS_FILE, rules: dict = None,
+                 clock=time.time):
+        self.path = path
+        self.rules = rules or LOGIN_RATE_RULES
+        self.clock = clock
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def _state(self):
+        """Yields the counters; they are saved if the block does not raise."""
+        with self._lock:
+            if self.path is None:
+                yield self._counters
+                return
+            with open(f"{self.path}.lock", "a") as lock_file:
+                if fcntl:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    with open(self.path, "r") as f:
+                        counters = json.load(f)
+                except (FileNotFoundError, ValueError):
+                    counters = {}
+                yield counters
+                fd, temp_path = tempfile.mkstemp(
+                    dir=os.path.dirname(os.path.abspath(self.path))
+                )
+                with os.fdopen(fd, "w") as f:
+                    json.dump(counters, f, separators=(",", ":"))
+                os.replace(temp_path, self.path)
+
+    def _refill(self, counters: dict, key: str, kind: str, now: float) -> list:
+        capacity, refill_seconds = self.rules[kind]
+        tokens, refilled_at, failures, blocked_until = counters.get(
+            key, (capacity, now, 0, 0)
+        )
+        tokens = min(capacity, tokens + (now - refilled_at) / refill_seconds)
+        counters[key] = [round(tokens, 3), round(now, 3), failures, blocked_until]
+        return counters[key]
+
+    def _prune(self, counters: dict, now: float):
+        for key in list(counters):
+            tokens, refilled_at, failures, blocked_until = counters[key]
+            capacity, refill_seconds = self.rules[key.split(":")[0]]
+            if (
+                not failures and blocked_until <= now
+                and tokens + (now - refilled_at) / refill_seconds >= capacity
+            ):
+                del counters[key]
+
+    def acquire(self, email: str, host: str = None):
+        """
+        Takes one attempt from the buckets of ``email`` and ``host`` (this
+        machine by default), or raises LoginThrottledError without taking any.
+        """
+        now = self.clock()
+        with self._state() as counters:
+            self._prune(counters, now)
+            entries = [
+                (self._refill(counters, _key(kind, value), kind, now), kind)
+                for kind, value in (("email", email.lower()),
+                                    ("host", host or socket.gethostname()))
+            ]
+            retry_after = max(
+                max((1 - entry[0]) * self.rules[kind][1], entry[3] - now)
+                for entry, kind in entries
+            )
+            if retry_after > 0:
+                raise LoginThrottledError(retry_after)
+            for entry, _ in entries:
+                entry[0] -= 1
+
+    def record_failure(self, email: str):
+        now = self.clock()
+        with self._state() as counters:
+            entry = self._refill(counters, _key("email", email.lower()), "email", now)
+            entry[2] += 1
+            if entry[2] >= BACKOFF_AFTER:
+                delay = BACKOFF_BASE_SECONDS * 2 ** (entry[2] - BACKOFF_AFTER)
+                entry[3] = round(now + min(delay, BACKOFF_MAX_SECONDS), 3)
+
+    def record_success(self, email: str):
+        now = self.clock()
+        with self._state() as counters:
+            entry = self._refill(counters, _key("email", email.lower()), "email", now)
+            entry[2] = 0
+            entry[3] = 0
@@ -0,0 +1,39 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from rich.console import Console
+from rich.panel import Panel
+from rich import box
+
+
+console = Console()
+
+# Errors reported by the command running in the current context, if tracked
+_reported_errors: ContextVar = ContextVar("reported_errors", default=None)
+
+
+def record_error(message: str):
+    """
+    Marks the running command as failed. The services call it (through
+    display_error) when they stop on an error, as they report errors by
+    printing them rather than raising.
+    """
+    errors = _reported_errors.get()
+    if errors is not None:
+        errors.append(message)
+
+
+def display_error(message: str):
+    """Prints ``message`` in a red panel and marks the command as failed."""
+    console.print(Panel(f"[bold red]{message}[/bold red]", box=box.ROUNDED))
+    record_error(message)
+
+
+@contextmanager
+def track_errors():
+    """Yields the list of the errors recorded by the commands run inside."""
+    errors = []
+    token = _reported_errors.set(errors)
+    try:
+        yield errors
+    finally:
+        _reported_errors.reset(token)
@@ -1,17 +1,27 @@
-from config import JWT_SECRET, JWT_ALGORITHM, JWT_EXP_DELTA_SECONDS
+from config import (
+    JWT_SECRET, JWT_ALGORITHM, JWT_EXP_DELTA_SECONDS, JWT_REFRESH_EXP_DELTA_SECONDS,
+)
 from EpicEventsCRM.utils.permissions import has_permission
+from EpicEventsCRM.utils.rate_limiter import LoginRateLimiter, LoginThrottledError
 from EpicEventsCRM.utils.validators import validate_email
-from EpicEventsCRM.models.employee_model import Employee
+from EpicEventsCRM.models.employee_model import Employee, ph
 from datetime import datetime, timedelta, timezone
-from sqlalchemy.orm import joinedload
+from contextlib import contextmanager
+from services.composite_queries import count_related_records
+from sqlalchemy import select, bindparam
 from rich.progress import Progress
 from rich.console import Console
 from rich.prompt import Prompt
 from db.database import get_db
+from db import audit
 from rich.panel import Panel
+from functools import lru_cache
 from getpass import getpass
 from rich import box
+import argon2.exceptions
 import sentry_sdk
+import tempfile
+import json
 import time
 import jwt
 import os
@@ -19,24 +29,110 @@ import os
 
 console = Console()
 
-# File to store the JWT token locally
+# File to store the JWT tokens locally
 TOKEN_FILE = ".epicevents_token"
 
+# Employee resolved once for a whole batch of commands (see pinned_user)
+_pinned_user = None
+
+# (path, stat signature, tokens) of the last token file read or written
+_token_file_cache = None
+
+# Login attempts allowed per email and per host
+login_limiter = LoginRateLimiter()
+
+# Lookups run by every command or login, built once: their compiled SQL is
+# reused from the statement cache, with only the parameter changing
+EMPLOYEE_BY_EMAIL = select(Employee).where(Employee.email == bindparam("email"))
+EMPLOYEE_BY_ID = select(Employee).where(
+    Employee.employee_id == bindparam("employee_id")
+)
+
+# Hash of a random password, with the parameters of ph: checked against the
+# passwords given for unknown emails, so they take as long as known ones
+DUMMY_PASSWORD_HASH = (
+    "$argon2id$v=19$m=65536,t=3,p=4$TIBoPjnbQDqWBrTiHiIHPg"
+    "$Pga9D8x756pXiTmu9qqsFRAy7lNbmaf3ob3rUj5Z9do"
+)
+
+
+def _issue_token(employee_id: int, token_type: str, lifetime: int) -> str:
+    payload = {
+        "employee_id": employee_id,
+        "type": token_type,
+        "exp": datetime.now(timezone.utc) + timedelta(seconds=lifetime),
+    }
+    return jwt.encode(payload, JWT_SECRET, algorithm=JWT_ALGORITHM)
+
 
 def authenticate(email: str, password: str):
-    """Authenticates a user and returns a JWT token if successful."""
+    """
+    Authenticates a user and returns ``(access token, refresh token)`` if
+    successful, None otherwise. Raises LoginThrottledError, before any
+    password check, when too many attempts were made.
+    """
+    email = email.lower()
+    login_limiter.acquire(email)
     db = next(get_db())
     try:
-        employee = db.query(Employee).filter_by(email=email.lower()).first()
-        if employee and employee.verify_password(password):
-            payload = {
-                "employee_id": employee.employee_id,
-                "exp": datetime.now(timezone.utc)
-                + timedelta(seconds=JWT_EXP_DELTA_SECONDS),
-            }
-            token = jwt.encode(payload, JWT_SECRET, algorithm=JWT_ALGORITHM)
-            return token
+        employee = db.scalar(EMPLOYEE_BY_EMAIL, {"email": email})
+        if employee is None:
+            try:
+                ph.verify(DUMMY_PASSWORD_HASH, password)
+            except argon2.exceptions.VerifyMismatchError:
+                pass
+        elif employee.verify_password(password):
+            login_limiter.record_success(email)
+            return (
+                _issue_token(employee.employee_id, "access", JWT_EXP_DELTA_SECONDS),
+                _issue_token(employee.employee_id, "refresh",
+                             JWT_REFRESH_EXP_DELTA_SECONDS),
+            )
+        login_limiter.record_failure(email)
+        return None
+    except Exception as e:
+        sentry_sdk.capture_exception(e)
+        return None
+    finally:
+        db.close()
+
+
+@lru_cache(maxsize=64)
+def _verified_claims(token: str) -> dict:
+    # The signature of a token never changes: it is only checked once
+    return jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
+
+
+def _claims(token: str, token_type: str = "access") -> dict:
+    """
+    Returns the claims of a token of ``token_type``, raising the errors of
+    jwt.decode. The expiry is checked on every call.
+    """
+    claims = _verified_claims(token)
+    if "exp" in claims and claims["exp"] <= time.time():
+        raise jwt.ExpiredSignatureError("Signature has expired")
+    # Tokens issued before refresh tokens existed have no type
+    if claims.get("type", "access") != token_type:
+        raise jwt.InvalidTokenError(f"Not an {token_type} token")
+    return claims
+
+
+def verify_token(token: str):
+    """
+    Verify a JWT access token and return its claims, or None if it is expired
+    or invalid. Unlike decode_token, it has no side effect on the session.
+    """
+    try:
+        return _claims(token)
+    except jwt.InvalidTokenError:
         return None
+
+
+def get_employee(employee_id: int):
+    """Load an employee by ID, without its related records."""
+    db = next(get_db())
+    try:
+        return db.get(Employee, employee_id)
     except Exception as e:
         sentry_sdk.capture_exception(e)
         return None
@@ -45,10 +141,16 @@ def authenticate(email: str, password: str):
 
 
 def decode_token(token: str):
-    """Decode JWT token and handle exceptions for expired or invalid tokens."""
+    """
+    Decode JWT token and handle exceptions for expired or invalid tokens. An
+    expired access token is silently renewed with the stored refresh token.
+    """
     try:
-        return jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
+        return _claims(token)
     except jwt.ExpiredSignatureError:
+        payload = refresh_access_token()
+        if payload:
+            return payload
         console.print("[bold red]❌ Session expired. Please log in again.[/bold red]")
         delete_token()
         return None
@@ -58,19 +160,72 @@ def decode_token(token: str):
         return None
 
 
-def save_token(token: str):
-    """Save the JWT token to a local file."""
-    with open(TOKEN_FILE, "w") as f:
-        f.write(token)
+def refresh_access_token():
+    """
+    Issues a new access token from the stored refresh token and saves it.
+    Returns its claims, or None if there is no valid refresh token.
+    """
+    refresh_token = _read_token_file().get("refresh_token")
+    if not refresh_token:
+        return None
+    try:
+        employee_id = _claims(refresh_token, "refresh")["employee_id"]
+    except jwt.InvalidTokenError:
+        return None
+    token = _issue_token(employee_id, "access", JWT_EXP_DELTA_SECONDS)
+    save_token(token, refresh_token)
+    return _claims(token)
 
 
-def load_token():
-    """Load JWT token from a local file."""
+def _file_signature(path: str):
+    stat = os.stat(path)
+    return (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+
+def _read_token_file() -> dict:
+    """
+    Returns the tokens of the token file (``{}`` if there is none). The file
+    is only read again when its stat signature changes.
+    """
+    global _token_file_cache
+    try:
+        signature = _file_signature(TOKEN_FILE)
+    except FileNotFoundError:
+        return {}
+    if _token_file_cache and _token_file_cache[:2] == (TOKEN_FILE, signature):
+        return _token_file_cache[2]
     try:
         with open(TOKEN_FILE, "r") as f:
-            return f.read()
+            content = f.read()
     except FileNotFoundError:
-        return None
+        return {}
+    try:
+        tokens = json.loads(content)
+    except ValueError:
+        # File written before refresh tokens: the access token alone
+        tokens = {"access_token": content.strip()}
+    _token_file_cache = (TOKEN_FILE, signature, tokens)
+    return tokens
+
+
+def save_token(token: str, refresh_token: str = None):
+    """Save the JWT tokens to a local file."""
+    global _token_file_cache
+    tokens = {"access_token": token}
+    if refresh_token:
+        tokens["refresh_token"] = refresh_token
+    # Written then renamed: the new file has a new inode, so the stat cache
+    # of every process sees the change
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(TOKEN_FILE)))
+    with os.fdopen(fd, "w") as f:
+        json.dump(tokens, f)
+    os.replace(temp_path, TOKEN_FILE)
+    _token_file_cache = (TOKEN_FILE, _file_signature(TOKEN_FILE), tokens)
+
+
+def load_token():
+    """Load the JWT access token from a local file."""
+    return _read_token_file().get("access_token")
 
 
 def delete_token():
@@ -81,23 +236,18 @@ def delete_token():
 
 def get_current_user():
     """Retrieve the currently authenticated user from the stored token."""
+    if _pinned_user is not None:
+        return _pinned_user
     token = load_token()
     if token:
         payload = decode_token(token)
         if payload:
             employee_id = payload.get("employee_id")
+            # The changes made by this command are audited under this employee
+            audit.set_actor(employee_id)
             db = next(get_db())
             try:
-                return (
-                    db.query(Employee)
-                    .options(
-                        joinedload(Employee.clients),
-                        joinedload(Employee.contracts),
-                        joinedload(Employee.events),
-                    )
-                    .filter_by(employee_id=employee_id)
-                    .first()
-                )
+                return db.scalar(EMPLOYEE_BY_ID, {"employee_id": employee_id})
             except Exception as e:
                 sentry_sdk.capture_exception(e)
                 return None
@@ -106,6 +256,21 @@ def get_current_user():
     return None
 
 
+@contextmanager
+def pinned_user():
+    """
+    Resolves the current user once (token read, JWT verification and database
+    lookup) and returns that same employee from get_current_user() until the
+    block exits. Used to run many commands in one authenticated session.
+    """
+    global _pinned_user
+    _pinned_user = get_current_user()
+    try:
+        yield _pinned_user
+    finally:
+        _pinned_user = None
+
+
 def is_authorized(permission_name: str):
     """Check if the current user has the specified permission."""
     employee = get_current_user()
@@ -152,9 +317,15 @@ def login():
                 time.sleep(0.1)
                 progress.update(task, advance=10)
 
-        token = authenticate(email, password)
-        if token:
-            save_token(token)
+        try:
+            tokens = authenticate(email, password)
+        except LoginThrottledError as e:
+            console.print(
+                Panel(f"⏳ [bold red]{e}[/bold red]", box=box.DOUBLE, style="red")
+            )
+            return
+        if tokens:
+            save_token(*tokens)
             user = get_current_user()
 
             if user:
@@ -224,6 +395,10 @@ def status():
     """Displays the login status of the current user."""
     user = get_current_user()
     if user:
+        try:
+            counts = count_related_records(user.employee_id)
+        except Exception:
+            counts = {"clients": "?", "contracts": "?", "events": "?"}
         console.print(
             Panel(
                 f"✅ [bold green]Logged in as[/bold green]\n"
@@ -232,9 +407,9 @@ def status():
                 f"[bold cyan]Email:[/bold cyan] {user.email}\n"
                 f"[bold cyan]Phone Number:[/bold cyan] {user.phone_number}\n\n"
                 f"[bold magenta]Related Data:[/bold magenta]\n"
-                f"- Clients: {len(user.clients)}\n"
-                f"- Contracts: {len(user.contracts)}\n"
-                f"- Events: {len(user.events)}",
+                f"- Clients: {counts['clients']}\n"
+                f"- Contracts: {counts['contracts']}\n"
+                f"- Events: {counts['events']}",
                 box=box.ROUNDED,
                 style="bold green",
             )
@@ -0,0 +1,315 @@
+"""
+Standalone benchmark suite of the data-access, rendering, authentication
+and bulk write paths, run against a database filled by scripts/seed_data.py.
+
+    python -m benchmarks.run_benchmarks --scale 1k --output results.json
+    python -m benchmarks.run_benchmarks --scale 1k --compare benchmarks/baseline.json
+"""
+from scripts.seed_data import SCALES
+from datetime import datetime, timezone
+from contextlib import contextmanager
+from rich.console import Console
+from rich.markup import escape
+from rich.table import Table
+from rich import box
+import statistics
+import platform
+import tempfile
+import time
+import json
+import sys
+import os
+import click
+import io
+
+
+console = Console()
+
+# Rendering a Rich table of more rows than this is not a realistic use case
+RENDER_MAX_ROWS = 100_000
+
+# Rows written by each bulk benchmark (always rolled back)
+BULK_ROWS = 1_000
+
+# Lookups timed by each lookup benchmark, in one session
+LOOKUP_CALLS = 100
+
+
+@contextmanager
+def _rolled_back(get_db):
+    db = next(get_db())
+    try:
+        yield db
+    finally:
+        db.rollback()
+        db.close()
+
+
+def _time(func, rounds: int) -> dict:
+    """Runs ``func`` once to warm up, then ``rounds`` times, and returns timings."""
+    func()
+    durations = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        func()
+        durations.append((time.perf_counter() - started) * 1000)
+    return {
+        "median_ms": round(statistics.median(durations), 3),
+        "min_ms": round(min(durations), 3),
+        "max_ms": round(max(durations), 3),
+        "rounds": rounds,
+    }
+
+
+def build_benchmarks(counts: dict) -> dict:
+    """Returns ``{name: callable}``; imported late, once DATABASE_URL is set."""
+    from EpicEventsCRM.models.employee_model import Employee, DepartmentEnum
+    from EpicEventsCRM.models.contract_model import Contract
+    from EpicEventsCRM.utils.rate_limiter import LoginRateLimiter
+    from EpicEventsCRM.models.client_model import Client
+    from services.payment_service import apply_payment_batch
+    from services.updates import apply_field_updates
+    from services import data_access, list_services
+    from scripts.seed_data import seed, scale_counts, SEED_PASSWORD
+    from config import JWT_SECRET, JWT_ALGORITHM
+    from db.database import get_db
+    from sqlalchemy import select
+    import auth
+    import jwt
+
+    db = next(get_db())
+    users = {
+        department: db.scalars(
+            select(Employee).where(Employee.department == department)
+            .order_by(Employee.employee_id).limit(1)
+        ).one()
+        for department in DepartmentEnum
+    }
+    contract_ids = db.scalars(
+        select(Contract.contract_id)
+        .where(Contract.remaining_amount >= 1)
+        .order_by(Contract.contract_id).limit(BULK_ROWS)
+    ).all()
+    client_ids = db.scalars(
+        select(Client.client_id).order_by(Client.client_id).limit(BULK_ROWS)
+    ).all()
+    db.close()
+    manager = users[DepartmentEnum.MANAGEMENT]
+    support = users[DepartmentEnum.SUPPORT]
+
+    # get_current_user reads the token from this process, not the token file
+    token = jwt.encode(
+        {"employee_id": manager.employee_id,
+         "exp": datetime.now(timezone.utc).timestamp() + 3600},
+        JWT_SECRET, algorithm=JWT_ALGORITHM,
+    )
+    auth.load_token = lambda: token
+    # Repeated logins would be throttled: unlimited buckets, kept in memory
+    auth.login_limiter = LoginRateLimiter(
+        path=None, rules={"email": (float("inf"), 1), "host": (float("inf"), 1)}
+    )
+    data_access.get_current_user = lambda: manager
+    list_services.console = Console(file=io.StringIO(), width=200)
+
+    def bulk_payments():
+        with _rolled_back(get_db) as session:
+            apply_payment_batch(session, [(cid, 1) for cid in contract_ids])
+
+    def bulk_field_updates():
+        with _rolled_back(get_db) as session:
+            apply_field_updates(session, Client, [
+                (None, cid, {"company_name": f"Renamed {cid}"}) for cid in client_ids
+            ])
+
+    def bulk_seed():
+        with _rolled_back(get_db) as session:
+            seed(session, scale_counts(BULK_ROWS))
+
+    def query_lookups():
+        # The legacy Query API, rebuilt on each call, for comparison
+        with _rolled_back(get_db) as session:
+            for _ in range(LOOKUP_CALLS):
+                session.query(Employee).filter_by(email=manager.email).first()
+                session.expunge_all()
+
+    def statement_lookups():
+        with _rolled_back(get_db) as session:
+            for _ in range(LOOKUP_CALLS):
+                session.scalar(auth.EMPLOYEE_BY_EMAIL, {"email": manager.email})
+                session.expunge_all()
+
+    benchmarks = {
+        "get_current_user": auth.get_current_user,
+        f"lookup[{LOOKUP_CALLS}x, legacy query]": query_lookups,
+        f"lookup[{LOOKUP_CALLS}x, module select]": statement_lookups,
+        "authenticate": lambda: auth.authenticate(manager.email, SEED_PASSWORD),
+        "get_all_clients": lambda: data_access.get_all_clients(current_user=manager),
+        "get_all_contracts": lambda: data_access.get_all_contracts(
+            current_user=manager),
+        "get_all_contracts[not_signed]": lambda: data_access.get_all_contracts(
+            not_signed=True, current_user=manager),
+        "get_all_contracts[not_paid]": lambda: data_access.get_all_contracts(
+            not_paid=True, current_user=manager),
+        "get_all_contracts[not_signed,not_paid]": lambda: data_access.get_all_contracts(
+            not_signed=True, not_paid=True, current_user=manager),
+        "get_all_events": lambda: data_access.get_all_events(current_user=manager),
+        "get_all_events[my_events]": lambda: data_access.get_all_events(
+            my_events=True, current_user=support),
+        "get_all_employees": lambda: data_access.get_all_employees(
+            current_user=manager),
+        "get_all_clients[projection]": lambda: data_access.get_all_clients(
+            projection=True, current_user=manager),
+        "get_all_contracts[projection]": lambda: data_access.get_all_contracts(
+            projection=True, current_user=manager),
+        "get_all_events[projection]": lambda: data_access.get_all_events(
+            projection=True, current_user=manager),
+        "get_all_contracts[narrow,sorted]": lambda: data_access.get_all_contracts(
+            projection=True, fields=["contract_id", "remaining_amount"],
+            sort=[("remaining_amount", True)], current_user=manager),
+    }
+    if max(counts.values()) <= RENDER_MAX_ROWS:
+        benchmarks.update({
+            "render list_clients": list_services.list_clients,
+            "render list_contracts": lambda: list_services.list_contracts(),
+            "render list_events": lambda: list_services.list_events(),
+            "render list_employees": list_services.list_employees,
+        })
+    benchmarks.update({
+        f"bulk apply_payment_batch[{BULK_ROWS}]": bulk_payments,
+        f"bulk apply_field_updates[{BULK_ROWS}]": bulk_field_updates,
+        f"bulk seed[{BULK_ROWS} clients]": bulk_seed,
+    })
+    return benchmarks
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """Prints the comparison with a baseline and returns the regressed names."""
+    table = Table(
+        title="[bold cyan]Benchmark Comparison[/bold cyan]",
+        box=box.ROUNDED,
+        header_style="bold white",
+    )
+    table.add_column("Benchmark", style="cyan")
+    table.add_column("Baseline (ms)", justify="right")
+    table.add_column("Current (ms)", justify="right")
+    table.add_column("Change", justify="right")
+
+    regressions = []
+    for name, timing in results["results"].items():
+        before = baseline.get("results", {}).get(name)
+        if not before:
+            table.add_row(escape(name), "-", f"{timing['median_ms']:.2f}",
+                          "[dim]new[/dim]")
+            continue
+        change = timing["median_ms"] / max(before["median_ms"], 0.001) - 1
+        style = "green"
+        if change > tolerance:
+            style = "bold red"
+            regressions.append(name)
+        table.add_row(
+            escape(name), f"{before['median_ms']:.2f}", f"{timing['median_ms']:.2f}",
+            f"[{style}]{change:+.0%}[/{style}]",
+        )
+    console.print(table)
+    return regressions
+
+
+def _display_results(results: dict):
+    table = Table(
+        title=f"[bold cyan]Benchmarks ({results['scale']}, "
+              f"{results['database']})[/bold cyan]",
+        box=box.ROUNDED,
+        header_style="bold white",
+    )
+    table.add_column("Benchmark", style="cyan")
+    table.add_column("Median (ms)", justify="right", style="green")
+    table.add_column("Min (ms)", justify="right")
+    table.add_column("Max (ms)", justify="right")
+    for name, timing in results["results"].items():
+        table.add_row(escape(name), f"{timing['median_ms']:.2f}",
+                      f"{timing['min_ms']:.2f}", f"{timing['max_ms']:.2f}")
+    console.print(table)
+
+
+@click.command()
+@click.option("--scale", type=click.Choice(list(SCALES)), default="1k",
+              show_default=True, help="Size of the generated data set.")
+@click.option("--database-url",
+              help="Database to use (default: a new temporary SQLite file).")
+@click.option("--no-seed", is_flag=True,
+              help="Use the existing rows of --database-url instead of seeding.")
+@click.option("--rounds", type=int, default=5, show_default=True,
+              help="Timed runs of each benchmark.")
+@click.option("--only", help="Only run the benchmarks whose name contains this text.")
+@click.option("--output", type=click.Path(dir_okay=False),
+              help="Write the results as JSON (e.g. to refresh the baseline).")
+@click.option("--compare", "baseline_path",
+              type=click.Path(exists=True, dir_okay=False),
+              help="Compare the results with a JSON baseline.")
+@click.option("--tolerance", type=float, default=0.2, show_default=True,
+              help="Slowdown of the median tolerated before a regression is reported.")
+def main(scale, database_url, no_seed, rounds, only, output, baseline_path, tolerance):
+    """Seeds a database and times the main CRM paths."""
+    if not database_url:
+        database_url = "sqlite:///" + os.path.join(
+            tempfile.mkdtemp(prefix="epicevents-bench-"), "bench.db")
+    # The application reads its configuration when first imported
+    os.environ["DATABASE_URL"] = database_url
+    os.environ.setdefault("JWT_SECRET", "benchmark-only-secret-0123456789abcdef")
+
+    from EpicEventsCRM.models.base_model import Base
+    from scripts.seed_data import seed, scale_counts
+    from db.database import engine, get_db
+    import sqlalchemy
+
+    counts = scale_counts(SCALES[scale])
+    if not no_seed:
+        Base.metadata.create_all(bind=engine)
+        console.print(f"[bold yellow]Seeding {scale} data set...[/bold yellow]")
+        db = next(get_db())
+        try:
+            seed(db, counts)
+            db.commit()
+        finally:
+            db.close()
+
+    results = {
+        "scale": scale,
+        "counts": counts,
+        "database": engine.dialect.name,
+        "python": platform.python_version(),
+        "sqlalchemy": sqlalchemy.__version__,
+        "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "results": {},
+    }
+    for name, func in build_benchmarks(counts).items():
+        if only and only not in name:
+            continue
+        console.print(f"[dim]Running {name}...[/dim]")
+        results["results"][name] = _time(func, rounds)
+
+    _display_results(results)
+    if output:
+        with open(output, "w") as f:
+            json.dump(results, f, indent=2)
+        console.print(f"[dim]Results written to {output}[/dim]")
+
+    if baseline_path:
+        with open(baseline_path) as f:
+            baseline = json.load(f)
+        if baseline.get("scale") != scale:
+            console.print(
+                f"[bold yellow]⚠️ Baseline was measured at scale "
+                f"{baseline.get('scale')}, not {scale}.[/bold yellow]"
+            )
+        regressions = compare(results, baseline, tolerance)
+        if regressions:
+            console.print(
+                f"[bold red]❌ {len(regressions)} regression(s) above "
+                f"{tolerance:.0%}.[/bold red]"
+            )
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -14,8 +14,11 @@ if not JWT_SECRET:
     raise ValueError("JWT_SECRET key is not defined in .env file")
 
 JWT_ALGORITHM = "HS256"
-# Token validity period (in seconds)
-JWT_EXP_DELTA_SECONDS = 3600
+# Validity period of the access tokens (in seconds), renewed with the refresh
+# token when they expire
+JWT_EXP_DELTA_SECONDS = int(os.getenv("JWT_EXP_DELTA_SECONDS", "900"))
+# Validity period of the refresh token issued at login (in seconds)
+JWT_REFRESH_EXP_DELTA_SECONDS = int(os.getenv("JWT_REFRESH_EXP_DELTA_SECONDS", "43200"))
 
 
 # Configuration de Sentry
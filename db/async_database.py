@@ -0,0 +1,68 @@
+import os
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from db.database import DATABASE_URL, is_sqlite, configure_sqlite
+
+# Async drivers used in place of the synchronous ones of DATABASE_URL
+ASYNC_DRIVERS = {
+    "postgresql": "asyncpg",
+    "sqlite": "aiosqlite",
+}
+
+# Engine and session factory, created on first use so that the CLI never
+# needs the async drivers installed
+_engine = None
+AsyncSessionLocal = None
+
+
+def get_async_url(url: str = DATABASE_URL) -> str:
+    """
+    Returns the async equivalent of a database URL, e.g.
+    ``postgresql+psycopg2://...`` -> ``postgresql+asyncpg://...``.
+    ASYNC_DATABASE_URL, when set, is used as is.
+    """
+    override = os.getenv("ASYNC_DATABASE_URL")
+    if override:
+        return override
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(
+            f"❌ ERROR: No async driver configured for '{backend}' databases."
+            " Set ASYNC_DATABASE_URL."
+        )
+    async_url = parsed.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}")
+    return async_url.render_as_string(hide_password=False)
+
+
+def get_async_engine():
+    """Creates the async engine on first call and returns it."""
+    global _engine, AsyncSessionLocal
+    if _engine is None:
+        url = get_async_url()
+        _engine = create_async_engine(url, echo=False)
+        if is_sqlite(url):
+            configure_sqlite(_engine)
+        AsyncSessionLocal = async_sessionmaker(
+            bind=_engine, autoflush=False, expire_on_commit=False
+        )
+    return _engine
+
+
+def get_async_session():
+    """
+    Returns a new async database session, to be used as
+    ``async with get_async_session() as db``.
+    """
+    if AsyncSessionLocal is None:
+        get_async_engine()
+    return AsyncSessionLocal()
+
+
+async def dispose_async_engine():
+    """Closes the pooled connections of the async engine, if it was created."""
+    global _engine, AsyncSessionLocal
+    if _engine is not None:
+        await _engine.dispose()
+        _engine = None
+        AsyncSessionLocal = None
@@ -0,0 +1,209 @@
+from EpicEventsCRM.models.audit_log_model import AuditLog
+from EpicEventsCRM.models.employee_model import Employee
+from EpicEventsCRM.models.contract_model import Contract
+from EpicEventsCRM.models.client_model import Client
+from EpicEventsCRM.models.event_model import Event
+from sqlalchemy import event, inspect as sa_inspect, insert, select
+from sqlalchemy.orm import Session, RelationshipDirection
+from sqlalchemy.orm.base import NO_VALUE
+from collections import defaultdict
+from contextvars import ContextVar
+from datetime import datetime
+import enum
+import json
+
+
+# Entities whose changes are recorded in the audit_log table
+AUDITED_MODELS = (Client, Contract, Event, Employee)
+
+# Maintained by the database or the ORM, not changed by the users
+UNAUDITED_COLUMNS = {"version_id", "created_at", "updated_at"}
+
+# Recorded as changed, without their values
+MASKED_COLUMNS = {"password_hash"}
+MASK = "********"
+
+# Employee making the changes of the current command (see set_actor)
+_actor = ContextVar("audit_actor", default=None)
+
+
+class AuditLogError(RuntimeError):
+    """Raised when a row of the audit trail would be modified or deleted."""
+
+
+def set_actor(employee_id):
+    """Attributes the changes made from now on, in this context, to an employee."""
+    _actor.set(employee_id)
+
+
+def get_actor():
+    return _actor.get()
+
+
+def audit_value(key: str, value):
+    """Converts a column value to what the audit trail stores (JSON)."""
+    if value is None:
+        return None
+    if key in MASKED_COLUMNS:
+        return MASK
+    if isinstance(value, datetime):
+        return value.isoformat(sep=" ")
+    if isinstance(value, enum.Enum):
+        return value.value
+    return value
+
+
+def audit_row(entity: str, entity_id, operation: str, changes: dict) -> dict:
+    """Values of one audit_log row, ``changes`` being field -> [old, new]."""
+    return {
+        "entity": entity,
+        "entity_id": entity_id,
+        "employee_id": get_actor(),
+        "operation": operation,
+        "changes": json.dumps(changes),
+    }
+
+
+def _audited_keys(mapper) -> list:
+    return [
+        attr.key for attr in mapper.column_attrs
+        if attr.key not in UNAUDITED_COLUMNS and not attr.columns[0].primary_key
+    ]
+
+
+def _loaded_values(state) -> dict:
+    # Only the loaded attributes: reading an expired one would query the row
+    return {
+        key: audit_value(key, state.dict[key])
+        for key in _audited_keys(state.mapper)
+        if state.dict.get(key) is not None
+    }
+
+
+def _updated_fields(state) -> dict:
+    """
+    field -> [old, new] from the attribute history of a modified instance.
+    The old value is NO_VALUE if the attribute was set without being loaded.
+    """
+    changes = {}
+    for key in _audited_keys(state.mapper):
+        history = state.attrs[key].history
+        if not history.has_changes():
+            continue
+        old = state.committed_state.get(key, NO_VALUE)
+        new = history.added[0] if history.added else None
+        if old is NO_VALUE or old != new:
+            changes[key] = [old, new]
+
+    # A reassigned relationship only sets its foreign key during the flush
+    for relationship in state.mapper.relationships:
+        if relationship.direction is not RelationshipDirection.MANYTOONE:
+            continue
+        history = state.attrs[relationship.key].history
+        (column,) = relationship.local_columns
+        if not history.added or column.key in changes:
+            continue
+        column_history = state.attrs[column.key].history
+        old = (column_history.deleted or column_history.unchanged or [None])[0]
+        target = history.added[0]
+        new = None
+        if target is not None:
+            (remote,) = relationship.remote_side
+            target_state = sa_inspect(target)
+            new = (target_state.identity[0] if target_state.identity
+                   else target_state.dict.get(remote.key))
+        if old != new:
+            changes[column.key] = [old, new]
+    return changes
+
+
+def _load_old_values(session, unknown: dict):
+    """
+    Reads the old values that the history lacks, with one SELECT per model:
+    ``unknown`` maps a model to ``{entity_id: changes}``.
+    """
+    for model, rows in unknown.items():
+        pk = model.__mapper__.primary_key[0]
+        keys = sorted({
+            key for changes in rows.values()
+            for key, (old, _) in changes.items() if old is NO_VALUE
+        })
+        stored = {
+            row[0]: row._mapping
+            for row in session.connection().execute(
+                select(pk, *(model.__table__.c[key] for key in keys))
+                .where(pk.in_(rows))
+            )
+        }
+        for entity_id, changes in rows.items():
+            for key, change in changes.items():
+                if change[0] is NO_VALUE:
+                    change[0] = stored[entity_id][key] if entity_id in stored else None
+
+
+def _collect_changes(session, flush_context, instances):
+    """
+    Reads the changes of the flush from the attribute history, before it is
+    reset. Created rows have no ID yet: they are completed after the flush.
+    """
+    if not session.info.get("audit", True):
+        return
+    pending = []
+    updated = []
+    unknown = defaultdict(dict)
+    for instance in session.dirty:
+        if not isinstance(instance, AUDITED_MODELS):
+            continue
+        if not session.is_modified(instance):
+            continue
+        state = sa_inspect(instance)
+        changes = _updated_fields(state)
+        if any(old is NO_VALUE for old, _ in changes.values()):
+            unknown[type(instance)][state.identity[0]] = changes
+        updated.append((type(instance).__name__, state.identity[0], changes))
+    _load_old_values(session, unknown)
+    for entity, entity_id, changes in updated:
+        changes = {
+            key: [audit_value(key, old), audit_value(key, new)]
+            for key, (old, new) in changes.items() if old != new
+        }
+        if changes:
+            pending.append((None, audit_row(entity, entity_id, "update", changes)))
+    for instance in session.deleted:
+        if isinstance(instance, AUDITED_MODELS):
+            state = sa_inspect(instance)
+            pending.append((None, audit_row(
+                type(instance).__name__, state.identity[0], "delete",
+                {key: [value, None] for key, value in _loaded_values(state).items()},
+            )))
+    for instance in session.new:
+        if isinstance(instance, AUDITED_MODELS):
+            pending.append((instance, None))
+    session.info["audit_pending"] = pending
+
+
+def _write_changes(session, flush_context):
+    """Inserts the audit rows of the flush with one executemany."""
+    rows = []
+    for instance, row in session.info.pop("audit_pending", ()):
+        if instance is not None:
+            state = sa_inspect(instance)
+            # The identity is only registered once the flush is finalized
+            entity_id = state.dict.get(state.mapper.primary_key[0].key)
+            row = audit_row(
+                type(instance).__name__, entity_id, "create",
+                {key: [None, value] for key, value in _loaded_values(state).items()},
+            )
+        rows.append(row)
+    if rows:
+        session.connection().execute(insert(AuditLog.__table__), rows)
+
+
+def _refuse_change(mapper, connection, target):
+    raise AuditLogError("The audit trail is append-only.")
+
+
+event.listen(Session, "before_flush", _collect_changes)
+event.listen(Session, "after_flush", _write_changes)
+event.listen(AuditLog, "before_update", _refuse_change)
+event.listen(AuditLog, "before_delete", _refuse_change)
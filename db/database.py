@@ -1,5 +1,6 @@
 import os
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker
 from dotenv import load_dotenv
 
@@ -14,8 +15,61 @@ if not DATABASE_URL:
         " Please check your .env file."
     )
 
+# Pragmas applied to every SQLite connection (standalone deployments)
+SQLITE_PRAGMAS = {
+    # Readers never block the writer, and the writer never blocks readers
+    "journal_mode": "WAL",
+    # Safe with WAL: only a power loss can drop the last transactions
+    "synchronous": "NORMAL",
+    "foreign_keys": "ON",
+    # Negative values are in KiB: 64 MiB of page cache per connection
+    "cache_size": "-64000",
+    # Read the database file through a 256 MiB memory map
+    "mmap_size": str(256 * 1024 * 1024),
+    "temp_store": "MEMORY",
+    # Wait for a concurrent writer instead of failing with "database is locked"
+    "busy_timeout": "5000",
+}
+
+
+# Executions of a statement on a connection after which psycopg 3
+# (postgresql+psycopg://) prepares it on the server; 0 prepares it at once.
+# psycopg2 has no server-side prepared statements.
+DB_PREPARE_THRESHOLD = int(os.getenv("DB_PREPARE_THRESHOLD", "5"))
+
+
+def is_sqlite(url) -> bool:
+    return make_url(str(url)).get_backend_name() == "sqlite"
+
+
+def engine_options(url) -> dict:
+    """Driver-specific keyword arguments of create_engine for ``url``."""
+    if make_url(str(url)).get_driver_name() == "psycopg":
+        return {"connect_args": {"prepare_threshold": DB_PREPARE_THRESHOLD}}
+    return {}
+
+
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Connect event listener applying SQLITE_PRAGMAS to a new connection."""
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in SQLITE_PRAGMAS.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
+
+
+def configure_sqlite(engine):
+    """Registers the SQLite pragmas on an engine (sync or async)."""
+    sync_engine = getattr(engine, "sync_engine", engine)
+    event.listen(sync_engine, "connect", set_sqlite_pragmas)
+    return engine
+
+
 # Create SQLAlchemy engine
-engine = create_engine(DATABASE_URL, echo=False)
+engine = create_engine(DATABASE_URL, echo=False, **engine_options(DATABASE_URL))
+if is_sqlite(DATABASE_URL):
+    configure_sqlite(engine)
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -28,3 +82,9 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+# Registers the session hooks counting the writes of every table
+from db import query_cache  # noqa: E402,F401
+# Registers the session hooks writing the audit trail
+from db import audit  # noqa: E402,F401
@@ -6,18 +6,45 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")
 
 
 def initialize_database():
-    """Create all tables in the database."""
+    """
+    Creates the tables of a new database, or applies the pending migrations
+    (db/migrations) to an existing one.
+    """
 
-    from db.database import engine
+    from db.database import engine, is_sqlite
+    from db import migrations
+    from sqlalchemy import inspect
     from EpicEventsCRM.models.base_model import Base
     from EpicEventsCRM.models.client_model import Client  # noqa
     from EpicEventsCRM.models.contract_model import Contract  # noqa
     from EpicEventsCRM.models.employee_model import Employee  # noqa
     from EpicEventsCRM.models.event_model import Event  # noqa
+    from EpicEventsCRM.models.payment_model import Payment  # noqa
+    from EpicEventsCRM.models.table_version_model import TableVersion  # noqa
+    from EpicEventsCRM.models.audit_log_model import AuditLog  # noqa
 
     try:
-        Base.metadata.create_all(bind=engine)
-        print("✅ All tables have been created successfully.")
+        if is_sqlite(engine.url) and engine.url.database not in (None, "", ":memory:"):
+            # SQLite creates the file, but not the folder holding it
+            folder = os.path.dirname(os.path.abspath(engine.url.database))
+            os.makedirs(folder, exist_ok=True)
+        with engine.connect() as connection:
+            existing = inspect(connection).get_table_names()
+        if not existing:
+            # The models give the current schema: no migration to run
+            Base.metadata.create_all(bind=engine)
+            migrations.stamp(engine)
+            print("✅ All tables have been created successfully.")
+        else:
+            applied = migrations.upgrade(engine)
+            print(
+                f"✅ {len(applied)} migration(s) applied, "
+                f"schema at version {migrations.head()}."
+            )
+        if is_sqlite(engine.url):
+            with engine.connect() as connection:
+                mode = connection.exec_driver_sql("PRAGMA journal_mode").scalar()
+            print(f"✅ SQLite database ready (journal mode: {mode}).")
     except Exception as e:
         print(f"❌ Error initializing database: {e}")
 
@@ -0,0 +1,121 @@
+"""
+Versioned schema migrations.
+
+Each module of ``db/migrations/versions`` named ``NNNN_description.py`` is one
+migration: its docstring describes it and ``upgrade(op)`` applies it through
+the helpers of :class:`db.migrations.ops.Operations`. The versions applied to
+a database are recorded in its ``schema_migrations`` table.
+
+A migration runs in one transaction, unless its module sets
+``transactional = False``: its statements are then committed one by one, as
+``CREATE INDEX CONCURRENTLY`` and batched backfills require. The operations
+check the schema first, so an interrupted migration can be run again.
+"""
+
+from EpicEventsCRM.models.base_model import utcnow
+from sqlalchemy import (
+    MetaData, Table, Column, String, DateTime, inspect, select, insert,
+)
+from db.migrations.ops import Operations
+from typing import NamedTuple
+from types import ModuleType
+import importlib
+import pkgutil
+import re
+
+
+MIGRATIONS_PACKAGE = "db.migrations.versions"
+
+migrations_table = Table(
+    "schema_migrations",
+    MetaData(),
+    Column("version", String(20), primary_key=True),
+    Column("description", String(200), nullable=False),
+    Column("applied_at", DateTime, nullable=False, server_default=utcnow()),
+)
+
+
+class Migration(NamedTuple):
+    version: str
+    description: str
+    module: ModuleType
+
+    @property
+    def transactional(self) -> bool:
+        return getattr(self.module, "transactional", True)
+
+
+def load_migrations() -> list:
+    """Returns the migrations of MIGRATIONS_PACKAGE, in version order."""
+    package = importlib.import_module(MIGRATIONS_PACKAGE)
+    migrations = []
+    for module_info in pkgutil.iter_modules(package.__path__):
+        match = re.fullmatch(r"(\d{4})_\w+", module_info.name)
+        if not match:
+            continue
+        module = importlib.import_module(f"{MIGRATIONS_PACKAGE}.{module_info.name}")
+        description = (module.__doc__ or module_info.name).strip().splitlines()[0]
+        migrations.append(Migration(match.group(1), description, module))
+    return sorted(migrations)
+
+
+def head() -> str:
+    """Version of the last migration."""
+    return load_migrations()[-1].version
+
+
+def applied_versions(engine) -> set:
+    with engine.connect() as connection:
+        if not inspect(connection).has_table(migrations_table.name):
+            return set()
+        return set(connection.scalars(select(migrations_table.c.version)))
+
+
+def _record(connection, migration: Migration):
+    connection.execute(
+        insert(migrations_table),
+        {"version": migration.version, "description": migration.description},
+    )
+
+
+def upgrade(engine, target: str = None, echo=print) -> list:
+    """
+    Applies the migrations not yet applied, up to ``target`` (the last one by
+    default), and returns them.
+    """
+    migrations_table.create(engine, checkfirst=True)
+    applied = applied_versions(engine)
+    done = []
+    for migration in load_migrations():
+        if target is not None and migration.version > target:
+            break
+        if migration.version in applied:
+            continue
+        echo(f"Applying migration {migration.version}: {migration.description}")
+        if migration.transactional:
+            with engine.begin() as connection:
+                migration.module.upgrade(Operations(connection))
+                _record(connection, migration)
+        else:
+            with engine.connect().execution_options(
+                isolation_level="AUTOCOMMIT"
+            ) as connection:
+                migration.module.upgrade(Operations(connection, transactional=False))
+                _record(connection, migration)
+        done.append(migration)
+    return done
+
+
+def stamp(engine, target: str = None):
+    """
+    Records the migrations up to ``target`` (all by default) as applied without
+    running them, for a schema created from the models.
+    """
+    migrations_table.create(engine, checkfirst=True)
+    applied = applied_versions(engine)
+    with engine.begin() as connection:
+        for migration in load_migrations():
+            if target is not None and migration.version > target:
+                break
+            if migration.version not in applied:
+                _record(connection, migration)
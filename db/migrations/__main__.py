@@ -0,0 +1,41 @@
+from db import migrations
+import click
+
+
+@click.group()
+def cli():
+    """Schema migrations of the database of DATABASE_URL."""
+
+
+@cli.command()
+@click.argument("target", required=False)
+def upgrade(target):
+    """Apply the pending migrations, up to TARGET (all by default)."""
+    from db.database import engine
+
+    applied = migrations.upgrade(engine, target)
+    click.echo(f"{len(applied)} migration(s) applied.")
+
+
+@cli.command()
+@click.argument("target", required=False)
+def stamp(target):
+    """Record the migrations up to TARGET as applied, without running them."""
+    from db.database import engine
+
+    migrations.stamp(engine, target)
+
+
+@cli.command()
+def history():
+    """List the migrations, and whether each one is applied."""
+    from db.database import engine
+
+    applied = migrations.applied_versions(engine)
+    for migration in migrations.load_migrations():
+        mark = "x" if migration.version in applied else " "
+        click.echo(f"[{mark}] {migration.version} {migration.description}")
+
+
+if __name__ == "__main__":
+    cli()
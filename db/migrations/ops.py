@@ -0,0 +1,171 @@
+from sqlalchemy import MetaData, Table, Column, Index, inspect, text
+from sqlalchemy.schema import CreateColumn
+
+
+class Operations:
+    """
+    Schema operations of a migration, on one connection. Each operation is
+    skipped if the schema already has its result.
+
+    On PostgreSQL the operations avoid long locks on large tables: indexes are
+    built concurrently, backfills are batched, and NOT NULL is checked by a
+    constraint validated without blocking writes. They need a
+    non-transactional migration (``transactional = False``) to commit as they
+    go.
+    """
+
+    def __init__(self, connection, transactional: bool = True):
+        self.connection = connection
+        self.transactional = transactional
+        self.dialect = connection.dialect.name
+
+    @property
+    def is_postgresql(self) -> bool:
+        return self.dialect == "postgresql"
+
+    @property
+    def is_sqlite(self) -> bool:
+        return self.dialect == "sqlite"
+
+    def _inspector(self):
+        # Not cached: the schema changes between operations
+        return inspect(self.connection)
+
+    def render(self, expression) -> str:
+        """SQL of a SQLAlchemy expression (e.g. ``utcnow()``) on this database."""
+        return str(expression.compile(
+            dialect=self.connection.dialect, compile_kwargs={"literal_binds": True}
+        ))
+
+    def execute(self, statement, parameters: dict = None):
+        if isinstance(statement, str):
+            statement = text(statement)
+        return self.connection.execute(statement, parameters or {})
+
+    def has_table(self, table_name: str) -> bool:
+        return self._inspector().has_table(table_name)
+
+    def has_column(self, table_name: str, column_name: str) -> bool:
+        return any(
+            column["name"] == column_name
+            for column in self._inspector().get_columns(table_name)
+        )
+
+    def has_index(self, table_name: str, index_name: str) -> bool:
+        return any(
+            index["name"] == index_name
+            for index in self._inspector().get_indexes(table_name)
+        )
+
+    def create_table(self, table: Table):
+        """Creates a table and its indexes, declared in the migration."""
+        table.create(self.connection, checkfirst=True)
+
+    def add_column(self, table_name: str, column: Column):
+        """
+        Adds a column. On a large table it must be nullable, or have a
+        constant server default.
+        """
+        if self.has_column(table_name, column.name):
+            return
+        Table(table_name, MetaData(), column)
+        ddl = CreateColumn(column).compile(dialect=self.connection.dialect)
+        self.execute(f"ALTER TABLE {table_name} ADD COLUMN {ddl}")
+
+    def create_index(self, name: str, table_name: str, columns: list,
+                     where: str = None, unique: bool = False):
+        """
+        Creates an index, partial if ``where`` is given. On PostgreSQL it is
+        built concurrently when the migration is not transactional, and an
+        invalid index left by an interrupted build is dropped first.
+        """
+        concurrently = self.is_postgresql and not self.transactional
+        if concurrently:
+            valid = self.execute(
+                "SELECT i.indisvalid FROM pg_index i "
+                "JOIN pg_class c ON c.oid = i.indexrelid WHERE c.relname = :name",
+                {"name": name},
+            ).scalar()
+            if valid is False:
+                self.execute(f"DROP INDEX CONCURRENTLY {name}")
+        if self.has_index(table_name, name):
+            return
+        table = Table(table_name, MetaData(), *(Column(column) for column in columns))
+        condition = text(where) if where else None
+        Index(
+            name, *(table.c[column] for column in columns),
+            unique=unique,
+            postgresql_where=condition,
+            sqlite_where=condition,
+            postgresql_concurrently=concurrently,
+        ).create(self.connection)
+
+    def backfill(self, table_name: str, key: str, values: dict, where: str,
+                 batch_size: int = 1000) -> int:
+        """
+        Sets ``values`` (column -> SQL expression) on the rows matching
+        ``where``, ``batch_size`` rows per UPDATE so that each one only locks
+        a few rows. The values must make ``where`` false, or this never ends.
+        Returns the number of updated rows.
+        """
+        assignments = ", ".join(
+            f"{column} = {value}" for column, value in values.items()
+        )
+        statement = text(
+            f"UPDATE {table_name} SET {assignments} WHERE {key} IN "
+            f"(SELECT {key} FROM {table_name} WHERE {where} LIMIT :batch_size)"
+        )
+        total = 0
+        while True:
+            count = self.connection.execute(
+                statement, {"batch_size": batch_size}
+            ).rowcount
+            total += count
+            if count < batch_size:
+                return total
+
+    def set_default(self, table_name: str, column_name: str, expression: str):
+        """
+        Gives a column a server default. SQLite cannot change a column, so an
+        AFTER INSERT trigger fills it there instead.
+        """
+        if self.is_sqlite:
+            self.execute(
+                f"CREATE TRIGGER IF NOT EXISTS {table_name}_{column_name}_default "
+                f"AFTER INSERT ON {table_name} FOR EACH ROW "
+                f"WHEN NEW.{column_name} IS NULL BEGIN "
+                f"UPDATE {table_name} SET {column_name} = {expression} "
+                f"WHERE rowid = NEW.rowid; END"
+            )
+        else:
+            self.execute(
+                f"ALTER TABLE {table_name} ALTER COLUMN {column_name} "
+                f"SET DEFAULT {expression}"
+            )
+
+    def set_not_null(self, table_name: str, column_name: str):
+        """
+        Makes a backfilled column NOT NULL (no-op on SQLite, which cannot).
+        On PostgreSQL, a NOT VALID check constraint is validated first, without
+        blocking writes, so that SET NOT NULL does not scan the table.
+        """
+        if not self.is_postgresql:
+            return
+        column = next(
+            column for column in self._inspector().get_columns(table_name)
+            if column["name"] == column_name
+        )
+        if not column["nullable"]:
+            return
+        constraint = f"{table_name}_{column_name}_not_null"
+        # Left behind if a previous run was interrupted
+        self.execute(f"ALTER TABLE {table_name} DROP CONSTRAINT IF EXISTS {constraint}")
+        self.execute(
+            f"ALTER TABLE {table_name} ADD CONSTRAINT {constraint} "
+            f"CHECK ({column_name} IS NOT NULL) NOT VALID"
+        )
+        self.execute(f"ALTER TABLE {table_name} VALIDATE CONSTRAINT {constraint}")
+        self.execute(
+            f"ALTER TABLE {table_name} ALTER COLUMN {column_name} SET NOT NULL"
+        )
+        self.execute(f"ALTER TABLE {table_name} DROP CONSTRAINT {constraint}")
@@ -0,0 +1,84 @@
+"""Baseline: employees, clients, contracts and events.
+
+The schema created by ``Base.metadata.create_all`` before migrations existed.
+Databases created back then already have these tables.
+"""
+
+from sqlalchemy import (
+    MetaData, Table, Column, Integer, String, Float, Boolean, DateTime, Enum,
+    ForeignKey,
+)
+
+metadata = MetaData()
+
+employees = Table(
+    "employees",
+    metadata,
+    Column("employee_id", Integer, primary_key=True, autoincrement=True),
+    Column("first_name", String(50), nullable=False),
+    Column("last_name", String(50), nullable=False),
+    Column("email", String(120), unique=True, nullable=False),
+    Column("password_hash", String(200), nullable=False),
+    Column("phone_number", String(20), nullable=False),
+    Column(
+        "department",
+        Enum("COMMERCIAL", "SUPPORT", "MANAGEMENT", name="departmentenum"),
+        nullable=False,
+    ),
+)
+
+clients = Table(
+    "clients",
+    metadata,
+    Column("client_id", Integer, primary_key=True, autoincrement=True),
+    Column("full_name", String(100), nullable=False),
+    Column("email", String(120), unique=True, nullable=False),
+    Column("phone_number", String(20), nullable=False),
+    Column("company_name", String(100), nullable=False),
+    Column("date_created", DateTime),
+    Column("last_contact_date", DateTime),
+    Column(
+        "sales_contact_id", Integer, ForeignKey("employees.employee_id"),
+        nullable=False,
+    ),
+)
+
+contracts = Table(
+    "contracts",
+    metadata,
+    Column("contract_id", Integer, primary_key=True, autoincrement=True),
+    Column("total_amount", Float, nullable=False),
+    Column("remaining_amount", Float, nullable=False),
+    Column("date_created", DateTime),
+    Column("is_signed", Boolean),
+    Column("client_id", Integer, ForeignKey("clients.client_id"), nullable=False),
+    Column(
+        "sales_contact_id", Integer, ForeignKey("employees.employee_id"),
+        nullable=False,
+    ),
+)
+
+events = Table(
+    "events",
+    metadata,
+    Column("event_id", Integer, primary_key=True, autoincrement=True),
+    Column("event_name", String(100), nullable=False),
+    Column("event_start_date", DateTime, nullable=False),
+    Column("event_end_date", DateTime, nullable=False),
+    Column("location", String(200), nullable=False),
+    Column("attendees", Integer, nullable=False),
+    Column("notes", String(1000)),
+    Column("client_id", Integer, ForeignKey("clients.client_id"), nullable=False),
+    Column(
+        "contract_id", Integer, ForeignKey("contracts.contract_id"), nullable=False
+    ),
+    Column(
+        "support_contact_id", Integer, ForeignKey("employees.employee_id"),
+        nullable=False,
+    ),
+)
+
+
+def upgrade(op):
+    for table in (employees, clients, contracts, events):
+        op.create_table(table)
@@ -0,0 +1,32 @@
+"""Payments ledger, and partial index of the contracts not fully paid."""
+
+from sqlalchemy import (
+    MetaData, Table, Column, Integer, Float, DateTime, ForeignKey, func,
+)
+
+metadata = MetaData()
+
+# Referenced tables, as far as the foreign keys need them
+Table("contracts", metadata, Column("contract_id", Integer, primary_key=True))
+Table("employees", metadata, Column("employee_id", Integer, primary_key=True))
+
+payments = Table(
+    "payments",
+    metadata,
+    Column("payment_id", Integer, primary_key=True, autoincrement=True),
+    Column("amount", Float, nullable=False),
+    Column("payment_date", DateTime, nullable=False, server_default=func.now()),
+    Column(
+        "contract_id", Integer, ForeignKey("contracts.contract_id"),
+        nullable=False, index=True,
+    ),
+    Column("recorded_by_id", Integer, ForeignKey("employees.employee_id")),
+)
+
+
+def upgrade(op):
+    op.create_table(payments)
+    op.create_index(
+        "ix_contracts_not_paid", "contracts", ["contract_id"],
+        where="remaining_amount > 0",
+    )
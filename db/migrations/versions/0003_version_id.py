@@ -0,0 +1,14 @@
+"""Version counters of the optimistic concurrency control."""
+
+from sqlalchemy import Column, Integer
+
+TABLES = ("employees", "clients", "contracts", "events")
+
+
+def upgrade(op):
+    for table_name in TABLES:
+        # A constant default: existing rows get it without being rewritten
+        op.add_column(
+            table_name,
+            Column("version_id", Integer, nullable=False, server_default="1"),
+        )
@@ -0,0 +1,38 @@
+"""created_at / updated_at columns, backfilled in batches, and their indexes."""
+
+from EpicEventsCRM.models.base_model import utcnow
+from sqlalchemy import Column, DateTime
+
+# Table -> (primary key, existing column giving the creation date)
+TABLES = {
+    "employees": ("employee_id", None),
+    "clients": ("client_id", "date_created"),
+    "contracts": ("contract_id", "date_created"),
+    "events": ("event_id", None),
+    "payments": ("payment_id", "payment_date"),
+}
+
+transactional = False
+
+
+def upgrade(op):
+    now = op.render(utcnow())
+    for table_name, (key, created) in TABLES.items():
+        for column_name in ("created_at", "updated_at"):
+            # Nullable first: adding it does not rewrite the table
+            op.add_column(table_name, Column(column_name, DateTime))
+            # Rows inserted during the backfill get a value from the default
+            op.set_default(table_name, column_name, now)
+        op.backfill(
+            table_name, key,
+            {
+                "created_at": f"COALESCE({created}, {now})" if created else now,
+                "updated_at": now,
+            },
+            where="created_at IS NULL OR updated_at IS NULL",
+        )
+        for column_name in ("created_at", "updated_at"):
+            op.set_not_null(table_name, column_name)
+            op.create_index(
+                f"ix_{table_name}_{column_name}", table_name, [column_name]
+            )
@@ -0,0 +1,14 @@
+"""Write counters of the tables, used to invalidate the query cache."""
+
+from sqlalchemy import MetaData, Table, Column, Integer, String
+
+table_versions = Table(
+    "table_versions",
+    MetaData(),
+    Column("table_name", String(50), primary_key=True),
+    Column("version", Integer, nullable=False),
+)
+
+
+def upgrade(op):
+    op.create_table(table_versions)
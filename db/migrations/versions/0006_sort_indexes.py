@@ -0,0 +1,16 @@
+"""Indexes on the usual sort keys of the list commands."""
+
+INDEXES = {
+    "ix_clients_full_name": ("clients", ["full_name"]),
+    "ix_clients_company_name": ("clients", ["company_name"]),
+    "ix_clients_last_contact_date": ("clients", ["last_contact_date"]),
+    "ix_events_event_start_date": ("events", ["event_start_date"]),
+    "ix_employees_last_name": ("employees", ["last_name"]),
+}
+
+transactional = False
+
+
+def upgrade(op):
+    for name, (table_name, columns) in INDEXES.items():
+        op.create_index(name, table_name, columns)
@@ -0,0 +1,19 @@
+"""archived_at on contracts and events, and partial indexes of the active rows."""
+
+from sqlalchemy import Column, DateTime
+
+INDEXES = {
+    "ix_contracts_active": ("contracts", ["contract_id"]),
+    "ix_contracts_active_sales_contact": ("contracts", ["sales_contact_id"]),
+    "ix_events_active_start_date": ("events", ["event_start_date", "event_id"]),
+    "ix_events_active_support_contact": ("events", ["support_contact_id"]),
+}
+
+transactional = False
+
+
+def upgrade(op):
+    for table_name in ("contracts", "events"):
+        op.add_column(table_name, Column("archived_at", DateTime))
+    for name, (table_name, columns) in INDEXES.items():
+        op.create_index(name, table_name, columns, where="archived_at IS NULL")
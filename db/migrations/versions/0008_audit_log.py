@@ -0,0 +1,21 @@
+"""Append-only audit trail of the changes."""
+
+from EpicEventsCRM.models.base_model import utcnow
+from sqlalchemy import MetaData, Table, Column, Integer, String, Text, DateTime, Index
+
+audit_log = Table(
+    "audit_log",
+    MetaData(),
+    Column("audit_id", Integer, primary_key=True, autoincrement=True),
+    Column("entity", String(20), nullable=False),
+    Column("entity_id", Integer, nullable=False),
+    Column("changed_at", DateTime, nullable=False, server_default=utcnow()),
+    Column("employee_id", Integer),
+    Column("operation", String(10), nullable=False),
+    Column("changes", Text, nullable=False),
+    Index("ix_audit_log_entity", "entity", "entity_id", "changed_at"),
+)
+
+
+def upgrade(op):
+    op.create_table(audit_log)
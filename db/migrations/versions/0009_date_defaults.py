@@ -0,0 +1,28 @@
+"""Per-row database defaults of the client and contract dates.
+
+These columns had a Python default evaluated once, when the application
+started. Rows inserted without it (Core inserts) were left NULL: they get
+their created_at. Dates frozen at a process start cannot be told apart from
+real ones, and are kept.
+"""
+
+from EpicEventsCRM.models.base_model import utcnow
+
+# Table -> (primary key, date columns)
+TABLES = {
+    "clients": ("client_id", ("date_created", "last_contact_date")),
+    "contracts": ("contract_id", ("date_created",)),
+}
+
+transactional = False
+
+
+def upgrade(op):
+    now = op.render(utcnow())
+    for table_name, (key, columns) in TABLES.items():
+        for column_name in columns:
+            op.set_default(table_name, column_name, now)
+            op.backfill(
+                table_name, key, {column_name: "created_at"},
+                where=f"{column_name} IS NULL",
+            )
@@ -0,0 +1,219 @@
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Mapper
+from sqlalchemy import event
+from collections import Counter, defaultdict
+from rich.console import Console
+from rich.table import Table
+from rich import box
+import threading
+import time
+import json
+import re
+
+
+console = Console()
+
+# A statement shape run at least this many times in one command is reported
+# as a probable N+1 query
+N_PLUS_ONE_THRESHOLD = 5
+
+# Number of statements listed in the "slowest statements" report
+SLOWEST_COUNT = 5
+
+_WHITESPACE = re.compile(r"\s+")
+# Expanded IN lists, e.g. "IN (?, ?, ?)" or "IN (%(id_1)s, %(id_2)s)"
+_PARAMETER_LIST = re.compile(r"\((?:\s*(?:\?|%\(\w+\)s|\$\d+|:\w+)\s*,?)+\)")
+
+# Profiler receiving the engine events, if profiling is enabled
+_active = None
+
+
+def statement_shape(statement: str) -> str:
+    """Normalizes a SQL statement so that repeated executions compare equal."""
+    shape = _WHITESPACE.sub(" ", statement).strip()
+    return _PARAMETER_LIST.sub("(?)", shape)
+
+
+class QueryProfiler:
+    """
+    Records the SQL statements executed by every engine, their duration and
+    the ORM instances they hydrate, grouped by CLI command.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.command = None
+        # command -> list of (statement shape, duration in seconds, executemany)
+        self.statements = defaultdict(list)
+        # command -> Counter of entity name -> instances loaded
+        self.rows_hydrated = defaultdict(Counter)
+
+    def begin_command(self, name):
+        """Attributes the following statements to the command ``name``."""
+        self.command = name or "(none)"
+
+    # --- Event listeners ---
+
+    def install(self):
+        event.listen(Engine, "before_cursor_execute", self._before_execute)
+        event.listen(Engine, "after_cursor_execute", self._after_execute)
+        event.listen(Mapper, "load", self._on_load)
+
+    def remove(self):
+        event.remove(Engine, "before_cursor_execute", self._before_execute)
+        event.remove(Engine, "after_cursor_execute", self._after_execute)
+        event.remove(Mapper, "load", self._on_load)
+
+    def _before_execute(self, conn, cursor, statement, parameters, context,
+                        executemany):
+        if context is not None:
+            context._profiling_start = time.perf_counter()
+
+    def _after_execute(self, conn, cursor, statement, parameters, context,
+                       executemany):
+        started = getattr(context, "_profiling_start", None)
+        if started is None:
+            return
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self.statements[self.command].append(
+                (statement_shape(statement), elapsed, executemany)
+            )
+
+    def _on_load(self, instance, context):
+        with self._lock:
+            self.rows_hydrated[self.command][type(instance).__name__] += 1
+
+    # --- Reporting ---
+
+    def repeated_statements(self, command) -> list:
+        """Returns ``(shape, count)`` of the probable N+1 patterns of a command."""
+        counts = Counter(
+            shape for shape, _, executemany in self.statements[command]
+            if not executemany and shape.upper().startswith("SELECT")
+        )
+        return [
+            (shape, count) for shape, count in counts.most_common()
+            if count >= N_PLUS_ONE_THRESHOLD
+        ]
+
+    def slowest_statements(self) -> list:
+        """Returns ``(command, shape, duration)`` of the slowest statements."""
+        timed = [
+            (command, shape, elapsed)
+            for command, statements in self.statements.items()
+            for shape, elapsed, _ in statements
+        ]
+        return sorted(timed, key=lambda item: item[2], reverse=True)[:SLOWEST_COUNT]
+
+    def commands(self) -> list:
+        return list(dict.fromkeys([*self.statements, *self.rows_hydrated]))
+
+    def to_dict(self) -> dict:
+        return {
+            "commands": [
+                {
+                    "command": command,
+                    "statements": len(self.statements[command]),
+                    "db_time_ms": round(
+                        sum(elapsed for _, elapsed, _ in self.statements[command])
+                        * 1000, 3),
+                    "rows_hydrated": dict(self.rows_hydrated[command]),
+                    "repeated_statements": [
+                        {"statement": shape, "count": count}
+                        for shape, count in self.repeated_statements(command)
+                    ],
+                }
+                for command in self.commands()
+            ],
+            "slowest_statements": [
+                {"command": command, "statement": shape,
+                 "duration_ms": round(elapsed * 1000, 3)}
+                for command, shape, elapsed in self.slowest_statements()
+            ],
+        }
+
+    def display_summary(self):
+        """Prints the per-command summary, the slowest statements and N+1 hints."""
+        report = self.to_dict()
+        table = Table(
+            title="[bold cyan]SQL Profile[/bold cyan]",
+            box=box.ROUNDED,
+            header_style="bold white",
+        )
+        table.add_column("Command", style="cyan")
+        table.add_column("Statements", justify="right", style="magenta")
+        table.add_column("DB time (ms)", justify="right", style="green")
+        table.add_column("Rows hydrated", style="blue")
+        for command in report["commands"]:
+            hydrated = ", ".join(
+                f"{entity}: {count}"
+                for entity, count in command["rows_hydrated"].items()
+            )
+            table.add_row(
+                command["command"],
+                str(command["statements"]),
+                f"{command['db_time_ms']:.1f}",
+                hydrated or "-",
+            )
+        console.print(table)
+
+        if report["slowest_statements"]:
+            slowest = Table(
+                title="[bold cyan]Slowest Statements[/bold cyan]",
+                box=box.ROUNDED,
+                header_style="bold white",
+            )
+            slowest.add_column("ms", justify="right", style="green")
+            slowest.add_column("Command", style="cyan")
+            slowest.add_column("Statement", overflow="fold")
+            for item in report["slowest_statements"]:
+                slowest.add_row(
+                    f"{item['duration_ms']:.1f}", item["command"],
+                    _truncate(item["statement"]),
+                )
+            console.print(slowest)
+
+        for command in report["commands"]:
+            for repeated in command["repeated_statements"]:
+                console.print(
+                    f"[bold yellow]⚠️ Possible N+1 in '{command['command']}': "
+                    f"{repeated['count']} executions of[/bold yellow] "
+                    f"[dim]{_truncate(repeated['statement'])}[/dim]"
+                )
+
+    def dump_json(self, file_path: str):
+        with open(file_path, "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+
+def _truncate(statement: str, length: int = 200) -> str:
+    return statement if len(statement) <= length else statement[:length] + "…"
+
+
+def active_profiler():
+    """Returns the running profiler, or None when profiling is disabled."""
+    return _active
+
+
+def start_profiling() -> QueryProfiler:
+    """Starts recording the statements of every engine."""
+    global _active
+    if _active is None:
+        _active = QueryProfiler()
+        _active.install()
+    return _active
+
+
+def stop_profiling(json_path=None):
+    """Stops profiling, prints the summary and optionally writes it as JSON."""
+    global _active
+    profiler, _active = _active, None
+    if profiler is None:
+        return None
+    profiler.remove()
+    profiler.display_summary()
+    if json_path:
+        profiler.dump_json(json_path)
+        console.print(f"[dim]SQL profile written to {json_path}[/dim]")
+    return profiler
@@ -0,0 +1,265 @@
+from EpicEventsCRM.models.table_version_model import TableVersion
+from sqlalchemy import event, inspect as sa_inspect, select, update, insert
+from sqlalchemy.orm import Session
+from collections import OrderedDict
+from functools import wraps
+from db import database
+import sentry_sdk
+import threading
+import weakref
+import tempfile
+import hashlib
+import inspect
+import pickle
+import os
+
+
+# Entries kept by the in-process cache (least recently used ones are dropped)
+QUERY_CACHE_SIZE = int(os.getenv("QUERY_CACHE_SIZE", "128"))
+
+# Cache used by the @cached_query functions, if enabled
+_cache = None
+
+# Engines known to have (True) or lack (False) the table_versions table
+_versions_table = weakref.WeakKeyDictionary()
+
+
+class QueryCache:
+    """
+    Results of list queries, stored with the versions of the tables they were
+    read from. An entry is only returned while those versions are unchanged.
+    """
+
+    def __init__(self, max_entries: int = QUERY_CACHE_SIZE, cache_dir: str = None):
+        self.max_entries = max_entries
+        self.cache_dir = cache_dir
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        if cache_dir:
+            os.makedirs(cache_dir, mode=0o700, exist_ok=True)
+
+    def _path(self, key) -> str:
+        digest = hashlib.sha256(repr(key).encode()).hexdigest()
+        return os.path.join(self.cache_dir, f"{digest}.pickle")
+
+    def get(self, key, versions) -> tuple:
+        """Returns ``(True, result)`` on a hit, ``(False, None)`` otherwise."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == versions:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, entry[1]
+
+        if self.cache_dir:
+            try:
+                with open(self._path(key), "rb") as f:
+                    stored_key, stored_versions, result = pickle.load(f)
+            except Exception:
+                stored_key = None
+            if stored_key == key and stored_versions == versions:
+                self._remember(key, versions, result)
+                with self._lock:
+                    self.hits += 1
+                return True, result
+
+        with self._lock:
+            self.misses += 1
+        return False, None
+
+    def put(self, key, versions, result):
+        self._remember(key, versions, result)
+        if not self.cache_dir:
+            return
+        try:
+            # Written then renamed, so a concurrent run never reads half a file
+            fd, temp_path = tempfile.mkstemp(dir=self.cache_dir)
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump((key, versions, result), f)
+            os.replace(temp_path, self._path(key))
+        except Exception as e:
+            sentry_sdk.capture_exception(e)
+
+    def _remember(self, key, versions, result):
+        with self._lock:
+            self._entries[key] = (versions, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, tables):
+        """Drops the in-process entries read from any of ``tables``."""
+        tables = set(tables)
+        with self._lock:
+            for key in [
+                key for key, (versions, _) in self._entries.items()
+                if tables.intersection(name for name, _ in versions[1])
+            ]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+def enable_query_cache(max_entries: int = QUERY_CACHE_SIZE, cache_dir: str = None):
+    """Enables the result cache of the list queries (kept if already enabled)."""
+    global _cache
+    if _cache is None:
+        _cache = QueryCache(max_entries, cache_dir)
+    return _cache
+
+
+def disable_query_cache():
+    global _cache
+    _cache = None
+
+
+def get_query_cache():
+    return _cache
+
+
+# --- Table versions ---
+
+def _has_versions_table(session) -> bool:
+    # Checked on the session's connection, so the check joins its transaction
+    connection = session.connection()
+    if connection.engine not in _versions_table:
+        _versions_table[connection.engine] = sa_inspect(connection).has_table(
+            TableVersion.__tablename__
+        )
+    return _versions_table[connection.engine]
+
+
+def table_versions(db, tables) -> tuple:
+    """
+    Returns ``(database URL, ((table, version), ...))`` for ``tables``, or
+    None if the database has no table_versions table yet.
+    """
+    if not _has_versions_table(db):
+        return None
+    stored = dict(db.execute(
+        select(TableVersion.table_name, TableVersion.version)
+        .where(TableVersion.table_name.in_(tables))
+    ).all())
+    return str(db.get_bind().url), tuple((name, stored.get(name, 0)) for name in tables)
+
+
+def _changed_tables(session) -> set:
+    return session.info.setdefault("changed_tables", set())
+
+
+def _record_flush(session, flush_context):
+    """Remembers the tables written by a flush until the transaction ends."""
+    for instance in (*session.new, *session.dirty, *session.deleted):
+        _changed_tables(session).update(
+            table.name for table in sa_inspect(instance).mapper.tables
+        )
+
+
+def _record_statement(orm_execute_state):
+    """Same for the INSERT/UPDATE/DELETE statements run through the session."""
+    state = orm_execute_state
+    if state.is_insert or state.is_update or state.is_delete:
+        table = state.statement.table
+        _changed_tables(state.session).add(getattr(table, "name", str(table)))
+
+
+def _bump_versions(session):
+    """Increments the versions of the written tables, in the same transaction."""
+    session.flush()
+    tables = _changed_tables(session) - {TableVersion.__tablename__}
+    if not tables or not _has_versions_table(session):
+        return
+    connection = session.connection()
+    for name in sorted(tables):
+        result = connection.execute(
+            update(TableVersion)
+            .where(TableVersion.table_name == name)
+            .values(version=TableVersion.version + 1)
+        )
+        if not result.rowcount:
+            connection.execute(insert(TableVersion).values(table_name=name, version=1))
+
+
+def _invalidate_committed(session):
+    tables = session.info.pop("changed_tables", set())
+    if tables and _cache is not None:
+        _cache.invalidate(tables)
+
+
+def _forget_rolled_back(session):
+    session.info.pop("changed_tables", None)
+
+
+event.listen(Session, "after_flush", _record_flush)
+event.listen(Session, "do_orm_execute", _record_statement)
+event.listen(Session, "before_commit", _bump_versions)
+event.listen(Session, "after_commit", _invalidate_committed)
+event.listen(Session, "after_rollback", _forget_rolled_back)
+
+
+# --- Decorator ---
+
+def _hashable(value):
+    """Turns the lists of an argument into tuples, so it can be a dict key."""
+    if isinstance(value, (list, tuple)):
+        return tuple(_hashable(item) for item in value)
+    return value
+
+
+def cached_query(*models):
+    """
+    Caches the result of a list function while none of the tables of
+    ``models`` has changed. The key is made of the function, its arguments
+    and the department of ``current_user`` (passed by require_permission),
+    plus the user's ID when the function receives the user.
+    """
+    tables = sorted(model.__tablename__ for model in models)
+
+    def decorator(func):
+        signature = inspect.signature(func)
+        forwards_user = "current_user" in signature.parameters
+
+        @wraps(func)
+        def wrapper(*args, current_user=None, **kwargs):
+            if forwards_user:
+                kwargs["current_user"] = current_user
+            cache = _cache
+            if cache is None:
+                return func(*args, **kwargs)
+
+            db = next(database.get_db())
+            try:
+                versions = table_versions(db, tables)
+            finally:
+                db.close()
+            if versions is None:
+                return func(*args, **kwargs)
+
+            key = (
+                func.__module__, func.__qualname__, _hashable(args),
+                tuple(sorted(
+                    (k, _hashable(v)) for k, v in kwargs.items() if k != "current_user"
+                )),
+                current_user.department.name if current_user else None,
+                current_user.employee_id if forwards_user and current_user else None,
+            )
+            hit, result = cache.get(key, versions)
+            if hit:
+                return result
+            result = func(*args, **kwargs)
+            cache.put(key, versions, result)
+            return result
+
+        # Lets require_permission pass the user it checked
+        if not forwards_user:
+            wrapper.__signature__ = signature.replace(parameters=[
+                *signature.parameters.values(),
+                inspect.Parameter("current_user", inspect.Parameter.KEYWORD_ONLY,
+                                  default=None),
+            ])
+        return wrapper
+    return decorator
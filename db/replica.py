@@ -0,0 +1,245 @@
+from EpicEventsCRM.models.contract_model import Contract
+from EpicEventsCRM.models.client_model import Client
+from EpicEventsCRM.models.event_model import Event
+from EpicEventsCRM.models.base_model import Base
+from sqlalchemy import (
+    MetaData, Table, Column, Integer, String, Text, DateTime,
+    create_engine, event, inspect, insert, select, update, func,
+)
+from sqlalchemy.orm import sessionmaker
+from datetime import datetime, timezone
+from db import database
+import enum
+import json
+import os
+
+
+# Local SQLite copy used by the offline mode
+REPLICA_DATABASE_URL = os.getenv(
+    "REPLICA_DATABASE_URL", "sqlite:///.epicevents_replica.db"
+)
+
+# Entities that can be created and updated offline, in dependency order
+OFFLINE_WRITABLE_MODELS = (Client, Contract, Event)
+
+# Tables that only exist in the replica
+replica_metadata = MetaData()
+
+pending_writes = Table(
+    "pending_writes",
+    replica_metadata,
+    Column("write_id", Integer, primary_key=True, autoincrement=True),
+    Column("entity", String(20), nullable=False),
+    # Negative for rows created offline, until the central database assigns an ID
+    Column("entity_id", Integer, nullable=False),
+    Column("operation", String(10), nullable=False),
+    # version_id of the row when it was read, checked when the write is replayed
+    Column("base_version", Integer),
+    Column("changes", Text, nullable=False),
+    # Values of the changed columns when the row was read (updates only)
+    Column("original", Text),
+    Column("queued_at", DateTime, nullable=False),
+)
+
+sync_state = Table(
+    "sync_state",
+    replica_metadata,
+    Column("name", String(50), primary_key=True),
+    Column("value", Text),
+)
+
+_replica_sessionmaker = None
+# Session factory of the central database, while the offline mode is enabled
+_central_sessionmaker = None
+
+
+class OfflineWriteError(RuntimeError):
+    """Raised when a change cannot be queued for the central database."""
+
+
+# --- Serialization of queued values ---
+
+def encode_value(value):
+    if isinstance(value, datetime):
+        return {"__datetime__": value.isoformat()}
+    if isinstance(value, enum.Enum):
+        return value.name
+    return value
+
+
+def decode_changes(model, changes: dict) -> dict:
+    """Converts queued JSON values back to the column types of ``model``."""
+    columns = model.__table__.columns
+    decoded = {}
+    for key, value in changes.items():
+        if isinstance(value, dict) and "__datetime__" in value:
+            value = datetime.fromisoformat(value["__datetime__"])
+        enum_class = getattr(columns[key].type, "enum_class", None)
+        if enum_class is not None and isinstance(value, str):
+            value = enum_class[value]
+        decoded[key] = value
+    return decoded
+
+
+# Maintained by the database that stores the row, never copied by a write
+UNQUEUED_COLUMNS = {"version_id", "created_at", "updated_at"}
+
+
+def _column_values(instance, keys) -> dict:
+    return {
+        key: encode_value(getattr(instance, key)) for key in keys
+        if key not in UNQUEUED_COLUMNS
+    }
+
+
+# --- Write queue (session events of the replica) ---
+
+def _assign_offline_ids(session, flush_context, instances):
+    """
+    Gives rows created offline a negative primary key, so they can never
+    collide with rows created meanwhile in the central database, and records
+    the version each updated row was read at.
+    """
+    next_ids = {}
+    bases = session.info.setdefault("base_versions", {})
+    for instance in session.new:
+        model = type(instance)
+        if model not in OFFLINE_WRITABLE_MODELS:
+            raise OfflineWriteError(
+                f"{model.__name__} records cannot be created offline."
+            )
+        pk = model.__mapper__.primary_key[0]
+        if getattr(instance, pk.key) is None:
+            if model not in next_ids:
+                lowest = session.execute(select(func.min(pk))).scalar() or 0
+                next_ids[model] = min(lowest, 0) - 1
+            setattr(instance, pk.key, next_ids[model])
+            next_ids[model] -= 1
+
+    for instance in session.deleted:
+        raise OfflineWriteError(
+            f"{type(instance).__name__} records cannot be deleted offline."
+        )
+
+    for instance in session.dirty:
+        if not session.is_modified(instance):
+            continue
+        if type(instance) not in OFFLINE_WRITABLE_MODELS:
+            raise OfflineWriteError(
+                f"{type(instance).__name__} records cannot be updated offline."
+            )
+        state = inspect(instance)
+        bases[(type(instance), state.identity)] = state.committed_state.get(
+            "version_id", instance.version_id
+        )
+
+
+def _queue_writes(session, flush_context):
+    """Records the rows inserted or updated by the flush in pending_writes."""
+    connection = session.connection()
+    now = datetime.now(timezone.utc)
+    bases = session.info.pop("base_versions", {})
+
+    # Parents first, so that the inserts can be replayed in queue order
+    for instance in sorted(
+        session.new, key=lambda i: OFFLINE_WRITABLE_MODELS.index(type(i))
+    ):
+        model = type(instance)
+        keys = [column.key for column in model.__mapper__.column_attrs]
+        connection.execute(insert(pending_writes).values(
+            entity=model.__name__,
+            entity_id=getattr(instance, model.__mapper__.primary_key[0].key),
+            operation="insert",
+            changes=json.dumps(_column_values(instance, keys)),
+            queued_at=now,
+        ))
+
+    for instance in session.dirty:
+        state = inspect(instance)
+        history = {
+            attr.key: state.attrs[attr.key].history
+            for attr in state.mapper.column_attrs
+        }
+        changes = _column_values(
+            instance, [key for key, h in history.items() if h.has_changes()]
+        )
+        if not changes:
+            continue
+        model = type(instance)
+        entity_id = state.identity[0]
+        if entity_id < 0:
+            # Not in the central database yet: amend the queued insert
+            row = connection.execute(
+                select(pending_writes.c.write_id, pending_writes.c.changes).where(
+                    pending_writes.c.entity == model.__name__,
+                    pending_writes.c.entity_id == entity_id,
+                    pending_writes.c.operation == "insert",
+                )
+            ).one()
+            connection.execute(
+                update(pending_writes)
+                .where(pending_writes.c.write_id == row.write_id)
+                .values(changes=json.dumps(json.loads(row.changes) | changes))
+            )
+            continue
+        connection.execute(insert(pending_writes).values(
+            entity=model.__name__,
+            entity_id=entity_id,
+            operation="update",
+            base_version=bases.get((model, state.identity)),
+            changes=json.dumps(changes),
+            original=json.dumps({
+                key: encode_value(history[key].deleted[0])
+                if history[key].deleted else None
+                for key in changes
+            }),
+            queued_at=now,
+        ))
+
+
+def make_replica_sessionmaker(engine):
+    """Returns a session factory of the replica whose writes are queued."""
+    # Not audited here: push audits the changes on the central database
+    factory = sessionmaker(autocommit=False, autoflush=False, bind=engine,
+                           info={"audit": False})
+    event.listen(factory, "before_flush", _assign_offline_ids)
+    event.listen(factory, "after_flush", _queue_writes)
+    return factory
+
+
+def initialize_replica(engine):
+    """Creates the application tables and the replica tables."""
+    Base.metadata.create_all(bind=engine)
+    replica_metadata.create_all(bind=engine)
+
+
+def get_replica_sessionmaker():
+    """Creates the replica (and its tables) on first call."""
+    global _replica_sessionmaker
+    if _replica_sessionmaker is None:
+        engine = database.configure_sqlite(create_engine(REPLICA_DATABASE_URL))
+        initialize_replica(engine)
+        _replica_sessionmaker = make_replica_sessionmaker(engine)
+    return _replica_sessionmaker
+
+
+# --- Offline mode ---
+
+def enable_offline_mode():
+    """
+    Routes every session of the application (get_db) to the replica, so no
+    command touches the network. Changes are queued until the next sync.
+    """
+    global _central_sessionmaker
+    if _central_sessionmaker is None:
+        _central_sessionmaker = database.SessionLocal
+        database.SessionLocal = get_replica_sessionmaker()
+
+
+def is_offline() -> bool:
+    return _central_sessionmaker is not None
+
+
+def central_sessionmaker():
+    """Session factory of the central database, even in offline mode."""
+    return _central_sessionmaker or database.SessionLocal
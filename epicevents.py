@@ -1,19 +1,147 @@
 import click
 import sys
 from auth import login as auth_login, logout as auth_logout, status as auth_status
-from services.list_services import list_clients, list_contracts, list_events, list_employees
-from services.employee_service import create_employee, update_employee, delete_employee
-from services.contract_service import create_contract, update_contract
-from services.client_service import create_client, update_client
-from services.event_service import create_event, update_event
+from services.list_services import (
+    list_clients, list_contracts, list_events, list_employees,
+    parse_columns, parse_sort,
+    CLIENT_COLUMNS, CONTRACT_COLUMNS, EVENT_COLUMNS, EMPLOYEE_COLUMNS,
+)
+from services.employee_service import (
+    create_employee, update_employee, delete_employee, import_employees,
+    update_employee_fields, update_employees_from_file,
+)
+from services.contract_service import (
+    create_contract, update_contract,
+    update_contract_fields, update_contracts_from_file,
+)
+from services.payment_service import record_payment, import_payments
+from services.archive_service import archive
+from services.audit_service import show_audit, AUDITED_ENTITIES
+from services.client_service import (
+    create_client, update_client, update_client_fields, update_clients_from_file,
+)
+from services.event_service import (
+    create_event, update_event, update_event_fields, update_events_from_file,
+)
 from EpicEventsCRM.controllers.general_commands import help_command
 from EpicEventsCRM.controllers.menus import run_menu_loop
+from EpicEventsCRM.controllers.script_runner import run_script
+from services.filter_expressions import compile_filter
+from EpicEventsCRM.models import Client, Contract, Event, Employee
+from db import profiling, replica, query_cache
+
+
+# Commands that need the central database (or write outside the ORM session,
+# so their changes could not be queued) and are refused in offline mode
+OFFLINE_UNAVAILABLE = {
+    "serve", "record-payment", "import-payments",
+    "create-employee", "update-employee", "delete-employee", "list-employees",
+    "import-employees", "archive", "audit",
+}
+
+
+def _from_file_option(entity: str):
+    return click.option(
+        "--from-file",
+        type=click.Path(exists=True, dir_okay=False),
+        help=f"Apply the {entity} updates of a CSV file in one transaction.",
+    )
+
+
+def _include_archived_option(entity: str):
+    return click.option(
+        "--include-archived", is_flag=True,
+        help=f"Also display the archived {entity}.",
+    )
+
+
+def _list_options(columns: dict, model):
+    """--columns, --sort and --where options of a list-* command."""
+    def parser(parse):
+        def callback(ctx, param, value):
+            if value is None:
+                return None
+            try:
+                return parse(columns, value)
+            except ValueError as e:
+                raise click.BadParameter(str(e))
+        return callback
+
+    def check_filter(ctx, param, value):
+        if value is not None:
+            try:
+                compile_filter(model, value)
+            except ValueError as e:
+                raise click.BadParameter(str(e))
+        return value
+
+    def decorator(func):
+        func = click.option(
+            "--where", callback=check_filter,
+            help="Filter expression, e.g. 'remaining_amount > 1000 and "
+                 "client.company_name ~ \"Acme\"'.",
+        )(func)
+        func = click.option(
+            "--sort", callback=parser(parse_sort),
+            help="Sort by columns, e.g. 'company,id:desc' (default order otherwise).",
+        )(func)
+        return click.option(
+            "--columns", callback=parser(parse_columns),
+            help=f"Comma-separated columns to display: {', '.join(columns)}.",
+        )(func)
+    return decorator
+
+
+def _dispatch_update(entity_id, from_file, fields: dict,
+                     interactive, targeted, batch, id_name: str):
+    """Routes an update-* command to the batch, targeted or interactive path."""
+    field_options = any(value is not None for value in fields.values())
+    if (from_file or field_options) and replica.is_offline():
+        raise click.UsageError(
+            "Field options and --from-file are not available offline; "
+            "use the interactive update."
+        )
+    if from_file:
+        if entity_id is not None or field_options:
+            raise click.UsageError(
+                f"--from-file cannot be combined with {id_name} or field options."
+            )
+        batch(from_file)
+    elif entity_id is None:
+        raise click.UsageError(f"{id_name} is required unless --from-file is given.")
+    elif field_options:
+        targeted(entity_id, **fields)
+    else:
+        interactive(entity_id)
 
 
 @click.group()
-def cli():
+@click.option("--profile", is_flag=True, envvar="EPICEVENTS_PROFILE",
+              help="Print a summary of the SQL statements issued by the command.")
+@click.option("--profile-json", type=click.Path(dir_okay=False),
+              envvar="EPICEVENTS_PROFILE_JSON",
+              help="Also write the SQL profile to this JSON file.")
+@click.option("--offline", is_flag=True, envvar="EPICEVENTS_OFFLINE",
+              help="Work on the local replica; changes are sent by 'sync'.")
+@click.option("--cache-dir", type=click.Path(file_okay=False),
+              envvar="QUERY_CACHE_DIR",
+              help="Reuse the results of list commands across runs, from this folder.")
+@click.pass_context
+def cli(ctx, profile, profile_json, offline, cache_dir):
     """Epic Events CRM Command Line Interface."""
-    pass
+    if cache_dir:
+        query_cache.enable_query_cache(cache_dir=cache_dir)
+    if offline:
+        replica.enable_offline_mode()
+    if replica.is_offline() and ctx.invoked_subcommand in OFFLINE_UNAVAILABLE:
+        raise click.UsageError(f"'{ctx.invoked_subcommand}' is not available offline.")
+    profiler = profiling.active_profiler()
+    if profiler:
+        # Command run from the menu or a script: profiled by the outer run
+        profiler.begin_command(ctx.invoked_subcommand)
+    elif profile or profile_json:
+        profiling.start_profiling().begin_command(ctx.invoked_subcommand)
+        ctx.call_on_close(lambda: profiling.stop_profiling(profile_json))
 
 
 @cli.command(name="menu")
@@ -41,29 +169,40 @@ def status_command():
 
 
 @cli.command(name="list-clients")
-def list_clients_command():
-    list_clients()
+@_list_options(CLIENT_COLUMNS, Client)
+def list_clients_command(columns, sort, where):
+    list_clients(columns=columns, sort=sort, where=where)
 
 
 @cli.command(name="list-contracts")
 @click.option('--not-signed', is_flag=True, help="Display unsigned contracts.")
 @click.option('--not-paid', is_flag=True, help="Display contracts that are not fully paid.")
-def list_contracts_command(not_signed, not_paid):
+@_include_archived_option("contracts")
+@_list_options(CONTRACT_COLUMNS, Contract)
+def list_contracts_command(not_signed, not_paid, include_archived,
+                           columns, sort, where):
     """Lists contracts with optional filters."""
-    list_contracts(not_signed=not_signed, not_paid=not_paid)
+    list_contracts(not_signed=not_signed, not_paid=not_paid,
+                   columns=columns, sort=sort, where=where,
+                   include_archived=include_archived)
 
 
 @cli.command(name="list-events")
 @click.option('--no-support', is_flag=True, help="Display events with no support contact assigned.")
 @click.option('--my-events', is_flag=True, help="Display only your assigned events (for Support staff).")
-def list_events_command(no_support, my_events):
+@_include_archived_option("events")
+@_list_options(EVENT_COLUMNS, Event)
+def list_events_command(no_support, my_events, include_archived, columns, sort, where):
     """Lists events with optional filters."""
-    list_events(no_support=no_support, my_events=my_events)
+    list_events(no_support=no_support, my_events=my_events,
+                columns=columns, sort=sort, where=where,
+                include_archived=include_archived)
 
 
 @cli.command(name="list-employees")
-def list_employees_command():
-    list_employees()
+@_list_options(EMPLOYEE_COLUMNS, Employee)
+def list_employees_command(columns, sort, where):
+    list_employees(columns=columns, sort=sort, where=where)
 
 
 @cli.command(name="create-employee")
@@ -72,9 +211,18 @@ def create_employee_command():
 
 
 @cli.command(name="update-employee")
-@click.argument("employee_id", type=int)
-def update_employee_command(employee_id):
-    update_employee(employee_id)
+@click.argument("employee_id", type=int, required=False)
+@click.option("--first-name", help="New first name.")
+@click.option("--last-name", help="New last name.")
+@click.option("--email", help="New email address.")
+@click.option("--phone", "phone_number", help="New phone number.")
+@click.option("--department",
+              help="New department (COMMERCIAL, SUPPORT or MANAGEMENT).")
+@_from_file_option("employee")
+def update_employee_command(employee_id, from_file, **fields):
+    """Updates an employee interactively, or only the given fields."""
+    _dispatch_update(employee_id, from_file, fields, update_employee,
+                     update_employee_fields, update_employees_from_file, "EMPLOYEE_ID")
 
 
 @cli.command(name="delete-employee")
@@ -83,15 +231,31 @@ def delete_employee_command(employee_id):
     delete_employee(employee_id)
 
 
+@cli.command(name="import-employees")
+@click.argument("file_path", type=click.Path(exists=True, dir_okay=False))
+@click.option("--workers", type=click.IntRange(min=1),
+              help="Processes hashing the passwords (default: one per core).")
+def import_employees_command(file_path, workers):
+    """Creates employees from a CSV file, hashing their passwords in parallel."""
+    import_employees(file_path, workers)
+
+
 @cli.command(name="create-client")
 def create_client_command():
     create_client()
 
 
 @cli.command(name="update-client")
-@click.argument("client_id", type=int)
-def update_client_command(client_id):
-    update_client(client_id)
+@click.argument("client_id", type=int, required=False)
+@click.option("--full-name", help="New full name.")
+@click.option("--email", help="New email address.")
+@click.option("--phone", "phone_number", help="New phone number.")
+@click.option("--company", "company_name", help="New company name.")
+@_from_file_option("client")
+def update_client_command(client_id, from_file, **fields):
+    """Updates a client interactively, or only the given fields."""
+    _dispatch_update(client_id, from_file, fields, update_client,
+                     update_client_fields, update_clients_from_file, "CLIENT_ID")
 
 
 @cli.command(name="create-contract")
@@ -100,9 +264,48 @@ def create_contract_command():
 
 
 @cli.command(name="update-contract")
+@click.argument("contract_id", type=int, required=False)
+@click.option("--total", "total_amount", type=float, help="New total amount.")
+@click.option("--remaining", "remaining_amount", type=float,
+              help="New remaining amount.")
+@click.option("--signed/--unsigned", "is_signed", default=None, help="Contract status.")
+@_from_file_option("contract")
+def update_contract_command(contract_id, from_file, **fields):
+    """Updates a contract interactively, or only the given fields."""
+    _dispatch_update(contract_id, from_file, fields, update_contract,
+                     update_contract_fields, update_contracts_from_file, "CONTRACT_ID")
+
+
+@cli.command(name="record-payment")
 @click.argument("contract_id", type=int)
-def update_contract_command(contract_id):
-    update_contract(contract_id)
+@click.argument("amount", type=float)
+def record_payment_command(contract_id, amount):
+    record_payment(contract_id, amount)
+
+
+@cli.command(name="import-payments")
+@click.argument("file_path", type=click.Path(exists=True, dir_okay=False))
+def import_payments_command(file_path):
+    """Imports payments from a CSV file with contract_id and amount columns."""
+    import_payments(file_path)
+
+
+@cli.command(name="archive")
+@click.option("--before", required=True, type=click.DateTime(["%d-%m-%Y", "%Y-%m-%d"]),
+              help="Archive what closed before this date (DD-MM-YYYY).")
+@click.option("--dry-run", is_flag=True, help="Only count the records to archive.")
+def archive_command(before, dry_run):
+    """Archives the paid contracts and the events that ended before a date."""
+    archive(before, dry_run)
+
+
+@cli.command(name="audit")
+@click.argument("entity",
+                type=click.Choice(list(AUDITED_ENTITIES), case_sensitive=False))
+@click.argument("entity_id", type=int)
+def audit_command(entity, entity_id):
+    """Shows who changed which fields of a record, and when."""
+    show_audit(entity.lower(), entity_id)
 
 
 @cli.command(name="create-event")
@@ -111,9 +314,50 @@ def create_event_command():
 
 
 @cli.command(name="update-event")
-@click.argument("event_id", type=int)
-def update_event_command(event_id):
-    update_event(event_id)
+@click.argument("event_id", type=int, required=False)
+@click.option("--name", "event_name", help="New event name.")
+@click.option("--location", help="New location.")
+@click.option("--attendees", type=int, help="New number of attendees.")
+@click.option("--notes", help="New notes.")
+@click.option("--start", "event_start_date", help="New start date (DD-MM-YYYY HH:MM).")
+@click.option("--end", "event_end_date", help="New end date (DD-MM-YYYY HH:MM).")
+@_from_file_option("event")
+def update_event_command(event_id, from_file, **fields):
+    """Updates an event interactively, or only the given fields."""
+    _dispatch_update(event_id, from_file, fields, update_event,
+                     update_event_fields, update_events_from_file, "EVENT_ID")
+
+
+@cli.command(name="run-script")
+@click.argument("script", type=click.File("r"), default="-")
+@click.option("--stop-on-error", is_flag=True, help="Stop at the first failing line.")
+@click.pass_context
+def run_script_command(ctx, script, stop_on_error):
+    """Runs the commands of SCRIPT (one per line, '-' for stdin) in one session."""
+    failed = run_script(cli, script, stop_on_error=stop_on_error,
+                        from_stdin=script.name == "<stdin>")
+    if failed:
+        ctx.exit(1)
+
+
+@cli.command(name="serve")
+@click.option("--host", default="127.0.0.1", show_default=True,
+              help="Interface to bind.")
+@click.option("--port", default=8000, show_default=True, type=int,
+              help="Port to listen on.")
+@click.option("--workers", default=10, show_default=True, type=int,
+              help="Threads running database queries.")
+def serve_command(host, port, workers):
+    """Starts the read-only JSON API server."""
+    from services.api_server import serve
+    serve(host=host, port=port, workers=workers)
+
+
+@cli.command(name="sync")
+def sync_command():
+    """Sends queued offline changes and updates the local replica."""
+    from services.replica_service import sync_replica
+    sync_replica()
 
 
 @cli.command(name="help")
@@ -0,0 +1,275 @@
+from EpicEventsCRM.models.employee_model import Employee, DepartmentEnum, hash_password
+from EpicEventsCRM.models.contract_model import Contract
+from EpicEventsCRM.models.client_model import Client
+from EpicEventsCRM.models.event_model import Event
+from EpicEventsCRM.models.base_model import Base
+from datetime import datetime, timedelta
+from sqlalchemy import insert, select, func, text
+from rich.progress import Progress
+from rich.console import Console
+from rich.panel import Panel
+from rich import box
+from itertools import accumulate
+import random
+import click
+
+
+console = Console()
+
+# Named sizes, expressed as a number of clients
+SCALES = {"1k": 1_000, "100k": 100_000, "1M": 1_000_000}
+
+# Password of every generated employee (hashed once, shared by all of them)
+SEED_PASSWORD = "EpicEvents-seed-1"
+
+# Rows sent to the database per executemany round-trip
+SEED_BATCH_SIZE = 10_000
+
+DEPARTMENT_WEIGHTS = {
+    DepartmentEnum.COMMERCIAL: 0.6,
+    DepartmentEnum.SUPPORT: 0.3,
+    DepartmentEnum.MANAGEMENT: 0.1,
+}
+
+FIRST_NAMES = [
+    "Alice", "Bruno", "Chloé", "David", "Emma", "Farid", "Gabriel", "Hugo",
+    "Inès", "Jules", "Léa", "Louis", "Manon", "Nathan", "Sarah", "Thomas",
+]
+LAST_NAMES = [
+    "Martin", "Bernard", "Dubois", "Durand", "Lefebvre", "Leroy", "Moreau",
+    "Petit", "Richard", "Robert", "Roux", "Simon", "Laurent", "Michel",
+]
+COMPANY_WORDS = [
+    "Acme", "Atlas", "Blue", "Cobalt", "Delta", "Nova", "Orion", "Pixel",
+    "Quartz", "Sigma", "Terra", "Vertex", "Zen", "Lumen", "Hexa", "Arc",
+]
+COMPANY_SUFFIXES = ["SAS", "SARL", "Group", "Events", "Consulting", "& Co"]
+EVENT_KINDS = ["Launch", "Seminar", "Wedding", "Gala", "Conference", "Party"]
+LOCATIONS = ["Paris", "Lyon", "Marseille", "Bordeaux", "Lille", "Nantes", "Nice"]
+
+
+def scale_counts(clients: int) -> dict:
+    """Returns the row counts of each table for a given number of clients."""
+    return {
+        "employees": max(10, clients // 50),
+        "clients": clients,
+        "contracts": clients * 3 // 2,
+        "events": clients * 3 // 5,
+    }
+
+
+def _name(rng):
+    return rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+
+
+def _phone(rng):
+    return "06" + "".join(rng.choices("0123456789", k=8))
+
+
+def _zipf_picker(rng, ids):
+    """
+    Returns a function picking one of ``ids`` with a long-tail (Zipf)
+    distribution: a few employees or clients own most of the rows, like in a
+    real portfolio.
+    """
+    ids = list(ids)
+    rng.shuffle(ids)
+    cum_weights = list(accumulate(1 / (rank + 1) for rank in range(len(ids))))
+    return lambda: rng.choices(ids, cum_weights=cum_weights)[0]
+
+
+def _next_id(db, column):
+    return (db.scalar(select(func.max(column))) or 0) + 1
+
+
+def _insert_batches(db, model, rows, total: int, progress=None, label=None):
+    """Inserts generated rows with one executemany per SEED_BATCH_SIZE rows."""
+    task = progress.add_task(label, total=total) if progress else None
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= SEED_BATCH_SIZE:
+            db.execute(insert(model), batch)
+            if progress:
+                progress.advance(task, len(batch))
+            batch = []
+    if batch:
+        db.execute(insert(model), batch)
+        if progress:
+            progress.advance(task, len(batch))
+
+
+def seed(db, counts: dict, seed_value: int = 42, progress=None) -> dict:
+    """
+    Generates employees, clients, contracts and events through the models,
+    appending them to the existing rows. The caller commits.
+
+    Every employee gets the password SEED_PASSWORD. Returns the IDs of the
+    first generated employee of each department, for benchmarks and tests.
+    """
+    rng = random.Random(seed_value)
+    now = datetime.now().replace(microsecond=0)
+    password_hash = hash_password(SEED_PASSWORD)
+
+    first_employee = _next_id(db, Employee.employee_id)
+    departments = rng.choices(
+        list(DEPARTMENT_WEIGHTS), weights=DEPARTMENT_WEIGHTS.values(),
+        k=counts["employees"],
+    )
+    # Make sure every department is represented
+    departments[:3] = list(DEPARTMENT_WEIGHTS)
+    by_department = {department: [] for department in DEPARTMENT_WEIGHTS}
+
+    def employees():
+        for offset, department in enumerate(departments):
+            employee_id = first_employee + offset
+            by_department[department].append(employee_id)
+            first, last = _name(rng)
+            yield {
+                "employee_id": employee_id,
+                "first_name": first,
+                "last_name": last,
+                "email": f"{first}.{last}.{employee_id}@epicevents.test".lower(),
+                "password_hash": password_hash,
+                "phone_number": _phone(rng),
+                "department": department,
+            }
+
+    _insert_batches(db, Employee, employees(), counts["employees"],
+                    progress, "Employees")
+    sales = by_department[DepartmentEnum.COMMERCIAL]
+    support = by_department[DepartmentEnum.SUPPORT]
+
+    first_client = _next_id(db, Client.client_id)
+    pick_sales = _zipf_picker(rng, sales)
+    client_sales = {}
+
+    def clients():
+        for client_id in range(first_client, first_client + counts["clients"]):
+            first, last = _name(rng)
+            created = now - timedelta(days=rng.randint(0, 3 * 365))
+            client_sales[client_id] = pick_sales()
+            yield {
+                "client_id": client_id,
+                "full_name": f"{first} {last}",
+                "email": f"client{client_id}@example.test",
+                "phone_number": _phone(rng),
+                "company_name": f"{rng.choice(COMPANY_WORDS)} "
+                                f"{rng.choice(COMPANY_SUFFIXES)}",
+                "date_created": created,
+                "last_contact_date": created + timedelta(days=rng.randint(0, 90)),
+                "sales_contact_id": client_sales[client_id],
+            }
+
+    _insert_batches(db, Client, clients(), counts["clients"], progress, "Clients")
+    pick_client = _zipf_picker(rng, client_sales)
+
+    first_contract = _next_id(db, Contract.contract_id)
+    signed_contracts = []
+
+    def contracts():
+        for contract_id in range(first_contract,
+                                 first_contract + counts["contracts"]):
+            client_id = pick_client()
+            total = round(rng.lognormvariate(8.5, 1.0), 2)
+            is_signed = rng.random() < 0.7
+            if not is_signed:
+                remaining = total
+            elif rng.random() < 0.4:
+                remaining = 0.0
+            else:
+                remaining = round(total * rng.random(), 2)
+            if is_signed:
+                signed_contracts.append((contract_id, client_id))
+            yield {
+                "contract_id": contract_id,
+                "total_amount": total,
+                "remaining_amount": remaining,
+                "date_created": now - timedelta(days=rng.randint(0, 2 * 365)),
+                "is_signed": is_signed,
+                "client_id": client_id,
+                "sales_contact_id": client_sales[client_id],
+            }
+
+    _insert_batches(db, Contract, contracts(), counts["contracts"],
+                    progress, "Contracts")
+
+    first_event = _next_id(db, Event.event_id)
+    pick_support = _zipf_picker(rng, support)
+
+    def events():
+        for event_id in range(first_event, first_event + counts["events"]):
+            contract_id, client_id = rng.choice(signed_contracts)
+            start = now + timedelta(days=rng.randint(-365, 365),
+                                    hours=rng.randint(8, 20))
+            yield {
+                "event_id": event_id,
+                "event_name": f"{rng.choice(EVENT_KINDS)} {event_id}",
+                "event_start_date": start,
+                "event_end_date": start + timedelta(hours=rng.randint(2, 48)),
+                "location": rng.choice(LOCATIONS),
+                "attendees": int(rng.lognormvariate(4, 1)),
+                "notes": None if rng.random() < 0.5 else "Generated event",
+                "client_id": client_id,
+                "contract_id": contract_id,
+                "support_contact_id": pick_support(),
+            }
+
+    if signed_contracts:
+        _insert_batches(db, Event, events(), counts["events"], progress, "Events")
+
+    if db.get_bind().dialect.name == "postgresql":
+        _reset_sequences(db)
+
+    return {department: ids[0] for department, ids in by_department.items()}
+
+
+def _reset_sequences(db):
+    """Moves the PostgreSQL sequences past the explicitly generated IDs."""
+    for model in (Employee, Client, Contract, Event):
+        table = model.__tablename__
+        pk = model.__table__.primary_key.columns.values()[0].name
+        db.execute(text(
+            f"SELECT setval(pg_get_serial_sequence('{table}', '{pk}'), "
+            f"COALESCE(MAX({pk}), 1)) FROM {table}"
+        ))
+
+
+@click.command()
+@click.option("--scale", type=click.Choice(list(SCALES)), default="1k",
+              show_default=True, help="Number of clients to generate.")
+@click.option("--clients", type=int,
+              help="Exact number of clients (overrides --scale).")
+@click.option("--seed", "seed_value", type=int, default=42, show_default=True,
+              help="Random seed, for reproducible data sets.")
+def main(scale, clients, seed_value):
+    """Fills the database of DATABASE_URL with synthetic data."""
+    from db.database import get_db, engine
+
+    Base.metadata.create_all(bind=engine)
+    counts = scale_counts(clients or SCALES[scale])
+    db = next(get_db())
+    try:
+        with Progress(console=console) as progress:
+            seed(db, counts, seed_value, progress)
+        db.commit()
+        console.print(
+            Panel(
+                "[bold green]Generated "
+                + ", ".join(f"{count:,} {table}" for table, count in counts.items())
+                + f".[/bold green]\nEvery employee's password is '{SEED_PASSWORD}'.",
+                box=box.ROUNDED,
+            )
+        )
+    except Exception as e:
+        db.rollback()
+        console.print(
+            Panel(f"[bold red]Error generating data: {e}[/bold red]", box=box.ROUNDED)
+        )
+        raise SystemExit(1)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
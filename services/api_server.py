@@ -0,0 +1,364 @@
+from services.data_access import (
+    get_all_clients,
+    get_all_contracts,
+    get_all_events,
+    get_all_employees,
+    check_permission,
+)
+from concurrent.futures import ThreadPoolExecutor
+from auth import verify_token, get_employee
+from urllib.parse import urlsplit, parse_qs
+from datetime import datetime
+from rich.console import Console
+from functools import partial
+from http import HTTPStatus
+import sentry_sdk
+import asyncio
+import time
+import json
+
+
+console = Console()
+
+# Default and maximum number of rows returned by one request
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+# How long a verified bearer token is trusted before the employee is reloaded
+TOKEN_CACHE_SECONDS = 60
+
+
+class ApiError(Exception):
+    """An error returned to the HTTP client with the given status code."""
+
+    def __init__(self, status: HTTPStatus, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+# --- JSON serializers (one per entity) ---
+
+def _full_name(employee):
+    return f"{employee.first_name} {employee.last_name}" if employee else None
+
+
+def _client_to_dict(client):
+    return {
+        "client_id": client.client_id,
+        "full_name": client.full_name,
+        "email": client.email,
+        "phone_number": client.phone_number,
+        "company_name": client.company_name,
+        "date_created": client.date_created,
+        "last_contact_date": client.last_contact_date,
+        "sales_contact_id": client.sales_contact_id,
+        "sales_contact": _full_name(client.sales_contact),
+    }
+
+
+def _contract_to_dict(contract):
+    return {
+        "contract_id": contract.contract_id,
+        "client_id": contract.client_id,
+        "client": contract.client.full_name,
+        "total_amount": contract.total_amount,
+        "remaining_amount": contract.remaining_amount,
+        "is_signed": bool(contract.is_signed),
+        "date_created": contract.date_created,
+        "sales_contact_id": contract.sales_contact_id,
+        "sales_contact": _full_name(contract.sales_contact),
+        "archived_at": contract.archived_at,
+    }
+
+
+def _event_to_dict(event):
+    return {
+        "event_id": event.event_id,
+        "event_name": event.event_name,
+        "client_id": event.client_id,
+        "client": event.client.full_name,
+        "contract_id": event.contract_id,
+        "location": event.location,
+        "attendees": event.attendees,
+        "notes": event.notes,
+        "event_start_date": event.event_start_date,
+        "event_end_date": event.event_end_date,
+        "support_contact_id": event.support_contact_id,
+        "support_contact": _full_name(event.support_contact),
+        "archived_at": event.archived_at,
+    }
+
+
+def _employee_to_dict(employee):
+    return {
+        "employee_id": employee.employee_id,
+        "first_name": employee.first_name,
+        "last_name": employee.last_name,
+        "email": employee.email,
+        "phone_number": employee.phone_number,
+        "department": employee.department.value,
+    }
+
+
+# Endpoint -> (query function, serializer, fields, accepted boolean filters)
+ROUTES = {
+    "/clients": (
+        get_all_clients, _client_to_dict,
+        ("client_id", "full_name", "email", "phone_number", "company_name",
+         "date_created", "last_contact_date", "sales_contact_id", "sales_contact"),
+        set(),
+    ),
+    "/contracts": (
+        get_all_contracts, _contract_to_dict,
+        ("contract_id", "client_id", "client", "total_amount", "remaining_amount",
+         "is_signed", "date_created", "sales_contact_id", "sales_contact",
+         "archived_at"),
+        {"not_signed", "not_paid", "include_archived"},
+    ),
+    "/events": (
+        get_all_events, _event_to_dict,
+        ("event_id", "event_name", "client_id", "client", "contract_id", "location",
+         "attendees", "notes", "event_start_date", "event_end_date",
+         "support_contact_id", "support_contact", "archived_at"),
+        {"no_support", "my_events", "include_archived"},
+    ),
+    "/employees": (
+        get_all_employees, _employee_to_dict,
+        ("employee_id", "first_name", "last_name", "email", "phone_number",
+         "department"),
+        set(),
+    ),
+}
+
+# Endpoint -> permission checked before its query runs, so that a refusal is
+# answered with 403 whatever the query function does with PermissionError
+ROUTE_PERMISSIONS = {
+    "/clients": "list_clients",
+    "/contracts": "list_contracts",
+    "/events": "list_events",
+    "/employees": "list_employees",
+}
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def _parse_bool(name: str, value: str) -> bool:
+    if value.lower() in ("1", "true", "yes"):
+        return True
+    if value.lower() in ("0", "false", "no"):
+        return False
+    raise ApiError(HTTPStatus.BAD_REQUEST, f"Invalid boolean for '{name}'.")
+
+
+def _parse_int(name: str, value: str, minimum: int, maximum=None) -> int:
+    try:
+        number = int(value)
+    except ValueError:
+        raise ApiError(HTTPStatus.BAD_REQUEST, f"'{name}' must be an integer.")
+    if number < minimum or (maximum is not None and number > maximum):
+        raise ApiError(HTTPStatus.BAD_REQUEST, f"'{name}' is out of range.")
+    return number
+
+
+def parse_list_params(query_string: str, fields: tuple, filters: set) -> dict:
+    """Validates the query string of a list endpoint."""
+    params = {key: values[-1] for key, values in parse_qs(query_string).items()}
+    parsed = {
+        "limit": _parse_int("limit", params.pop("limit", str(DEFAULT_PAGE_SIZE)),
+                            1, MAX_PAGE_SIZE),
+        "offset": _parse_int("offset", params.pop("offset", "0"), 0),
+        "fields": None,
+        "filters": {},
+    }
+    requested = params.pop("fields", None)
+    if requested:
+        parsed["fields"] = [
+            field.strip() for field in requested.split(",") if field.strip()]
+        unknown = [field for field in parsed["fields"] if field not in fields]
+        if unknown:
+            raise ApiError(
+                HTTPStatus.BAD_REQUEST, f"Unknown field(s): {', '.join(unknown)}")
+    for name in list(params):
+        if name not in filters:
+            raise ApiError(HTTPStatus.BAD_REQUEST, f"Unknown parameter '{name}'.")
+        parsed["filters"][name] = _parse_bool(name, params.pop(name))
+    return parsed
+
+
+def select_fields(row: dict, fields):
+    if not fields:
+        return row
+    return {field: row[field] for field in fields}
+
+
+class ApiServer:
+    """
+    Read-only JSON API over the ``get_all_*`` queries, served by asyncio.
+
+    Requests are authenticated with the same JWT as the CLI, sent as
+    ``Authorization: Bearer <token>``. Database work runs in a bounded thread
+    pool, so the event loop never blocks and all requests share the engine's
+    pooled connections.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 8000, workers: int = 10):
+        self.host = host
+        self.port = port
+        self.executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="epicevents-api")
+        self._server = None
+        # token -> (employee, trusted until)
+        self._token_cache = {}
+
+    async def start(self):
+        self._server = await asyncio.start_server(
+            self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def serve_forever(self):
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        self.executor.shutdown(wait=False)
+
+    # --- HTTP handling ---
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                method, target, version = request_line.decode("latin-1").split()
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                if int(headers.get("content-length", 0)):
+                    await reader.readexactly(int(headers["content-length"]))
+
+                status, payload = await self._respond(method, target, headers)
+                keep_alive = (
+                    version == "HTTP/1.1"
+                    and headers.get("connection", "").lower() != "close"
+                )
+                self._write_response(writer, status, payload, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    def _write_response(self, writer, status: HTTPStatus, payload, keep_alive: bool):
+        body = json.dumps(payload, default=_json_default).encode()
+        head = (
+            f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+        )
+        if status == HTTPStatus.UNAUTHORIZED:
+            head += "WWW-Authenticate: Bearer\r\n"
+        writer.write(head.encode("latin-1") + b"\r\n" + body)
+
+    async def _respond(self, method: str, target: str, headers: dict):
+        try:
+            if method != "GET":
+                raise ApiError(HTTPStatus.METHOD_NOT_ALLOWED, "Only GET is supported.")
+            url = urlsplit(target)
+            if url.path == "/health":
+                return HTTPStatus.OK, {"status": "ok"}
+            if url.path not in ROUTES:
+                raise ApiError(HTTPStatus.NOT_FOUND, f"Unknown endpoint '{url.path}'.")
+            user = await self._authenticate(headers.get("authorization", ""))
+            check_permission(user, ROUTE_PERMISSIONS[url.path], url.path)
+            payload = await self._run(partial(self._list, url.path, url.query, user))
+            return HTTPStatus.OK, payload
+        except ApiError as e:
+            return e.status, {"error": str(e)}
+        except PermissionError as e:
+            return HTTPStatus.FORBIDDEN, {"error": str(e)}
+        except Exception as e:
+            sentry_sdk.capture_exception(e)
+            return HTTPStatus.INTERNAL_SERVER_ERROR, {"error": "Internal server error."}
+
+    async def _run(self, func):
+        return await asyncio.get_running_loop().run_in_executor(self.executor, func)
+
+    async def _authenticate(self, authorization: str):
+        scheme, _, token = authorization.partition(" ")
+        if scheme.lower() != "bearer" or not token:
+            raise ApiError(HTTPStatus.UNAUTHORIZED, "Bearer token required.")
+
+        cached = self._token_cache.get(token)
+        if cached and cached[1] > time.time():
+            return cached[0]
+
+        payload = verify_token(token)
+        if not payload:
+            self._token_cache.pop(token, None)
+            raise ApiError(HTTPStatus.UNAUTHORIZED, "Invalid or expired token.")
+        employee = await self._run(partial(get_employee, payload.get("employee_id")))
+        if not employee:
+            raise ApiError(HTTPStatus.UNAUTHORIZED, "Unknown user.")
+
+        trusted_until = time.time() + TOKEN_CACHE_SECONDS
+        trusted_until = min(trusted_until, payload.get("exp", trusted_until))
+        if len(self._token_cache) > 1000:
+            self._token_cache.clear()
+        self._token_cache[token] = (employee, trusted_until)
+        return employee
+
+    def _list(self, path: str, query_string: str, user):
+        """Runs a list query and serializes it (called in a worker thread)."""
+        query_func, serializer, fields, filters = ROUTES[path]
+        params = parse_list_params(query_string, fields, filters)
+        rows = query_func(
+            current_user=user,
+            limit=params["limit"],
+            offset=params["offset"],
+            **params["filters"],
+        )
+        return {
+            "data": [select_fields(serializer(row), params["fields"]) for row in rows],
+            "limit": params["limit"],
+            "offset": params["offset"],
+            "count": len(rows),
+        }
+
+
+def serve(host: str = "127.0.0.1", port: int = 8000, workers: int = 10):
+    """Runs the API server until interrupted."""
+    server = ApiServer(host, port, workers)
+
+    async def main():
+        await server.start()
+        console.print(
+            f"[bold green]Epic Events API listening on "
+            f"http://{server.host}:{server.port}[/bold green]"
+        )
+        try:
+            await server.serve_forever()
+        finally:
+            await server.close()
+
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        console.print("[bold red]API server stopped.[/bold red]")
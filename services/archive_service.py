@@ -0,0 +1,120 @@
+from EpicEventsCRM.utils.permissions import has_permission
+from EpicEventsCRM.models.contract_model import Contract
+from EpicEventsCRM.models.event_model import Event
+from EpicEventsCRM.models.base_model import utcnow
+from sqlalchemy import select, update, func, exists
+from datetime import datetime
+from auth import get_current_user
+from db.database import get_db
+from EpicEventsCRM.views.messages import display_error
+from rich.console import Console
+from rich.panel import Panel
+from rich import box
+import sentry_sdk
+
+
+console = Console()
+
+
+def archivable_events(before: datetime) -> list:
+    """Conditions of the active events that ended before ``before``."""
+    return [Event.archived_at.is_(None), Event.event_end_date < before]
+
+
+def archivable_contracts(before: datetime) -> list:
+    """
+    Conditions of the active contracts closed before ``before``: signed,
+    fully paid, created before that date, and without any event ending after.
+    """
+    return [
+        Contract.archived_at.is_(None),
+        Contract.is_signed.is_(True),
+        Contract.remaining_amount < 0.01,
+        Contract.date_created < before,
+        ~exists().where(
+            Event.contract_id == Contract.contract_id,
+            Event.event_end_date >= before,
+        ),
+    ]
+
+
+def count_archivable(db, before: datetime) -> dict:
+    return {
+        "contracts": db.scalar(
+            select(func.count()).select_from(Contract)
+            .where(*archivable_contracts(before))
+        ),
+        "events": db.scalar(
+            select(func.count()).select_from(Event).where(*archivable_events(before))
+        ),
+    }
+
+
+def archive_records(db, before: datetime) -> dict:
+    """
+    Flags the closed contracts and past events (see archivable_*) as archived,
+    with one UPDATE per table. The rows stay in their tables but leave the
+    lists and their partial indexes. Returns ``{"contracts": n, "events": n}``.
+    The caller commits.
+    """
+    if before > datetime.now():
+        raise ValueError("The archive date cannot be in the future.")
+    counts = {}
+    for name, model, conditions in (
+        ("contracts", Contract, archivable_contracts(before)),
+        ("events", Event, archivable_events(before)),
+    ):
+        result = db.execute(
+            update(model)
+            .where(*conditions)
+            .values(archived_at=utcnow(), version_id=model.version_id + 1)
+            .execution_options(synchronize_session=False)
+        )
+        counts[name] = result.rowcount
+    return counts
+
+
+def archive(before: datetime, dry_run: bool = False):
+    """Archives the contracts and events closed before ``before``."""
+    current_user = get_current_user()
+
+    if not current_user:
+        display_error("Authentication required.")
+        return
+
+    if not has_permission(current_user, "archive"):
+        display_error("Insufficient permissions.")
+        return
+
+    db = next(get_db())
+    try:
+        if dry_run:
+            counts = count_archivable(db, before)
+            verb = "would be archived"
+        else:
+            counts = archive_records(db, before)
+            db.commit()
+            verb = "archived"
+        console.print(
+            Panel(
+                f"[bold green]{counts['contracts']} contract(s) and "
+                f"{counts['events']} event(s) {verb} "
+                f"(closed before {before.strftime('%d-%m-%Y')}).[/bold green]",
+                box=box.ROUNDED,
+            )
+        )
+        if not dry_run:
+            sentry_sdk.capture_message(
+                f"{counts['contracts']} contracts and {counts['events']} events "
+                f"archived by {current_user.email}.",
+                level="info",
+            )
+    except ValueError as ve:
+        db.rollback()
+        display_error(str(ve))
+    except Exception as e:
+        db.rollback()
+        display_error(f"Error archiving records: {e}")
+        sentry_sdk.capture_exception(e)
+    finally:
+        db.close()
@@ -0,0 +1,88 @@
+from services.data_access import (
+    check_permission,
+    select_clients,
+    select_contracts,
+    select_events,
+    select_employees,
+)
+from db import async_database
+from functools import wraps
+from typing import Optional
+from auth import get_current_user
+import sentry_sdk
+import asyncio
+import inspect
+
+
+def require_permission(permission_name: str):
+    """
+    Async counterpart of services.data_access.require_permission.
+
+    When no ``current_user`` is given, the stored token is resolved in a worker
+    thread so the event loop is not blocked by the file and database access.
+    """
+    def decorator(func):
+        forwards_user = "current_user" in inspect.signature(func).parameters
+
+        @wraps(func)
+        async def wrapper(*args, current_user=None, **kwargs):
+            user = current_user or await asyncio.to_thread(get_current_user)
+            check_permission(user, permission_name, func.__name__)
+
+            if forwards_user:
+                kwargs["current_user"] = user
+            return await func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+async def _fetch_all(stmt, entity: str):
+    """Runs a select in a new async session and returns the mapped objects."""
+    async with async_database.get_async_session() as db:
+        try:
+            return (await db.scalars(stmt)).all()
+        except Exception as e:
+            sentry_sdk.capture_exception(e)
+            raise RuntimeError(f"Database error while retrieving {entity}: {e}")
+
+
+@require_permission("list_clients")
+async def get_all_clients(limit: Optional[int] = None, offset: int = 0,
+                          current_user=None):
+    """Retrieves all clients from the database with their sales contact."""
+    return await _fetch_all(
+        select_clients(limit, offset, current_user=current_user), "clients"
+    )
+
+
+@require_permission("list_contracts")
+async def get_all_contracts(not_signed: bool = False, not_paid: bool = False,
+                            limit: Optional[int] = None, offset: int = 0,
+                            current_user=None, include_archived: bool = False):
+    """Retrieves the contracts from the database, with optional filters."""
+    return await _fetch_all(
+        select_contracts(not_signed, not_paid, limit, offset,
+                         current_user=current_user, include_archived=include_archived),
+        "contracts",
+    )
+
+
+@require_permission("list_events")
+async def get_all_events(no_support: bool = False, my_events: bool = False,
+                         limit: Optional[int] = None, offset: int = 0,
+                         current_user=None, include_archived: bool = False):
+    """Retrieves the events from the database, with optional filters."""
+    return await _fetch_all(
+        select_events(no_support, my_events, limit, offset, current_user,
+                      include_archived=include_archived),
+        "events",
+    )
+
+
+@require_permission("list_employees")
+async def get_all_employees(limit: Optional[int] = None, offset: int = 0,
+                            current_user=None):
+    """Retrieves all employees from the database."""
+    return await _fetch_all(
+        select_employees(limit, offset, current_user=current_user), "employees"
+    )
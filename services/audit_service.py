@@ -0,0 +1,103 @@
+from EpicEventsCRM.models.audit_log_model import AuditLog
+from EpicEventsCRM.models.employee_model import Employee
+from EpicEventsCRM.utils.permissions import has_permission
+from sqlalchemy import select
+from auth import get_current_user
+from db.database import get_db
+from EpicEventsCRM.views.messages import display_error
+from rich.console import Console
+from rich.table import Table
+from rich import box
+import sentry_sdk
+import json
+
+
+console = Console()
+
+# Entity argument of the audit command -> entity name in the audit trail
+AUDITED_ENTITIES = {
+    "client": "Client",
+    "contract": "Contract",
+    "event": "Event",
+    "employee": "Employee",
+}
+
+
+def get_audit_trail(db, entity: str, entity_id: int) -> list:
+    """
+    Returns the ``(AuditLog, first name, last name)`` rows of an entity,
+    oldest first, read through the (entity, entity_id, changed_at) index. The
+    names are None if the author is unknown or was deleted.
+    """
+    return db.execute(
+        select(AuditLog, Employee.first_name, Employee.last_name)
+        .outerjoin(Employee, Employee.employee_id == AuditLog.employee_id)
+        .where(AuditLog.entity == entity, AuditLog.entity_id == entity_id)
+        .order_by(AuditLog.changed_at, AuditLog.audit_id)
+    ).all()
+
+
+def _display(value) -> str:
+    return "[dim]—[/dim]" if value is None else str(value)
+
+
+def show_audit(entity: str, entity_id: int):
+    """Displays who changed which fields of a record, and when."""
+    current_user = get_current_user()
+
+    if not current_user:
+        display_error("Authentication required.")
+        return
+
+    if not has_permission(current_user, "audit"):
+        display_error("Insufficient permissions.")
+        return
+
+    name = AUDITED_ENTITIES[entity]
+    db = next(get_db())
+    try:
+        trail = get_audit_trail(db, name, entity_id)
+    except Exception as e:
+        display_error(f"Error reading the audit trail: {e}")
+        sentry_sdk.capture_exception(e)
+        return
+    finally:
+        db.close()
+
+    if not trail:
+        console.print(
+            f"[bold yellow]No recorded change for {name} {entity_id}.[/bold yellow]"
+        )
+        return
+
+    table = Table(
+        title=f"[bold cyan]History of {name} {entity_id}[/bold cyan]",
+        box=box.ROUNDED,
+        header_style="bold white",
+    )
+    table.add_column("Date", style="cyan", no_wrap=True)
+    table.add_column("By", style="green")
+    table.add_column("Action", style="magenta")
+    table.add_column("Field", style="yellow")
+    table.add_column("Before", style="blue")
+    table.add_column("After", style="blue")
+
+    for entry, first_name, last_name in trail:
+        if first_name:
+            author = f"{first_name} {last_name}"
+        else:
+            # Deleted since, or changed outside an authenticated command
+            author = f"#{entry.employee_id}" if entry.employee_id else _display(None)
+        changes = json.loads(entry.changes) or {"": [None, None]}
+        for index, (field, (before, after)) in enumerate(changes.items()):
+            first = index == 0
+            table.add_row(
+                entry.changed_at.strftime("%d-%m-%Y %H:%M:%S") if first else "",
+                author if first else "",
+                entry.operation if first else "",
+                field,
+                _display(before),
+                _display(after),
+            )
+        table.add_section()
+    console.print(table)
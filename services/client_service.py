@@ -5,9 +5,20 @@ from EpicEventsCRM.utils.validators import (
 )
 from EpicEventsCRM.utils.permissions import has_permission
 from EpicEventsCRM.models.client_model import Client
+from services.updates import (
+    UpdateConflictError,
+    load_for_update,
+    commit_versioned_update,
+    display_conflict,
+    collect_file_updates,
+    reject_unknown_fields,
+    run_field_updates,
+)
 from sqlalchemy.exc import IntegrityError
+from datetime import datetime, timezone
 from db.database import get_db
 from auth import get_current_user
+from EpicEventsCRM.views.messages import display_error
 from rich.console import Console
 from rich.prompt import Prompt
 from rich.panel import Panel
@@ -23,15 +34,11 @@ def create_client():
     current_user = get_current_user()
 
     if not current_user:
-        console.print(
-            Panel("[bold red]Authentication required.[/bold red]", box=box.ROUNDED)
-        )
+        display_error("Authentication required.")
         return
 
     if not has_permission(current_user, "create_client"):
-        console.print(
-            Panel("[bold red]Insufficient permissions.[/bold red]", box=box.ROUNDED)
-        )
+        display_error("Insufficient permissions.")
         return
 
     console.print(
@@ -72,7 +79,7 @@ def create_client():
         email=email,
         phone_number=phone_number,
         company_name=company_name,
-        sales_contact=current_user,
+        sales_contact_id=current_user.employee_id,
     )
 
     # Save to database
@@ -90,21 +97,11 @@ def create_client():
         )
     except IntegrityError as e:
         db.rollback()
-        console.print(
-            Panel(
-                "[bold red]Error: A client with this email already exists.[/bold red]",
-                box=box.ROUNDED,
-            )
-        )
+        display_error("Error: A client with this email already exists.")
         sentry_sdk.capture_exception(e)
     except Exception as e:
         db.rollback()
-        console.print(
-            Panel(
-                f"[bold red]Error creating client: {e}[/bold red]",
-                box=box.ROUNDED,
-            )
-        )
+        display_error(f"Error creating client: {e}")
         sentry_sdk.capture_exception(e)
     finally:
         db.close()
@@ -116,25 +113,16 @@ def update_client(client_id):
     current_user = get_current_user()
 
     if not current_user:
-        console.print(
-            Panel("[bold red]Authentication required.[/bold red]", box=box.ROUNDED)
-        )
+        display_error("Authentication required.")
         return
 
-    db = next(get_db())
-
-    client = db.query(Client).filter_by(client_id=client_id).first()
+    client = load_for_update(Client, client_id)
     if not client:
-        console.print(Panel("[bold red]Client not found.[/bold red]", box=box.ROUNDED))
+        display_error("Client not found.")
         return
 
     if not has_permission(current_user, "update_client"):
-        console.print(
-            Panel(
-                "[bold red]You do not have permission to update this client."
-                "[/bold red]",
-                box=box.ROUNDED,
-            ))
+        display_error("You do not have permission to update this client.")
         return
 
     console.print(
@@ -178,15 +166,16 @@ def update_client(client_id):
     )
     validate_string_length(company_name, "Company name", 100)
 
-    # Update client details
-    setattr(client, "full_name", full_name)
-    setattr(client, "email", email)
-    setattr(client, "phone_number", phone_number)
-    setattr(client, "company_name", company_name)
+    changes = {
+        "full_name": full_name,
+        "email": email,
+        "phone_number": phone_number,
+        "company_name": company_name,
+    }
 
-    # Save changes to database
+    # Save changes to database (the row is re-read and checked at commit time)
     try:
-        db.commit()
+        commit_versioned_update(client, changes)
         console.print(
             Panel(
                 f"[bold green]Client '{
@@ -197,23 +186,71 @@ def update_client(client_id):
         sentry_sdk.capture_message(
             f"Client '{full_name}' updated successfully!", level="info"
         )
+    except UpdateConflictError as conflict:
+        display_conflict(conflict)
+        sentry_sdk.capture_message(str(conflict), level="warning")
     except IntegrityError as e:
-        db.rollback()
-        console.print(
-            Panel(
-                "[bold red]Error: A client with this email already exists.[/bold red]",
-                box=box.ROUNDED,
-            )
-        )
+        display_error("Error: A client with this email already exists.")
         sentry_sdk.capture_exception(e)
     except Exception as e:
-        db.rollback()
-        console.print(
-            Panel(
-                f"[bold red]Error updating client: {e}[/bold red]",
-                box=box.ROUNDED,
-            )
-        )
+        display_error(f"Error updating client: {e}")
         sentry_sdk.capture_exception(e)
-    finally:
-        db.close()
+
+
+# Fields accepted by the non-interactive update paths
+CLIENT_UPDATE_FIELDS = {"full_name", "email", "phone_number", "company_name"}
+
+
+def _client_changes(values: dict) -> dict:
+    """Validates the fields of a non-interactive client update."""
+    values = {key: value for key, value in values.items() if value is not None}
+    reject_unknown_fields(values, CLIENT_UPDATE_FIELDS)
+    changes = {}
+    if "full_name" in values:
+        changes["full_name"] = validate_string_length(
+            values["full_name"], "Full name", 100)
+    if "email" in values:
+        changes["email"] = validate_email(values["email"])
+    if "phone_number" in values:
+        changes["phone_number"] = validate_phone_number(values["phone_number"])
+    if "company_name" in values:
+        changes["company_name"] = validate_string_length(
+            values["company_name"], "Company name", 100)
+    if changes:
+        # Same rule as the before_update listener of the model
+        changes["last_contact_date"] = datetime.now(timezone.utc)
+    return changes
+
+
+def _can_update_clients(current_user) -> bool:
+    if not current_user:
+        display_error("Authentication required.")
+        return False
+    if not has_permission(current_user, "update_client"):
+        display_error("Insufficient permissions.")
+        return False
+    return True
+
+
+def update_client_fields(client_id: int, **values):
+    """Updates only the given client fields, without prompting."""
+    if not _can_update_clients(get_current_user()):
+        return
+    try:
+        changes = _client_changes(values)
+    except ValueError as ve:
+        display_error(str(ve))
+        return
+    run_field_updates(Client, [(None, client_id, changes)])
+
+
+def update_clients_from_file(file_path: str):
+    """Applies the client updates of a CSV file in a single transaction."""
+    if not _can_update_clients(get_current_user()):
+        return
+    try:
+        updates = collect_file_updates(file_path, "client_id", _client_changes)
+    except (OSError, ValueError) as e:
+        display_error(f"Update aborted, nothing saved: {e}")
+        return
+    run_field_updates(Client, updates)
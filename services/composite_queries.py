@@ -0,0 +1,73 @@
+from EpicEventsCRM.models.contract_model import Contract
+from EpicEventsCRM.models.client_model import Client
+from EpicEventsCRM.models.event_model import Event
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy import select, func
+from db.database import get_db
+import sentry_sdk
+import asyncio
+
+
+# Upper bound of queries run at the same time by run_concurrently
+MAX_CONCURRENT_QUERIES = 8
+
+
+def run_concurrently(queries: dict) -> dict:
+    """
+    Runs independent queries at the same time and merges their results.
+
+    ``queries`` maps a name to a callable taking no argument; each callable
+    must open its own session (e.g. the get_all_* functions), so every query
+    runs on its own pooled connection. The round-trips overlap, and the total
+    latency is the one of the slowest query rather than the sum of all of
+    them. Returns ``{name: result}``; the first error is re-raised once every
+    query has finished.
+    """
+    if len(queries) <= 1:
+        return {name: query() for name, query in queries.items()}
+
+    workers = min(len(queries), MAX_CONCURRENT_QUERIES)
+    with ThreadPoolExecutor(max_workers=workers,
+                            thread_name_prefix="epicevents-query") as executor:
+        futures = {name: executor.submit(query) for name, query in queries.items()}
+
+    results = {}
+    for name, future in futures.items():
+        error = future.exception()
+        if error is not None:
+            sentry_sdk.capture_exception(error)
+            raise error
+        results[name] = future.result()
+    return results
+
+
+async def gather_queries(queries: dict) -> dict:
+    """
+    Async counterpart of run_concurrently for the async data-access layer:
+    awaits the ``{name: coroutine}`` queries together on the running loop.
+    """
+    results = await asyncio.gather(*queries.values())
+    return dict(zip(queries, results))
+
+
+def _count_rows(column, value) -> int:
+    """Counts the rows of ``column``'s table where ``column == value``."""
+    db = next(get_db())
+    try:
+        return db.scalar(
+            select(func.count()).select_from(column.table).where(column == value)
+        )
+    finally:
+        db.close()
+
+
+def count_related_records(employee_id: int) -> dict:
+    """
+    Returns the number of clients, contracts and events an employee is in
+    charge of, with the three counts run concurrently.
+    """
+    return run_concurrently({
+        "clients": lambda: _count_rows(Client.sales_contact_id, employee_id),
+        "contracts": lambda: _count_rows(Contract.sales_contact_id, employee_id),
+        "events": lambda: _count_rows(Event.support_contact_id, employee_id),
+    })
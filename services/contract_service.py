@@ -2,8 +2,19 @@ from EpicEventsCRM.utils.validators import validate_positive_amount
 from EpicEventsCRM.utils.permissions import has_permission
 from EpicEventsCRM.models.contract_model import Contract
 from EpicEventsCRM.models.client_model import Client
+from services.updates import (
+    UpdateConflictError,
+    load_for_update,
+    commit_versioned_update,
+    display_conflict,
+    collect_file_updates,
+    parse_bool,
+    reject_unknown_fields,
+    run_field_updates,
+)
 from db.database import get_db
 from auth import get_current_user
+from EpicEventsCRM.views.messages import display_error
 from rich.console import Console
 from rich.prompt import Prompt
 from rich.panel import Panel
@@ -18,15 +29,11 @@ def create_contract():
     current_user = get_current_user()
 
     if not current_user:
-        console.print(
-            Panel("[bold red]Authentication required.[/bold red]", box=box.ROUNDED)
-        )
+        display_error("Authentication required.")
         return
 
     if not has_permission(current_user, "create_contract"):
-        console.print(
-            Panel("[bold red]Insufficient permissions.[/bold red]", box=box.ROUNDED)
-        )
+        display_error("Insufficient permissions.")
         return
 
     console.print(
@@ -44,13 +51,13 @@ def create_contract():
     try:
         client_id = int(client_id_input)
     except ValueError as e:
-        console.print(Panel("[bold red]Invalid Client ID.[/bold red]", box=box.ROUNDED))
+        display_error("Invalid Client ID.")
         sentry_sdk.capture_exception(e)
         return
 
-    client = db.query(Client).filter_by(client_id=client_id).first()
+    client = db.get(Client, client_id)
     if not client:
-        console.print(Panel("[bold red]Client not found.[/bold red]", box=box.ROUNDED))
+        display_error("Client not found.")
         sentry_sdk.capture_message(
             f"Client with ID {client_id} not found.", level="error"
         )
@@ -63,7 +70,7 @@ def create_contract():
         )
         total_amount = validate_positive_amount(total_amount, "total_amount")
     except ValueError as ve:
-        console.print(Panel(f"[bold red]{ve}[/bold red]", box=box.ROUNDED))
+        display_error(str(ve))
         sentry_sdk.capture_exception(ve)
         return
 
@@ -75,17 +82,12 @@ def create_contract():
             remaining_amount, "remaining_amount"
         )
     except ValueError as ve:
-        console.print(Panel(f"[bold red]{ve}[/bold red]", box=box.ROUNDED))
+        display_error(str(ve))
         sentry_sdk.capture_exception(ve)
         return
 
     if remaining_amount > total_amount:
-        console.print(
-            Panel(
-                "[bold red]Remaining amount cannot be greater than total amount."
-                "[/bold red]",
-                box=box.ROUNDED,
-            ))
+        display_error("Remaining amount cannot be greater than total amount.")
         sentry_sdk.capture_message(
             "Remaining amount cannot be greater than total amount.", level="warning"
         )
@@ -124,13 +126,7 @@ def create_contract():
         )
     except Exception as e:
         db.rollback()
-        console.print(
-            Panel(
-                f"[bold red]Error creating contract: {
-                    e}[/bold red]",
-                box=box.ROUNDED,
-            )
-        )
+        display_error(f"Error creating contract: {e}")
         sentry_sdk.capture_exception(e)
     finally:
         db.close()
@@ -141,33 +137,23 @@ def update_contract(contract_id):
     current_user = get_current_user()
 
     if not current_user:
-        console.print(
-            Panel("[bold red]Authentication required.[/bold red]", box=box.ROUNDED)
-        )
+        display_error("Authentication required.")
         return
 
     if not has_permission(current_user, "update_contract"):
-        console.print(
-            Panel("[bold red]Insufficient permissions.[/bold red]", box=box.ROUNDED)
-        )
+        display_error("Insufficient permissions.")
         return
 
-    db = next(get_db())
-
     try:
         contract_id = int(contract_id)
     except ValueError as e:
-        console.print(
-            Panel("[bold red]Invalid Contract ID.[/bold red]", box=box.ROUNDED)
-        )
+        display_error("Invalid Contract ID.")
         sentry_sdk.capture_exception(e)
         return
 
-    contract = db.query(Contract).filter_by(contract_id=contract_id).first()
+    contract = load_for_update(Contract, contract_id)
     if not contract:
-        console.print(
-            Panel("[bold red]Contract not found.[/bold red]", box=box.ROUNDED)
-        )
+        display_error("Contract not found.")
         sentry_sdk.capture_message(
             f"Contract with ID {contract_id} not found.", level="error"
         )
@@ -196,7 +182,7 @@ def update_contract(contract_id):
         )
         total_amount = validate_positive_amount(total_amount, "total_amount")
     except ValueError as ve:
-        console.print(Panel(f"[bold red]{ve}[/bold red]", box=box.ROUNDED))
+        display_error(str(ve))
         sentry_sdk.capture_exception(ve)
         return
 
@@ -212,17 +198,12 @@ def update_contract(contract_id):
             remaining_amount, "remaining_amount"
         )
     except ValueError as ve:
-        console.print(Panel(f"[bold red]{ve}[/bold red]", box=box.ROUNDED))
+        display_error(str(ve))
         sentry_sdk.capture_exception(ve)
         return
 
     if remaining_amount > total_amount:
-        console.print(
-            Panel(
-                "[bold red]Remaining amount cannot be greater than total amount."
-                "[/bold red]",
-                box=box.ROUNDED,
-            ))
+        display_error("Remaining amount cannot be greater than total amount.")
         sentry_sdk.capture_message(
             "Remaining amount cannot be greater than total amount.", level="warning"
         )
@@ -237,14 +218,15 @@ def update_contract(contract_id):
         == "Y"
     )
 
-    # Update contract
-    setattr(contract, "total_amount", total_amount)
-    setattr(contract, "remaining_amount", remaining_amount)
-    setattr(contract, "is_signed", is_signed)
+    changes = {
+        "total_amount": total_amount,
+        "remaining_amount": remaining_amount,
+        "is_signed": is_signed,
+    }
 
-    # Save changes to database
+    # Save changes to database (the row is re-read and checked at commit time)
     try:
-        db.commit()
+        commit_versioned_update(contract, changes)
         console.print(
             Panel(
                 "[bold green]Contract updated successfully![/bold green]",
@@ -254,15 +236,77 @@ def update_contract(contract_id):
         sentry_sdk.capture_message(
             f"Contract ID {contract_id} updated successfully.", level="info"
         )
+    except UpdateConflictError as conflict:
+        display_conflict(conflict)
+        sentry_sdk.capture_message(str(conflict), level="warning")
     except Exception as e:
-        db.rollback()
-        console.print(
-            Panel(
-                f"[bold red]Error updating contract: {
-                    e}[/bold red]",
-                box=box.ROUNDED,
-            )
-        )
+        display_error(f"Error updating contract: {e}")
         sentry_sdk.capture_exception(e)
-    finally:
-        db.close()
+
+
+# Fields accepted by the non-interactive update paths
+CONTRACT_UPDATE_FIELDS = {"total_amount", "remaining_amount", "is_signed"}
+
+
+def _contract_changes(values: dict) -> dict:
+    """Validates the fields of a non-interactive contract update."""
+    values = {key: value for key, value in values.items() if value is not None}
+    reject_unknown_fields(values, CONTRACT_UPDATE_FIELDS)
+    changes = {}
+    for key in ("total_amount", "remaining_amount"):
+        if key in values:
+            changes[key] = validate_positive_amount(float(values[key]), key)
+    if "is_signed" in values:
+        changes["is_signed"] = parse_bool(values["is_signed"])
+    return changes
+
+
+def _check_contract_amounts(row, changes: dict):
+    """Keeps the remaining amount lower than the total once merged."""
+    total = changes.get("total_amount", row.total_amount)
+    remaining = changes.get("remaining_amount", row.remaining_amount)
+    if remaining > total:
+        raise ValueError("Remaining amount cannot be greater than total amount.")
+
+
+def _run_contract_updates(updates: list):
+    run_field_updates(
+        Contract,
+        updates,
+        check=_check_contract_amounts,
+        check_columns=(Contract.total_amount, Contract.remaining_amount),
+    )
+
+
+def _can_update_contracts(current_user) -> bool:
+    if not current_user:
+        display_error("Authentication required.")
+        return False
+    if not has_permission(current_user, "update_contract"):
+        display_error("Insufficient permissions.")
+        return False
+    return True
+
+
+def update_contract_fields(contract_id: int, **values):
+    """Updates only the given contract fields, without prompting."""
+    if not _can_update_contracts(get_current_user()):
+        return
+    try:
+        changes = _contract_changes(values)
+    except ValueError as ve:
+        display_error(str(ve))
+        return
+    _run_contract_updates([(None, contract_id, changes)])
+
+
+def update_contracts_from_file(file_path: str):
+    """Applies the contract updates of a CSV file in a single transaction."""
+    if not _can_update_contracts(get_current_user()):
+        return
+    try:
+        updates = collect_file_updates(file_path, "contract_id", _contract_changes)
+    except (OSError, ValueError) as e:
+        display_error(f"Update aborted, nothing saved: {e}")
+        return
+    _run_contract_updates(updates)
@@ -1,53 +1,336 @@
 # File: services/data_access.py (Refactored)
 
-from EpicEventsCRM.models.employee_model import Employee
+from EpicEventsCRM.models.employee_model import Employee, DepartmentEnum
 from EpicEventsCRM.utils.permissions import has_permission
 from EpicEventsCRM.models.contract_model import Contract
 from EpicEventsCRM.models.client_model import Client
 from EpicEventsCRM.models.event_model import Event
 from sqlalchemy.orm import joinedload
+from sqlalchemy import select
 from functools import wraps
+from datetime import datetime, timedelta
+from typing import Optional
+import inspect
+import os
 from auth import get_current_user
 from db.database import get_db
+from db.query_cache import cached_query
+from services.filter_expressions import compile_filter
 import sentry_sdk
 
 
+def check_permission(user, permission_name: str, func_name: str):
+    """
+    Raises PermissionError if ``user`` is missing or lacks ``permission_name``.
+    Authorization failures are reported to Sentry.
+    """
+    if not user:
+        sentry_sdk.capture_message(
+            f"Unauthorized access attempt to {func_name}", level="warning"
+        )
+        raise PermissionError("Authentication required. Please log in.")
+
+    if not has_permission(user, permission_name):
+        sentry_sdk.capture_message(
+            f"User '{user.email}' lacks permission for '{permission_name}'.",
+            level="warning",
+        )
+        raise PermissionError(
+            "You do not have permission to perform this action."
+        )
+
+
 def require_permission(permission_name: str):
     """
     A decorator that checks if a user is authenticated and has the required permission.
     Handles exceptions and Sentry logging for authorization failures.
+
+    Callers that already know the user (e.g. the API server) can pass it with
+    the ``current_user`` keyword to skip the token lookup; it is forwarded to
+    the decorated function if that function accepts it.
     """
     def decorator(func):
+        forwards_user = "current_user" in inspect.signature(func).parameters
+
         @wraps(func)
-        def wrapper(*args, **kwargs):
-            user = get_current_user()
-            if not user:
-                sentry_sdk.capture_message(
-                    f"Unauthorized access attempt to {func.__name__}", level="warning"
-                )
-                raise PermissionError("Authentication required. Please log in.")
-
-            if not has_permission(user, permission_name):
-                sentry_sdk.capture_message(
-                    f"User '{user.email}' lacks permission for '{permission_name}'.",
-                    level="warning",
-                )
-                raise PermissionError(
-                    "You do not have permission to perform this action."
-                )
+        def wrapper(*args, current_user=None, **kwargs):
+            user = current_user or get_current_user()
+            check_permission(user, permission_name, func.__name__)
 
             # If checks pass, execute the original function
+            if forwards_user:
+                kwargs["current_user"] = user
             return func(*args, **kwargs)
         return wrapper
     return decorator
 
 
+# Row-level scoping: when enabled, list queries only return the rows of the
+# user's own portfolio, filtered by the database
+ROW_SCOPING = os.getenv("EPICEVENTS_ROW_SCOPING", "").lower() in ("1", "true", "yes")
+
+# Department -> {listed entity: column holding the employee in charge};
+# departments and entities not listed are not restricted
+ROW_SCOPES = {
+    DepartmentEnum.COMMERCIAL: {
+        Client: Client.sales_contact_id,
+        Contract: Contract.sales_contact_id,
+    },
+    DepartmentEnum.SUPPORT: {
+        Event: Event.support_contact_id,
+    },
+}
+
+
+def row_scope(model, user):
+    """
+    Returns the condition restricting a list of ``model`` to the rows ``user``
+    is in charge of, or None if the list is not scoped (see ROW_SCOPING).
+    Only the listed entity is filtered: the related rows loaded with it (e.g.
+    the client of an event) are always complete.
+    """
+    if not ROW_SCOPING or user is None:
+        return None
+    column = ROW_SCOPES.get(user.department, {}).get(model)
+    return None if column is None else column == user.employee_id
+
+
+# --- Statements shared by the synchronous and async data-access layers ---
+
+def _paginate(stmt, model, row_fields: dict, sort, default_order,
+              limit: Optional[int], offset: int):
+    """
+    Orders the query by ``sort`` (``[(field, descending), ...]`` of
+    ``row_fields``) or ``default_order``, then applies LIMIT/OFFSET. Without
+    a default order, the query is only ordered when a page is requested.
+    The primary key breaks ties, so pages are stable.
+    """
+    pk = model.__mapper__.primary_key[0]
+    if sort:
+        order = [
+            row_fields[name][0].desc() if descending else row_fields[name][0]
+            for name, descending in sort
+        ] + [pk]
+    elif default_order:
+        order = default_order
+    elif limit is None and not offset:
+        return stmt
+    else:
+        order = [pk]
+    return stmt.order_by(*order).limit(limit).offset(offset or None)
+
+
+def _full_name(employee):
+    return employee.first_name + " " + employee.last_name
+
+
+# Fields of the projection rows of each list:
+# name -> (column expression, relationship to outer join for it, or None)
+CLIENT_ROW_FIELDS = {
+    "client_id": (Client.client_id, None),
+    "full_name": (Client.full_name, None),
+    "email": (Client.email, None),
+    "phone_number": (Client.phone_number, None),
+    "company_name": (Client.company_name, None),
+    "date_created": (Client.date_created, None),
+    "last_contact_date": (Client.last_contact_date, None),
+    "sales_contact_name": (_full_name(Employee), Client.sales_contact),
+}
+
+CONTRACT_ROW_FIELDS = {
+    "contract_id": (Contract.contract_id, None),
+    "client_name": (Client.full_name, Contract.client),
+    "total_amount": (Contract.total_amount, None),
+    "remaining_amount": (Contract.remaining_amount, None),
+    "is_signed": (Contract.is_signed, None),
+    "sales_contact_name": (_full_name(Employee), Contract.sales_contact),
+    "archived_at": (Contract.archived_at, None),
+}
+
+EVENT_ROW_FIELDS = {
+    "event_id": (Event.event_id, None),
+    "event_name": (Event.event_name, None),
+    "client_name": (Client.full_name, Event.client),
+    "location": (Event.location, None),
+    "attendees": (Event.attendees, None),
+    "event_start_date": (Event.event_start_date, None),
+    "event_end_date": (Event.event_end_date, None),
+    "support_contact_name": (_full_name(Employee), Event.support_contact),
+    "archived_at": (Event.archived_at, None),
+}
+
+EMPLOYEE_ROW_FIELDS = {
+    "employee_id": (Employee.employee_id, None),
+    "first_name": (Employee.first_name, None),
+    "last_name": (Employee.last_name, None),
+    "email": (Employee.email, None),
+    "phone_number": (Employee.phone_number, None),
+    "department": (Employee.department, None),
+}
+
+
+def _check_fields(row_fields: dict, names):
+    unknown = [name for name in names if name not in row_fields]
+    if unknown:
+        raise ValueError(
+            f"Unknown field(s): {', '.join(unknown)}. "
+            f"Available: {', '.join(row_fields)}."
+        )
+
+
+def _outerjoin(stmt, relationships, joined: set):
+    for relationship in relationships:
+        if relationship is not None and relationship.property not in joined:
+            stmt = stmt.outerjoin(relationship)
+            joined.add(relationship.property)
+    return stmt
+
+
+def select_rows(model, row_fields: dict, fields=None, sort=None):
+    """
+    Selects ``fields`` (default: all) of ``row_fields`` (name -> (column,
+    relationship)) of ``model`` as plain rows: no ORM instance, identity map
+    entry or relationship is built, and each related table is joined once,
+    only if one of the selected or ``sort`` fields comes from it.
+    """
+    names = list(fields or row_fields)
+    _check_fields(row_fields, names + [name for name, _ in sort or ()])
+    stmt = select(*(
+        row_fields[name][0].label(name) for name in names
+    )).select_from(model)
+    return _outerjoin(stmt, [
+        row_fields[name][1] for name in names + [name for name, _ in sort or ()]
+    ], set())
+
+
+def _select_list(model, row_fields: dict, entity_options, projection: bool,
+                 fields, sort, where: Optional[str], current_user):
+    """
+    Rows of ``fields`` in projection mode, else entities with their relations,
+    restricted by the ``where`` filter expression (see filter_expressions) and
+    the row scope of ``current_user``.
+    """
+    if projection:
+        stmt = select_rows(model, row_fields, fields, sort)
+    else:
+        _check_fields(row_fields, [name for name, _ in sort or ()])
+        stmt = select(model).options(*entity_options)
+        stmt = _outerjoin(stmt, [row_fields[name][1] for name, _ in sort or ()], set())
+    if where:
+        stmt = stmt.where(compile_filter(model, where))
+    scope = row_scope(model, current_user)
+    return stmt if scope is None else stmt.where(scope)
+
+
+def select_clients(limit: Optional[int] = None, offset: int = 0,
+                   projection: bool = False, fields=None, sort=None,
+                   where: Optional[str] = None, current_user=None):
+    """Builds the query of get_all_clients."""
+    stmt = _select_list(Client, CLIENT_ROW_FIELDS, [joinedload(Client.sales_contact)],
+                        projection, fields, sort, where, current_user)
+    return _paginate(stmt, Client, CLIENT_ROW_FIELDS, sort, None, limit, offset)
+
+
+def select_contracts(not_signed: bool = False, not_paid: bool = False,
+                     limit: Optional[int] = None, offset: int = 0,
+                     projection: bool = False, fields=None, sort=None,
+                     where: Optional[str] = None, current_user=None,
+                     include_archived: bool = False):
+    """Builds the query of get_all_contracts."""
+    stmt = _select_list(
+        Contract, CONTRACT_ROW_FIELDS,
+        [joinedload(Contract.client), joinedload(Contract.sales_contact)],
+        projection, fields, sort, where, current_user,
+    )
+    if not_signed:
+        stmt = stmt.where(Contract.is_signed.is_(False))
+    if not_paid:
+        stmt = stmt.where(Contract.remaining_amount > 0)
+    if not include_archived:
+        stmt = stmt.where(Contract.archived_at.is_(None))
+    return _paginate(stmt, Contract, CONTRACT_ROW_FIELDS, sort,
+                     [Contract.contract_id], limit, offset)
+
+
+def select_events(no_support: bool = False, my_events: bool = False,
+                  limit: Optional[int] = None, offset: int = 0, current_user=None,
+                  projection: bool = False, fields=None, sort=None,
+                  where: Optional[str] = None, include_archived: bool = False):
+    """Builds the query of get_all_events."""
+    stmt = _select_list(
+        Event, EVENT_ROW_FIELDS,
+        [joinedload(Event.client), joinedload(Event.support_contact)],
+        projection, fields, sort, where, current_user,
+    )
+    if no_support:
+        stmt = stmt.where(Event.support_contact_id.is_(None))
+    if my_events:
+        if not current_user:
+            raise PermissionError("Authentication required to view your events.")
+        stmt = stmt.where(Event.support_contact_id == current_user.employee_id)
+    if not include_archived:
+        stmt = stmt.where(Event.archived_at.is_(None))
+    return _paginate(stmt, Event, EVENT_ROW_FIELDS, sort,
+                     [Event.event_start_date, Event.event_id], limit, offset)
+
+
+def select_employees(limit: Optional[int] = None, offset: int = 0,
+                     projection: bool = False, fields=None, sort=None,
+                     where: Optional[str] = None, current_user=None):
+    """Builds the query of get_all_employees."""
+    stmt = _select_list(Employee, EMPLOYEE_ROW_FIELDS, [], projection, fields, sort,
+                        where, current_user)
+    return _paginate(stmt, Employee, EMPLOYEE_ROW_FIELDS, sort, None, limit, offset)
+
+
+def _fetch(db, stmt, projection: bool) -> list:
+    """Runs a list query: named rows in projection mode, entities otherwise."""
+    result = db.execute(stmt)
+    return result.all() if projection else result.scalars().all()
+
+
+# Longest time a write transaction may stay open. The database sets
+# updated_at when the transaction starts (CURRENT_TIMESTAMP on PostgreSQL), so
+# a row committed after a delta was read may carry an older updated_at.
+MAX_TRANSACTION_AGE = timedelta(
+    seconds=int(os.getenv("DB_MAX_TRANSACTION_AGE", "600"))
+)
+
+
+def changed_since(stmt, model, since: datetime, limit: Optional[int] = None):
+    """
+    Restricts a list query to the rows created or modified at or after
+    ``since``, oldest change first.
+
+    ``updated_at`` is not in commit order: for the next delta, pass the
+    ``updated_at`` of the last row minus MAX_TRANSACTION_AGE, and skip the
+    rows whose ``version_id`` was already seen.
+    """
+    pk = model.__mapper__.primary_key[0]
+    return (
+        stmt.where(model.updated_at >= since)
+        .order_by(None)
+        .order_by(model.updated_at, pk)
+        .limit(limit)
+    )
+
+
 @require_permission("list_clients")
-def get_all_clients():
-    """Retrieves all clients from the database with their sales contact."""
+@cached_query(Client, Employee)
+def get_all_clients(limit: Optional[int] = None, offset: int = 0,
+                    projection: bool = False, fields=None, sort=None,
+                    where: Optional[str] = None, current_user=None):
+    """
+    Retrieves all clients from the database with their sales contact.
+    With ``projection``, returns read-only rows of CLIENT_ROW_FIELDS (or only
+    ``fields``) instead. ``sort`` is a list of ``(field, descending)``, and
+    ``where`` a filter expression (FilterError if invalid).
+    """
+    stmt = select_clients(limit, offset, projection, fields, sort, where,
+                          current_user)
     db = next(get_db())
     try:
-        return db.query(Client).options(joinedload(Client.sales_contact)).all()
+        return _fetch(db, stmt, projection)
     except Exception as e:
         sentry_sdk.capture_exception(e)
         raise RuntimeError(f"Database error while retrieving clients: {e}")
@@ -56,19 +339,24 @@ def get_all_clients():
 
 
 @require_permission("list_contracts")
-def get_all_contracts(not_signed: bool = False, not_paid: bool = False):
-    """Retrieves all contracts from the database, with optional filters."""
+@cached_query(Contract, Client, Employee)
+def get_all_contracts(not_signed: bool = False, not_paid: bool = False,
+                      limit: Optional[int] = None, offset: int = 0,
+                      projection: bool = False, fields=None, sort=None,
+                      where: Optional[str] = None, current_user=None,
+                      include_archived: bool = False):
+    """
+    Retrieves the contracts from the database (archived ones only with
+    ``include_archived``), with optional filters.
+    With ``projection``, returns read-only rows of CONTRACT_ROW_FIELDS (or only
+    ``fields``) instead. ``sort`` is a list of ``(field, descending)``, and
+    ``where`` a filter expression (FilterError if invalid).
+    """
+    stmt = select_contracts(not_signed, not_paid, limit, offset, projection,
+                            fields, sort, where, current_user, include_archived)
     db = next(get_db())
     try:
-        query = db.query(Contract).options(
-            joinedload(Contract.client), joinedload(Contract.sales_contact)
-        )
-        if not_signed:
-            query = query.filter(Contract.is_signed.is_(False))
-        if not_paid:
-            query = query.filter(Contract.remaining_amount > 0)
-
-        return query.order_by(Contract.contract_id).all()
+        return _fetch(db, stmt, projection)
     except Exception as e:
         sentry_sdk.capture_exception(e)
         raise RuntimeError(f"Database error while retrieving contracts: {e}")
@@ -77,25 +365,99 @@ def get_all_contracts(not_signed: bool = False, not_paid: bool = False):
 
 
 @require_permission("list_events")
-def get_all_events(no_support: bool = False, my_events: bool = False):
-    """Retrieves all events from the database, with optional filters."""
+@cached_query(Event, Client, Employee)
+def get_all_events(no_support: bool = False, my_events: bool = False,
+                   limit: Optional[int] = None, offset: int = 0, current_user=None,
+                   projection: bool = False, fields=None, sort=None,
+                   where: Optional[str] = None, include_archived: bool = False):
+    """
+    Retrieves the events from the database (archived ones only with
+    ``include_archived``), with optional filters.
+    With ``projection``, returns read-only rows of EVENT_ROW_FIELDS (or only
+    ``fields``) instead. ``sort`` is a list of ``(field, descending)``, and
+    ``where`` a filter expression (FilterError if invalid).
+    """
+    stmt = select_events(no_support, my_events, limit, offset, current_user,
+                         projection, fields, sort, where, include_archived)
     db = next(get_db())
     try:
-        query = db.query(Event).options(
-            joinedload(Event.client), joinedload(Event.support_contact)
-        )
+        return _fetch(db, stmt, projection)
+    except Exception as e:
+        sentry_sdk.capture_exception(e)
+        raise RuntimeError(f"Database error while retrieving events: {e}")
+    finally:
+        db.close()
+
 
-        if no_support:
-            query = query.filter(Event.support_contact_id.is_(None))
+@require_permission("list_employees")
+@cached_query(Employee)
+def get_all_employees(limit: Optional[int] = None, offset: int = 0,
+                      projection: bool = False, fields=None, sort=None,
+                      where: Optional[str] = None, current_user=None):
+    """
+    Retrieves all employees from the database.
+    With ``projection``, returns read-only rows of EMPLOYEE_ROW_FIELDS (or only
+    ``fields``) instead. ``sort`` is a list of ``(field, descending)``, and
+    ``where`` a filter expression (FilterError if invalid).
+    """
+    stmt = select_employees(limit, offset, projection, fields, sort, where,
+                            current_user)
+    db = next(get_db())
+    try:
+        return _fetch(db, stmt, projection)
+    except Exception as e:
+        sentry_sdk.capture_exception(e)
+        raise RuntimeError(f"Database error while retrieving employees: {e}")
+    finally:
+        db.close()
 
-        if my_events:
-            current_user = get_current_user()
-            if not current_user:
-                raise PermissionError("Authentication required to view your events.")
-            query = query.filter(Event.support_contact_id == current_user.employee_id)
 
-        return query.order_by(Event.event_start_date).all()
+# --- Delta fetch (rows changed since a point in time) ---
 
+@require_permission("list_clients")
+def get_clients_changed_since(since: datetime, limit: Optional[int] = None,
+                              current_user=None):
+    """Retrieves the clients created or modified at or after ``since``."""
+    stmt = select_clients(current_user=current_user)
+    db = next(get_db())
+    try:
+        return db.scalars(changed_since(stmt, Client, since, limit)).all()
+    except Exception as e:
+        sentry_sdk.capture_exception(e)
+        raise RuntimeError(f"Database error while retrieving clients: {e}")
+    finally:
+        db.close()
+
+
+@require_permission("list_contracts")
+def get_contracts_changed_since(since: datetime, limit: Optional[int] = None,
+                                current_user=None):
+    """
+    Retrieves the contracts created or modified at or after ``since``,
+    archived ones included: archiving a contract is a change.
+    """
+    stmt = select_contracts(current_user=current_user, include_archived=True)
+    db = next(get_db())
+    try:
+        return db.scalars(changed_since(stmt, Contract, since, limit)).all()
+    except Exception as e:
+        sentry_sdk.capture_exception(e)
+        raise RuntimeError(f"Database error while retrieving contracts: {e}")
+    finally:
+        db.close()
+
+
+@require_permission("list_events")
+def get_events_changed_since(since: datetime, limit: Optional[int] = None,
+                             current_user=None):
+    """
+    Retrieves the events created or modified at or after ``since``, archived
+    ones included: archiving an event is a change.
+    """
+    stmt = select_events(current_user=current_user, include_archived=True)
+    db = next(get_db())
+    try:
+        return db.scalars(changed_since(stmt, Event, since, limit)).all()
     except Exception as e:
         sentry_sdk.capture_exception(e)
         raise RuntimeError(f"Database error while retrieving events: {e}")
@@ -104,11 +466,13 @@ def get_all_events(no_support: bool = False, my_events: bool = False):
 
 
 @require_permission("list_employees")
-def get_all_employees():
-    """Retrieves all employees from the database."""
+def get_employees_changed_since(since: datetime, limit: Optional[int] = None,
+                                current_user=None):
+    """Retrieves the employees created or modified at or after ``since``."""
+    stmt = select_employees(current_user=current_user)
     db = next(get_db())
     try:
-        return db.query(Employee).all()
+        return db.scalars(changed_since(stmt, Employee, since, limit)).all()
     except Exception as e:
         sentry_sdk.capture_exception(e)
         raise RuntimeError(f"Database error while retrieving employees: {e}")
@@ -1,4 +1,4 @@
-from EpicEventsCRM.models.employee_model import Employee, DepartmentEnum
+from EpicEventsCRM.models.employee_model import Employee, DepartmentEnum, hash_password
 from EpicEventsCRM.utils.permissions import has_permission
 from EpicEventsCRM.utils.validators import (
     validate_email,
@@ -8,9 +8,22 @@ from EpicEventsCRM.utils.validators import (
 from EpicEventsCRM.models.client_model import Client
 from EpicEventsCRM.models.contract_model import Contract
 from EpicEventsCRM.models.event_model import Event
+from services.updates import (
+    UpdateConflictError,
+    load_for_update,
+    commit_versioned_update,
+    display_conflict,
+    collect_file_updates,
+    reject_unknown_fields,
+    run_field_updates,
+)
+from concurrent.futures import ProcessPoolExecutor
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy import select, insert, bindparam
 from auth import get_current_user
 from db.database import get_db
+from rich.progress import Progress
+from EpicEventsCRM.views.messages import display_error, record_error
 from rich.console import Console
 from rich.prompt import Prompt
 from rich.panel import Panel
@@ -18,10 +31,33 @@ from getpass import getpass
 from typing import Optional
 from rich import box
 import sentry_sdk
+import csv
+import os
 
 
 console = Console()
 
+# Number of employees sent to the database per executemany round-trip
+EMPLOYEE_BATCH_SIZE = 500
+
+# Processes hashing the passwords of an import (default: one per core)
+HASH_WORKERS = int(os.getenv("HASH_WORKERS", "0")) or os.cpu_count() or 1
+
+# Records that keep an employee from being deleted: one ID is enough
+EMPLOYEE_DEPENDENCIES = {
+    "Clients": select(Client.client_id)
+    .where(Client.sales_contact_id == bindparam("employee_id")).limit(1),
+    "Contracts": select(Contract.contract_id)
+    .where(Contract.sales_contact_id == bindparam("employee_id")).limit(1),
+    "Events": select(Event.event_id)
+    .where(Event.support_contact_id == bindparam("employee_id")).limit(1),
+}
+
+# Columns of an employees file
+EMPLOYEE_FILE_COLUMNS = (
+    "first_name", "last_name", "email", "phone_number", "department", "password",
+)
+
 
 # --- Helper functions to keep code DRY ---
 def _prompt_for_employee_data(employee: Optional[Employee] = None) -> dict:
@@ -85,14 +121,12 @@ def _commit_to_db(db, instance, success_message):
         return True
     except IntegrityError as e:
         db.rollback()
-        console.print(Panel(
-            "[bold red]Error: An employee with this email already exists.[/bold red]", box=box.ROUNDED))
+        display_error("Error: An employee with this email already exists.")
         sentry_sdk.capture_exception(e)
         return False
     except Exception as e:
         db.rollback()
-        console.print(
-            Panel(f"[bold red]An unexpected error occurred: {e}[/bold red]", box=box.ROUNDED))
+        display_error(f"An unexpected error occurred: {e}")
         sentry_sdk.capture_exception(e)
         return False
 
@@ -103,9 +137,8 @@ def _check_employee_dependencies(db, employee_id: int) -> Optional[str]:
     Returns an error message string if dependencies are found, otherwise None.
     """
     dependencies = {
-        "Clients": db.query(Client).filter_by(sales_contact_id=employee_id).first(),
-        "Contracts": db.query(Contract).filter_by(sales_contact_id=employee_id).first(),
-        "Events": db.query(Event).filter_by(support_contact_id=employee_id).first(),
+        name: db.scalar(statement, {"employee_id": employee_id})
+        for name, statement in EMPLOYEE_DEPENDENCIES.items()
     }
 
     active_dependencies = [name for name, found in dependencies.items() if found]
@@ -156,8 +189,7 @@ def create_employee():
     """Creates a new employee after checking permissions."""
     current_user = get_current_user()
     if not has_permission(current_user, "create_employee"):
-        console.print(
-            Panel("[bold red]Insufficient permissions.[/bold red]", box=box.ROUNDED))
+        display_error("Insufficient permissions.")
         return
 
     console.print(Panel("[bold cyan]Create New Employee[/bold cyan]",
@@ -168,8 +200,7 @@ def create_employee():
     console.print("[bold yellow]Enter password:[/bold yellow]")
     password = getpass(" ")
     if not password:
-        console.print(
-            Panel("[bold red]Password cannot be empty.[/bold red]", box=box.ROUNDED))
+        display_error("Password cannot be empty.")
         return
 
     new_employee = Employee(**employee_data)
@@ -187,51 +218,53 @@ def update_employee(employee_id: int):
     """Updates an employee's details after checking permissions."""
     current_user = get_current_user()
     if not has_permission(current_user, "update_employee"):
-        console.print(
-            Panel("[bold red]Insufficient permissions.[/bold red]", box=box.ROUNDED))
+        display_error("Insufficient permissions.")
         return
 
-    db = next(get_db())
-    try:
-        employee_to_update = db.query(Employee).filter_by(
-            employee_id=employee_id).first()
-        if not employee_to_update:
-            console.print(
-                Panel("[bold red]Employee not found.[/bold red]", box=box.ROUNDED))
-            return
+    # Short read: no connection is held while the prompts are answered
+    employee_to_update = load_for_update(Employee, employee_id)
+    if not employee_to_update:
+        display_error("Employee not found.")
+        return
 
-        console.print(
-            Panel(
-                f"[bold cyan]Update Employee: {employee_to_update.first_name} "
-                f"{employee_to_update.last_name}[/bold cyan]",
-                box=box.ROUNDED,
-                style="bold green"
-            )
+    console.print(
+        Panel(
+            f"[bold cyan]Update Employee: {employee_to_update.first_name} "
+            f"{employee_to_update.last_name}[/bold cyan]",
+            box=box.ROUNDED,
+            style="bold green"
         )
-        console.print(
-            "[bold yellow](Leave blank to keep the current value.)[/bold yellow]\n")
-
-        updated_data = _prompt_for_employee_data(employee=employee_to_update)
-
-        # Update attributes from the collected data
-        for key, value in updated_data.items():
-            setattr(employee_to_update, key, value)
+    )
+    console.print(
+        "[bold yellow](Leave blank to keep the current value.)[/bold yellow]\n")
 
-        change_password = Prompt.ask(
-            "[bold yellow]Change password? (yes/no)[/bold yellow]",
-            choices=["yes", "no"],
-            default="no"
-        )
-        if change_password == "yes":
-            password = getpass("Enter new password: ")
-            if password:
-                employee_to_update.set_password(password)
+    updated_data = _prompt_for_employee_data(employee=employee_to_update)
 
-        _commit_to_db(db, employee_to_update,
-                      f"Employee '{employee_to_update.first_name}' updated successfully!")
+    change_password = Prompt.ask(
+        "[bold yellow]Change password? (yes/no)[/bold yellow]",
+        choices=["yes", "no"],
+        default="no"
+    )
+    if change_password == "yes":
+        password = getpass("Enter new password: ")
+        if password:
+            updated_data["password_hash"] = hash_password(password)
 
-    finally:
-        db.close()
+    success_message = f"Employee '{updated_data['first_name']}' updated successfully!"
+    try:
+        commit_versioned_update(employee_to_update, updated_data)
+        console.print(
+            Panel(f"[bold green]{success_message}[/bold green]", box=box.ROUNDED))
+        sentry_sdk.capture_message(success_message, level="info")
+    except UpdateConflictError as conflict:
+        display_conflict(conflict)
+        sentry_sdk.capture_message(str(conflict), level="warning")
+    except IntegrityError as e:
+        display_error("Error: An employee with this email already exists.")
+        sentry_sdk.capture_exception(e)
+    except Exception as e:
+        display_error(f"An unexpected error occurred: {e}")
+        sentry_sdk.capture_exception(e)
 
 
 def delete_employee(employee_id: int):
@@ -240,22 +273,18 @@ def delete_employee(employee_id: int):
     """
     current_user = get_current_user()
     if not current_user or not has_permission(current_user, "delete_employee"):
-        console.print(Panel(
-            "[bold red]You do not have permission to delete employees.[/bold red]", box=box.ROUNDED))
+        display_error("You do not have permission to delete employees.")
         return
 
     if getattr(current_user, "employee_id", None) == employee_id:
-        console.print(
-            Panel("[bold red]Error: You cannot delete your own account.[/bold red]", box=box.ROUNDED))
+        display_error("Error: You cannot delete your own account.")
         return
 
     db = next(get_db())
     try:
-        employee_to_delete = db.query(Employee).filter_by(
-            employee_id=employee_id).first()
+        employee_to_delete = db.get(Employee, employee_id)
         if not employee_to_delete:
-            console.print(
-                Panel(f"[bold red]Employee with ID {employee_id} not found.[/bold red]", box=box.ROUNDED))
+            display_error(f"Employee with ID {employee_id} not found.")
             return
 
         # Check for dependencies using the helper function
@@ -263,6 +292,7 @@ def delete_employee(employee_id: int):
         if dependency_error:
             console.print(Panel(dependency_error, box=box.ROUNDED,
                           title="[bold red]Deletion Blocked[/bold red]"))
+            record_error("Deletion blocked by active records.")
             return
 
         # Confirm and execute the deletion using the helper function
@@ -270,8 +300,213 @@ def delete_employee(employee_id: int):
 
     except Exception as e:
         db.rollback()
+        display_error(f"An unexpected error occurred: {e}")
+        sentry_sdk.capture_exception(e)
+    finally:
+        db.close()
+
+
+# Fields accepted by the non-interactive update paths
+EMPLOYEE_UPDATE_FIELDS = {
+    "first_name", "last_name", "email", "phone_number", "department",
+}
+
+
+def _parse_department(value) -> DepartmentEnum:
+    """Accepts a department by name (SUPPORT) or by value (Support)."""
+    if isinstance(value, DepartmentEnum):
+        return value
+    for department in DepartmentEnum:
+        if value.strip().upper() in (department.name, department.value.upper()):
+            return department
+    raise ValueError(
+        f"Invalid department {value!r}. Use one of: "
+        f"{', '.join(department.name for department in DepartmentEnum)}."
+    )
+
+
+def _employee_changes(values: dict) -> dict:
+    """Validates the fields of a non-interactive employee update."""
+    values = {key: value for key, value in values.items() if value is not None}
+    reject_unknown_fields(values, EMPLOYEE_UPDATE_FIELDS)
+    changes = {}
+    for key, label in (("first_name", "First name"), ("last_name", "Last name")):
+        if key in values:
+            changes[key] = validate_string_length(values[key], label, 50)
+    if "email" in values:
+        changes["email"] = validate_email(values["email"]).strip().lower()
+    if "phone_number" in values:
+        changes["phone_number"] = validate_phone_number(values["phone_number"])
+    if "department" in values:
+        changes["department"] = _parse_department(values["department"])
+    return changes
+
+
+def _can_update_employees(current_user) -> bool:
+    if not current_user or not has_permission(current_user, "update_employee"):
+        display_error("Insufficient permissions.")
+        return False
+    return True
+
+
+def update_employee_fields(employee_id: int, **values):
+    """Updates only the given employee fields, without prompting."""
+    if not _can_update_employees(get_current_user()):
+        return
+    try:
+        changes = _employee_changes(values)
+    except ValueError as ve:
+        display_error(str(ve))
+        return
+    run_field_updates(Employee, [(None, employee_id, changes)])
+
+
+def update_employees_from_file(file_path: str):
+    """Applies the employee updates of a CSV file in a single transaction."""
+    if not _can_update_employees(get_current_user()):
+        return
+    try:
+        updates = collect_file_updates(file_path, "employee_id", _employee_changes)
+    except (OSError, ValueError) as e:
+        display_error(f"Update aborted, nothing saved: {e}")
+        return
+    run_field_updates(Employee, updates)
+
+
+# --- Bulk import ---
+def read_employees_file(file_path: str) -> list:
+    """
+    Reads and validates a CSV employees file (EMPLOYEE_FILE_COLUMNS). Returns
+    one dict of Employee columns per line, plus its ``password``. Raises
+    ValueError on the first invalid line.
+    """
+    employees = []
+    lines = {}
+    with open(file_path, newline="") as f:
+        reader = csv.DictReader(f)
+        missing = set(EMPLOYEE_FILE_COLUMNS) - set(reader.fieldnames or [])
+        if missing:
+            raise ValueError(
+                f"Missing column(s) in employees file: {', '.join(sorted(missing))}"
+            )
+        for row in reader:
+            try:
+                row = {key: (row[key] or "").strip() for key in EMPLOYEE_FILE_COLUMNS}
+                for key, label in (("first_name", "First name"),
+                                   ("last_name", "Last name")):
+                    if not row[key]:
+                        raise ValueError(f"{label} cannot be empty.")
+                    validate_string_length(row[key], label, 50)
+                row["email"] = validate_email(row["email"].lower())
+                row["phone_number"] = validate_phone_number(row["phone_number"])
+                row["department"] = _parse_department(row["department"])
+                if not row["password"]:
+                    raise ValueError("Password cannot be empty.")
+                if row["email"] in lines:
+                    raise ValueError(f"Email {row['email']} already used on "
+                                     f"line {lines[row['email']]}.")
+            except ValueError as e:
+                raise ValueError(f"Line {reader.line_num}: {e}")
+            lines[row["email"]] = reader.line_num
+            employees.append(row)
+    return employees
+
+
+def hash_passwords(passwords: list, workers: int = HASH_WORKERS):
+    """
+    Yields the argon2 hashes of ``passwords``, in order. With several
+    ``workers``, they are computed by that many processes, one hash per core.
+    """
+    if workers <= 1 or len(passwords) < 2:
+        yield from map(hash_password, passwords)
+        return
+    workers = min(workers, len(passwords))
+    chunksize = max(1, min(32, len(passwords) // (workers * 8)))
+    executor = ProcessPoolExecutor(max_workers=workers)
+    try:
+        # Small chunks keep the processes busy until the end, and the progress
+        # bar moving
+        yield from executor.map(hash_password, passwords, chunksize=chunksize)
+    finally:
+        # On error, the passwords not hashed yet are dropped
+        executor.shutdown(cancel_futures=True)
+
+
+def insert_employees(db, employees: list, workers: int = HASH_WORKERS,
+                     progress=None) -> int:
+    """
+    Hashes the passwords of ``employees`` (from read_employees_file) in
+    parallel, then inserts the rows batch by batch. Emails already registered
+    are refused before any hashing, and nothing is written until every
+    password is hashed, so the transaction holds no write lock while the
+    hashes are computed. Returns the number of employees inserted. The caller
+    commits.
+    """
+    emails = [employee["email"] for employee in employees]
+    existing = []
+    for start in range(0, len(emails), EMPLOYEE_BATCH_SIZE):
+        existing += db.scalars(select(Employee.email).where(
+            Employee.email.in_(emails[start:start + EMPLOYEE_BATCH_SIZE])
+        )).all()
+    if existing:
+        raise ValueError(
+            f"Employee(s) already registered: {', '.join(sorted(existing)[:10])}"
+            + (f" and {len(existing) - 10} more." if len(existing) > 10 else ".")
+        )
+
+    if progress:
+        task = progress.add_task("Hashing passwords", total=len(employees))
+    hashes = hash_passwords([employee["password"] for employee in employees], workers)
+    rows = []
+    for employee, password_hash in zip(employees, hashes):
+        row = {key: value for key, value in employee.items() if key != "password"}
+        rows.append(row | {"password_hash": password_hash})
+        if progress:
+            progress.advance(task)
+
+    for start in range(0, len(rows), EMPLOYEE_BATCH_SIZE):
+        db.execute(insert(Employee), rows[start:start + EMPLOYEE_BATCH_SIZE])
+    return len(rows)
+
+
+def import_employees(file_path: str, workers: int = None):
+    """
+    Creates the employees of a CSV file (columns: EMPLOYEE_FILE_COLUMNS) in
+    one transaction, hashing their passwords on every core.
+    """
+    current_user = get_current_user()
+    if not current_user:
+        display_error("Authentication required.")
+        return
+    if not has_permission(current_user, "import_employees"):
+        display_error("Insufficient permissions.")
+        return
+
+    db = next(get_db())
+    try:
+        employees = read_employees_file(file_path)
+        with Progress(console=console) as progress:
+            imported = insert_employees(db, employees, workers or HASH_WORKERS,
+                                        progress)
+        db.commit()
         console.print(
-            Panel(f"[bold red]An unexpected error occurred: {e}[/bold red]", box=box.ROUNDED))
+            Panel(
+                f"[bold green]{imported} employee(s) imported successfully!"
+                "[/bold green]",
+                box=box.ROUNDED,
+            )
+        )
+        sentry_sdk.capture_message(
+            f"{imported} employees imported from '{file_path}' "
+            f"by {current_user.email}.",
+            level="info",
+        )
+    except (OSError, ValueError) as e:
+        db.rollback()
+        display_error(f"Import aborted, no employee created: {e}")
+    except Exception as e:
+        db.rollback()
+        display_error(f"Error importing employees: {e}")
         sentry_sdk.capture_exception(e)
     finally:
         db.close()
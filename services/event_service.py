@@ -1,10 +1,25 @@
 from EpicEventsCRM.models.employee_model import Employee, DepartmentEnum
 from EpicEventsCRM.utils.permissions import has_permission
+from EpicEventsCRM.utils.validators import (
+    validate_string_length,
+    validate_positive_integer,
+)
 from EpicEventsCRM.models.contract_model import Contract
 from EpicEventsCRM.models.event_model import Event
+from services.updates import (
+    UpdateConflictError,
+    load_for_update,
+    commit_versioned_update,
+    display_conflict,
+    collect_file_updates,
+    reject_unknown_fields,
+    run_field_updates,
+)
 from auth import get_current_user
+from EpicEventsCRM.views.messages import display_error
 from rich.console import Console
 from rich.prompt import Prompt
+from sqlalchemy import select, bindparam
 from db.database import get_db
 from datetime import datetime
 from rich.panel import Panel
@@ -14,6 +29,17 @@ import sentry_sdk
 
 console = Console()
 
+# Lookups of create_event, built once and reused from the statement cache
+SIGNED_CONTRACT = select(Contract).where(
+    Contract.contract_id == bindparam("contract_id"), Contract.is_signed.is_(True)
+)
+SUPPORT_EMPLOYEES = select(Employee).where(
+    Employee.department == DepartmentEnum.SUPPORT
+)
+SUPPORT_EMPLOYEE = SUPPORT_EMPLOYEES.where(
+    Employee.employee_id == bindparam("employee_id")
+)
+
 
 def parse_date(date_str, current_value=None):
     """Parse a date string or retain the current value if input is blank."""
@@ -30,15 +56,11 @@ def create_event():
     current_user = get_current_user()
 
     if not current_user:
-        console.print(
-            Panel("[bold red]Authentication required.[/bold red]", box=box.ROUNDED)
-        )
+        display_error("Authentication required.")
         return
 
     if not has_permission(current_user, "create_event"):
-        console.print(
-            Panel("[bold red]Insufficient permissions.[/bold red]", box=box.ROUNDED)
-        )
+        display_error("Insufficient permissions.")
         return
 
     console.print(
@@ -55,18 +77,10 @@ def create_event():
         contract_id = Prompt.ask(
             "[bold yellow]Enter ID of the signed contract[/bold yellow]"
         )
-        contract = (
-            db.query(Contract)
-            .filter_by(contract_id=contract_id, is_signed=True)
-            .first()
-        )
+        contract = db.scalar(SIGNED_CONTRACT, {"contract_id": contract_id})
 
         if not contract:
-            console.print(
-                Panel(
-                    "[bold red]Signed contract not found.[/bold red]", box=box.ROUNDED
-                )
-            )
+            display_error("Signed contract not found.")
             return
 
         event_name = Prompt.ask("[bold yellow]Event name[/bold yellow]")
@@ -89,22 +103,16 @@ def create_event():
             if attendees < 0:
                 raise ValueError("Number of attendees cannot be negative.")
         except ValueError as e:
-            console.print(Panel(f"[bold red]{e}[/bold red]", box=box.ROUNDED))
+            display_error(str(e))
             return
 
         notes = Prompt.ask("[bold yellow]Notes (optional)[/bold yellow]", default="")
 
         # Get support contact
-        support_employees = (
-            db.query(Employee).filter_by(department=DepartmentEnum.SUPPORT).all()
-        )
+        support_employees = db.scalars(SUPPORT_EMPLOYEES).all()
 
         if not support_employees:
-            console.print(
-                Panel(
-                    "[bold red]No support staff available.[/bold red]", box=box.ROUNDED
-                )
-            )
+            display_error("No support staff available.")
             return
 
         console.print("[bold yellow]Available support employees:[/bold yellow]")
@@ -118,20 +126,12 @@ def create_event():
         support_contact_id = Prompt.ask(
             "[bold yellow]Enter support employee ID[/bold yellow]"
         )
-        support_contact = (
-            db.query(Employee)
-            .filter_by(
-                employee_id=support_contact_id, department=DepartmentEnum.SUPPORT
-            )
-            .first()
+        support_contact = db.scalar(
+            SUPPORT_EMPLOYEE, {"employee_id": support_contact_id}
         )
 
         if not support_contact:
-            console.print(
-                Panel(
-                    "[bold red]Support employee not found.[/bold red]", box=box.ROUNDED
-                )
-            )
+            display_error("Support employee not found.")
             return
 
         # Create event
@@ -160,16 +160,10 @@ def create_event():
         )
 
     except ValueError as ve:
-        console.print(Panel(f"[bold red]Error: {ve}[/bold red]", box=box.ROUNDED))
+        display_error(f"Error: {ve}")
     except Exception as e:
         db.rollback()
-        console.print(
-            Panel(
-                f"[bold red]Unexpected error: {
-                    e}[/bold red]",
-                box=box.ROUNDED,
-            )
-        )
+        display_error(f"Unexpected error: {e}")
         sentry_sdk.capture_exception(e)
     finally:
         db.close()
@@ -182,35 +176,31 @@ def update_event(event_id: int):
     # --- 1. Vérification des Permissions Initiales ---
     current_user = get_current_user()
     if not current_user:
-        console.print(
-            Panel("[bold red]Authentication required.[/bold red]", box=box.ROUNDED))
+        display_error("Authentication required.")
         return
 
     if not has_permission(current_user, "update_event"):
-        console.print(
-            Panel("[bold red]Insufficient permissions to update events.[/bold red]", box=box.ROUNDED))
+        display_error("Insufficient permissions to update events.")
         return
 
-    db = next(get_db())
-    try:
-        # --- 2. Récupération de l'Objet et Vérification de la Propriété ---
-        event = db.query(Event).filter_by(event_id=event_id).first()
-        if event is None:
-            console.print(
-                Panel("[bold red]Event not found.[/bold red]", box=box.ROUNDED))
-            return
+    # --- 2. Récupération de l'Objet et Vérification de la Propriété ---
+    # Lecture courte : aucune connexion n'est retenue pendant la saisie.
+    event = load_for_update(Event, event_id)
+    if event is None:
+        display_error("Event not found.")
+        return
 
-        # Un membre du support ne peut modifier que les événements qui lui sont assignés.
-        support_id = getattr(event, "support_contact_id", None)
-        if (
-            current_user.department.value == DepartmentEnum.SUPPORT.value
-            and support_id is not None
-            and support_id != current_user.employee_id
-        ):
-            console.print(Panel(
-                "[bold red]You can only update events assigned to you.[/bold red]", box=box.ROUNDED))
-            return
+    # Un membre du support ne peut modifier que les événements qui lui sont assignés.
+    support_id = getattr(event, "support_contact_id", None)
+    if (
+        current_user.department.value == DepartmentEnum.SUPPORT.value
+        and support_id is not None
+        and support_id != current_user.employee_id
+    ):
+        display_error("You can only update events assigned to you.")
+        return
 
+    try:
         # --- 3. Collecte des Nouvelles Informations ---
         console.print(Panel(
             f"[bold cyan]Update Event: {event.event_name}[/bold cyan]", box=box.ROUNDED, style="bold green"))
@@ -239,30 +229,105 @@ def update_event(event_id: int):
             ),
         }
 
-        # --- 4. Mise à jour de l'Objet ---
-        event.event_name = new_data["event_name"]
-        event.event_start_date = new_data["event_start_date"]
-        event.event_end_date = new_data["event_end_date"]
-        event.location = new_data["location"]
-        event.attendees = new_data["attendees"]
-        event.notes = new_data["notes"]
-
-        # --- 5. Sauvegarde en Base de Données ---
-        db.commit()
+        # --- 4. Sauvegarde en Base de Données (relecture et contrôle de version) ---
+        commit_versioned_update(event, new_data)
         console.print(
             Panel("[bold green]Event updated successfully![/bold green]", box=box.ROUNDED))
         sentry_sdk.capture_message(
-            f"Event '{event.event_name}' updated successfully!", level="info")
+            f"Event '{new_data['event_name']}' updated successfully!", level="info")
 
+    except UpdateConflictError as conflict:
+        display_conflict(conflict)
+        sentry_sdk.capture_message(str(conflict), level="warning")
     except ValueError:
         # Gère l'erreur si la conversion de 'attendees' en int échoue
-        console.print(
-            Panel("[bold red]Invalid input for number of attendees.[/bold red]", box=box.ROUNDED))
-        db.rollback()
+        display_error("Invalid input for number of attendees.")
     except Exception as e:
-        db.rollback()
-        console.print(
-            Panel(f"[bold red]Unexpected error: {e}[/bold red]", box=box.ROUNDED))
+        display_error(f"Unexpected error: {e}")
         sentry_sdk.capture_exception(e)
-    finally:
-        db.close()
+
+
+# Fields accepted by the non-interactive update paths
+EVENT_UPDATE_FIELDS = {
+    "event_name", "location", "attendees", "notes",
+    "event_start_date", "event_end_date",
+}
+
+
+def _event_changes(values: dict) -> dict:
+    """Validates the fields of a non-interactive event update."""
+    values = {key: value for key, value in values.items() if value is not None}
+    reject_unknown_fields(values, EVENT_UPDATE_FIELDS)
+    changes = {}
+    if "event_name" in values:
+        changes["event_name"] = validate_string_length(
+            values["event_name"], "event_name", 100)
+    if "location" in values:
+        changes["location"] = validate_string_length(
+            values["location"], "location", 200)
+    if "attendees" in values:
+        changes["attendees"] = validate_positive_integer(
+            int(values["attendees"]), "attendees")
+    if "notes" in values:
+        changes["notes"] = validate_string_length(values["notes"], "notes", 1000)
+    for key in ("event_start_date", "event_end_date"):
+        if key in values:
+            changes[key] = parse_date(values[key])
+    return changes
+
+
+def _event_owner_check(current_user):
+    """Support staff may only update the events assigned to them."""
+    def check(row, changes):
+        if (
+            current_user.department.value == DepartmentEnum.SUPPORT.value
+            and row.support_contact_id is not None
+            and row.support_contact_id != current_user.employee_id
+        ):
+            raise ValueError("You can only update events assigned to you.")
+    return check
+
+
+def _run_event_updates(current_user, updates: list):
+    run_field_updates(
+        Event,
+        updates,
+        check=_event_owner_check(current_user),
+        check_columns=(Event.support_contact_id,),
+    )
+
+
+def _can_update_events(current_user) -> bool:
+    if not current_user:
+        display_error("Authentication required.")
+        return False
+    if not has_permission(current_user, "update_event"):
+        display_error("Insufficient permissions to update events.")
+        return False
+    return True
+
+
+def update_event_fields(event_id: int, **values):
+    """Updates only the given event fields, without prompting."""
+    current_user = get_current_user()
+    if not _can_update_events(current_user):
+        return
+    try:
+        changes = _event_changes(values)
+    except ValueError as ve:
+        display_error(str(ve))
+        return
+    _run_event_updates(current_user, [(None, event_id, changes)])
+
+
+def update_events_from_file(file_path: str):
+    """Applies the event updates of a CSV file in a single transaction."""
+    current_user = get_current_user()
+    if not _can_update_events(current_user):
+        return
+    try:
+        updates = collect_file_updates(file_path, "event_id", _event_changes)
+    except (OSError, ValueError) as e:
+        display_error(f"Update aborted, nothing saved: {e}")
+        return
+    _run_event_updates(current_user, updates)
@@ -0,0 +1,258 @@
+"""
+``--where`` filter language of the list commands, compiled to SQLAlchemy
+expressions so the filtering is done by the database.
+
+    remaining_amount > 1000 and client.company_name ~ "Acme"
+    not is_signed = true or (date_created >= "2025-01-01" and total_amount < 500)
+    support_contact is null
+
+A condition compares a column of the listed entity, or of an entity it
+references (``client.``, ``contract.``, ``sales_contact.``,
+``support_contact.``), with a literal. Operators: ``=`` (or ``==``), ``!=``,
+``<``, ``<=``, ``>``, ``>=``, ``~`` (contains, case-insensitive), and
+``is [not] null``. Conditions combine with ``and``, ``or``, ``not`` and
+parentheses.
+"""
+from sqlalchemy import (
+    Boolean, DateTime, Enum, Float, Integer, Numeric, String, and_, or_, not_,
+)
+from sqlalchemy.orm import RelationshipDirection
+from functools import lru_cache
+from datetime import datetime
+import operator
+import re
+
+
+# Columns that can never be filtered on
+HIDDEN_COLUMNS = {"password_hash"}
+
+COMPARISONS = {
+    "=": operator.eq,
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+
+KEYWORDS = {"and", "or", "not", "is", "null", "true", "false"}
+
+_TOKEN = re.compile(r"""
+    \s*(?:
+        (?P<number>-?\d+(?:\.\d+)?(?![\w.]))
+      | (?P<string>"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')
+      | (?P<op>==|!=|<=|>=|=|<|>|~)
+      | (?P<paren>[()])
+      | (?P<name>[A-Za-z_]\w*(?:\.[A-Za-z_]\w*)?)
+    )""", re.VERBOSE)
+
+
+class FilterError(ValueError):
+    """Raised when a filter expression is invalid for the listed entity."""
+
+
+def tokenize(text: str) -> list:
+    """Returns ``[(kind, value, position), ...]``."""
+    tokens = []
+    position = 0
+    text = text.rstrip()
+    while position < len(text):
+        match = _TOKEN.match(text, position)
+        if not match or match.end() == position:
+            raise FilterError(f"Unexpected character at position {position + 1}: "
+                              f"'{text[position:].lstrip()[:10]}'")
+        kind = match.lastgroup
+        value = match.group(kind)
+        start = match.start(kind) + 1
+        if kind == "string":
+            value = re.sub(r"\\(.)", r"\1", value[1:-1])
+        elif kind == "name" and value.lower() in KEYWORDS:
+            kind, value = "keyword", value.lower()
+        tokens.append((kind, value, start))
+        position = match.end()
+    return tokens
+
+
+class _Parser:
+    """Recursive-descent parser producing a SQLAlchemy expression."""
+
+    def __init__(self, model, tokens: list):
+        self.model = model
+        self.tokens = tokens
+        self.index = 0
+
+    def peek(self):
+        if self.index < len(self.tokens):
+            return self.tokens[self.index]
+        return (None, None, None)
+
+    def take(self, kind=None, value=None):
+        token = self.peek()
+        if token[0] is None:
+            raise FilterError("Unexpected end of the filter.")
+        if (kind and token[0] != kind) or (value and token[1] != value):
+            raise FilterError(f"Unexpected '{token[1]}' at position {token[2]}.")
+        self.index += 1
+        return token
+
+    def accept(self, kind, value=None) -> bool:
+        token = self.peek()
+        if token[0] == kind and (value is None or token[1] == value):
+            self.index += 1
+            return True
+        return False
+
+    def parse(self):
+        expression = self.disjunction()
+        if self.peek()[0] is not None:
+            token = self.peek()
+            raise FilterError(f"Unexpected '{token[1]}' at position {token[2]}.")
+        return expression
+
+    def disjunction(self):
+        terms = [self.conjunction()]
+        while self.accept("keyword", "or"):
+            terms.append(self.conjunction())
+        return terms[0] if len(terms) == 1 else or_(*terms)
+
+    def conjunction(self):
+        terms = [self.negation()]
+        while self.accept("keyword", "and"):
+            terms.append(self.negation())
+        return terms[0] if len(terms) == 1 else and_(*terms)
+
+    def negation(self):
+        if self.accept("keyword", "not"):
+            return not_(self.negation())
+        if self.accept("paren", "("):
+            expression = self.disjunction()
+            self.take("paren", ")")
+            return expression
+        return self.condition()
+
+    def condition(self):
+        _, path, _ = self.take("name")
+        relationship, column = resolve_field(self.model, path)
+
+        if self.accept("keyword", "is"):
+            negated = self.accept("keyword", "not")
+            self.take("keyword", "null")
+            if column is None:
+                # "support_contact is null": no referenced row
+                expression = ~relationship.has()
+            else:
+                expression = column.is_(None)
+            expression = ~expression if negated else expression
+            return _through(relationship, expression, column is None)
+
+        if column is None:
+            raise FilterError(
+                f"'{path}' is an entity: compare one of its columns, e.g. "
+                f"'{path}.{_first_column(relationship)}'."
+            )
+        _, op, _ = self.take("op")
+        if op == "~" and not isinstance(column.type, String):
+            raise FilterError(f"'~' only applies to text columns, not '{path}'.")
+        kind, raw, value_position = self.take()
+        value = convert_value(column, kind, raw, value_position)
+        if op == "~":
+            pattern = raw.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            expression = column.ilike(f"%{pattern}%", escape="\\")
+        else:
+            expression = COMPARISONS[op](column, value)
+        return _through(relationship, expression)
+
+
+def _through(relationship, expression, done: bool = False):
+    """Applies a condition on a referenced entity as an EXISTS subquery."""
+    if relationship is None or done:
+        return expression
+    return relationship.has(expression)
+
+
+def _first_column(relationship) -> str:
+    mapper = relationship.property.mapper
+    return next(key for key in mapper.columns.keys() if key not in HIDDEN_COLUMNS)
+
+
+def resolve_field(model, path: str) -> tuple:
+    """
+    Returns ``(relationship attribute or None, column attribute or None)``
+    for ``column`` or ``relationship.column`` (a bare ``relationship`` returns
+    no column). Only many-to-one relationships can be followed.
+    """
+    relationship = None
+    names = path.split(".")
+    if len(names) == 2 or names[0] in model.__mapper__.relationships:
+        name = names[0]
+        prop = model.__mapper__.relationships.get(name)
+        if prop is None or prop.direction is not RelationshipDirection.MANYTOONE:
+            raise FilterError(
+                f"Unknown relation '{name}'. Available: "
+                f"{', '.join(_relations(model)) or '(none)'}."
+            )
+        relationship = getattr(model, name)
+        model = prop.mapper.class_
+        if len(names) == 1:
+            return relationship, None
+    name = names[-1]
+    columns = model.__mapper__.columns
+    if name not in columns.keys() or name in HIDDEN_COLUMNS:
+        raise FilterError(
+            f"Unknown field '{path}'. Available: "
+            f"{', '.join(key for key in columns.keys() if key not in HIDDEN_COLUMNS)}."
+        )
+    return relationship, getattr(model, name)
+
+
+def _relations(model) -> list:
+    return [
+        name for name, prop in model.__mapper__.relationships.items()
+        if prop.direction is RelationshipDirection.MANYTOONE
+    ]
+
+
+def convert_value(column, kind: str, raw: str, position: int):
+    """Converts a literal token to the Python type of ``column``."""
+    column_type = column.type
+    name = column.key
+
+    if isinstance(column_type, Boolean):
+        if kind == "keyword" and raw in ("true", "false"):
+            return raw == "true"
+    elif isinstance(column_type, Enum):
+        if kind in ("string", "name"):
+            for member in column_type.enum_class:
+                if raw.lower() in (member.name.lower(), str(member.value).lower()):
+                    return member
+        raise FilterError(
+            f"'{raw}' is not a valid {name}. Use one of: "
+            f"{', '.join(member.value for member in column_type.enum_class)}."
+        )
+    elif isinstance(column_type, (Integer, Float, Numeric)):
+        if kind == "number":
+            return float(raw) if "." in raw else int(raw)
+    elif isinstance(column_type, DateTime):
+        if kind == "string":
+            try:
+                return datetime.fromisoformat(raw)
+            except ValueError:
+                pass
+        raise FilterError(
+            f"'{name}' expects a quoted date, e.g. \"2025-01-31\" or "
+            f"\"2025-01-31 18:00\" (position {position})."
+        )
+    elif isinstance(column_type, String):
+        if kind in ("string", "number"):
+            return raw
+    raise FilterError(f"Invalid value '{raw}' for '{name}' at position {position}.")
+
+
+@lru_cache(maxsize=128)
+def compile_filter(model, text: str):
+    """Parses ``text`` once and returns the SQLAlchemy condition for ``model``."""
+    tokens = tokenize(text)
+    if not tokens:
+        raise FilterError("The filter is empty.")
+    return _Parser(model, tokens).parse()
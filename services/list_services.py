@@ -1,4 +1,5 @@
 from services.data_access import get_all_clients, get_all_contracts, get_all_events, get_all_employees
+from EpicEventsCRM.views.messages import record_error
 from rich.console import Console
 from rich.table import Table
 from rich import box
@@ -36,142 +37,221 @@ def _display_table(title: str, get_data_func, column_configs: list, row_formatte
         console.print(table)
     except PermissionError as e:
         console.print(f"[bold red]{e}[/bold red]")
+        record_error(str(e))
+
+
+def _display_list(title: str, get_rows, columns: dict, names=None, sort=None):
+    """
+    Displays the ``names`` columns (default: all) of a list, fetching only
+    the row fields they need. ``sort`` is a list of ``(column, descending)``,
+    applied in SQL on the first field of each column.
+    """
+    selected = [columns[name] for name in names or columns]
+    fields = list(dict.fromkeys(
+        field for _, needed, _ in selected for field in needed
+    ))
+    sort_fields = [(columns[name][1][0], descending) for name, descending in sort or ()]
+    _display_table(
+        title,
+        lambda: get_rows(fields=fields, sort=sort_fields),
+        [config for config, _, _ in selected],
+        lambda row: tuple(format_cell(row) for _, _, format_cell in selected),
+    )
+
+
+def parse_columns(columns: dict, text: str) -> list:
+    """Parses ``--columns a,b,c``; raises ValueError on unknown names."""
+    names = [name.strip() for name in text.split(",") if name.strip()]
+    unknown = [name for name in names if name not in columns]
+    if unknown or not names:
+        raise ValueError(
+            f"Unknown column(s): {', '.join(unknown) or '(none)'}. "
+            f"Available: {', '.join(columns)}."
+        )
+    return names
+
+
+def parse_sort(columns: dict, text: str) -> list:
+    """Parses ``--sort column[:desc],...`` into ``[(column, descending), ...]``."""
+    sort = []
+    for item in text.split(","):
+        name, _, direction = item.strip().partition(":")
+        if name not in columns or direction.lower() not in ("", "asc", "desc"):
+            raise ValueError(
+                f"Invalid sort '{item.strip()}': use column[:asc|desc] with one of "
+                f"{', '.join(columns)}."
+            )
+        sort.append((name, direction.lower() == "desc"))
+    return sort
 
 
 # --- Specific Configurations and Formatters ---
+# Columns of each list: name -> (Rich column configuration, row fields of
+# data_access it needs, the first one being its sort key, cell formatter)
+
+def _contact(name, missing="N/A"):
+    return name or missing
+
+
+def _date(value):
+    return value.strftime("%d-%m-%Y")
+
+
+def _archived(value):
+    return _date(value) if value else ""
+
+
+def _default_columns(columns: dict, include_archived: bool) -> list:
+    """Every column, the archive date only when archived rows are listed."""
+    return [name for name in columns if include_archived or name != "archived"]
+
 
 # Configuration for the clients table
-CLIENT_COLUMNS = [
-    {"header": "Client ID", "justify": "center", "style": "cyan", "no_wrap": True},
-    {"header": "Full Name", "style": "green"},
-    {"header": "Email", "style": "magenta"},
-    {"header": "Phone Number", "style": "yellow"},
-    {"header": "Company Name", "style": "blue"},
-    {"header": "Created Date", "justify": "center", "style": "cyan"},
-    {"header": "Last Contact", "justify": "center", "style": "cyan"},
-    {"header": "Sales Contact", "style": "green"},
-]
-
-
-def _format_client_row(client):
-    """Formats a row for the clients table."""
-    sales_contact = client.sales_contact
-    contact_name = f"{sales_contact.first_name} {sales_contact.last_name}" if sales_contact else "N/A"
-    return (
-        str(client.client_id),
-        client.full_name,
-        client.email,
-        client.phone_number,
-        client.company_name,
-        client.date_created.strftime("%d-%m-%Y"),
-        client.last_contact_date.strftime("%d-%m-%Y"),
-        contact_name,
-    )
+CLIENT_COLUMNS = {
+    "id": ({"header": "Client ID", "justify": "center", "style": "cyan",
+            "no_wrap": True},
+           ("client_id",), lambda client: str(client.client_id)),
+    "name": ({"header": "Full Name", "style": "green"},
+             ("full_name",), lambda client: client.full_name),
+    "email": ({"header": "Email", "style": "magenta"},
+              ("email",), lambda client: client.email),
+    "phone": ({"header": "Phone Number", "style": "yellow"},
+              ("phone_number",), lambda client: client.phone_number),
+    "company": ({"header": "Company Name", "style": "blue"},
+                ("company_name",), lambda client: client.company_name),
+    "created": ({"header": "Created Date", "justify": "center", "style": "cyan"},
+                ("date_created",), lambda client: _date(client.date_created)),
+    "last-contact": ({"header": "Last Contact", "justify": "center", "style": "cyan"},
+                     ("last_contact_date",),
+                     lambda client: _date(client.last_contact_date)),
+    "sales-contact": ({"header": "Sales Contact", "style": "green"},
+                      ("sales_contact_name",),
+                      lambda client: _contact(client.sales_contact_name)),
+}
+
+
+def _contract_status(contract):
+    if contract.is_signed:
+        return "[bold green]Signed[/bold green]"
+    return "[bold red]Unsigned[/bold red]"
 
 
 # Configuration for the contracts table
-CONTRACT_COLUMNS = [
-    {"header": "Contract ID", "justify": "center", "style": "cyan", "no_wrap": True},
-    {"header": "Client", "style": "cyan"},
-    {"header": "Total Amount", "justify": "right", "style": "green"},
-    {"header": "Remaining", "justify": "right", "style": "yellow"},
-    {"header": "Status", "justify": "center", "style": "magenta"},
-    {"header": "Sales Contact", "style": "green"},
-]
-
-
-def _format_contract_row(contract):
-    """Formats a row for the contracts table."""
-    status = "[bold green]Signed[/bold green]" if contract.is_signed else "[bold red]Unsigned[/bold red]"
-    sales_contact = contract.sales_contact
-    contact_name = f"{sales_contact.first_name} {sales_contact.last_name}" if sales_contact else "N/A"
+CONTRACT_COLUMNS = {
+    "id": ({"header": "Contract ID", "justify": "center", "style": "cyan",
+            "no_wrap": True},
+           ("contract_id",), lambda contract: str(contract.contract_id)),
+    "client": ({"header": "Client", "style": "cyan"},
+               ("client_name",), lambda contract: contract.client_name),
+    "total": ({"header": "Total Amount", "justify": "right", "style": "green"},
+              ("total_amount",), lambda contract: f"{contract.total_amount:.2f}€"),
+    "remaining": ({"header": "Remaining", "justify": "right", "style": "yellow"},
+                  ("remaining_amount",),
+                  lambda contract: f"{contract.remaining_amount:.2f}€"),
+    "status": ({"header": "Status", "justify": "center", "style": "magenta"},
+               ("is_signed",), _contract_status),
+    "sales-contact": ({"header": "Sales Contact", "style": "green"},
+                      ("sales_contact_name",),
+                      lambda contract: _contact(contract.sales_contact_name)),
+    "archived": ({"header": "Archived", "justify": "center", "style": "dim"},
+                 ("archived_at",), lambda contract: _archived(contract.archived_at)),
+}
+
+
+def _event_dates(event):
     return (
-        str(contract.contract_id),
-        contract.client.full_name,
-        f"{contract.total_amount:.2f}€",
-        f"{contract.remaining_amount:.2f}€",
-        status,
-        contact_name,
+        f"{event.event_start_date.strftime('%d-%m-%y %Hh%M')} - "
+        f"{event.event_end_date.strftime('%d-%m-%y %Hh%M')}"
     )
 
 
 # Configuration for the events table
-EVENT_COLUMNS = [
-    {"header": "Event ID", "justify": "center", "style": "cyan", "no_wrap": True},
-    {"header": "Event Name", "style": "green"},
-    {"header": "Client", "style": "cyan"},
-    {"header": "Location", "style": "yellow"},
-    {"header": "Attendees", "justify": "center", "style": "blue"},
-    {"header": "Dates", "justify": "center"},
-    {"header": "Support Contact", "style": "magenta"},
-]
-
-
-def _format_event_row(event):
-    """Formats a row for the events table."""
-    support_contact = event.support_contact
-    contact_name = (
-        f"{support_contact.first_name} {support_contact.last_name}"
-        if support_contact else "[dim]Not Assigned[/dim]"
-    )
-    dates = (
-        f"{event.event_start_date.strftime('%d-%m-%y %Hh%M')} - "
-        f"{event.event_end_date.strftime('%d-%m-%y %Hh%M')}"
-    )
-    return (
-        str(event.event_id),
-        event.event_name,
-        event.client.full_name,
-        event.location,
-        str(event.attendees),
-        dates,
-        contact_name,
-    )
+EVENT_COLUMNS = {
+    "id": ({"header": "Event ID", "justify": "center", "style": "cyan",
+            "no_wrap": True},
+           ("event_id",), lambda event: str(event.event_id)),
+    "name": ({"header": "Event Name", "style": "green"},
+             ("event_name",), lambda event: event.event_name),
+    "client": ({"header": "Client", "style": "cyan"},
+               ("client_name",), lambda event: event.client_name),
+    "location": ({"header": "Location", "style": "yellow"},
+                 ("location",), lambda event: event.location),
+    "attendees": ({"header": "Attendees", "justify": "center", "style": "blue"},
+                  ("attendees",), lambda event: str(event.attendees)),
+    "dates": ({"header": "Dates", "justify": "center"},
+              ("event_start_date", "event_end_date"), _event_dates),
+    "support-contact": ({"header": "Support Contact", "style": "magenta"},
+                        ("support_contact_name",),
+                        lambda event: _contact(event.support_contact_name,
+                                               "[dim]Not Assigned[/dim]")),
+    "archived": ({"header": "Archived", "justify": "center", "style": "dim"},
+                 ("archived_at",), lambda event: _archived(event.archived_at)),
+}
 
 
 # Configuration for the employees table
-EMPLOYEE_COLUMNS = [
-    {"header": "Employee ID", "justify": "center", "style": "cyan", "no_wrap": True},
-    {"header": "Full Name", "style": "green"},
-    {"header": "Email", "style": "magenta"},
-    {"header": "Phone Number", "style": "yellow"},
-    {"header": "Department", "style": "blue"},
-    {"header": "Role", "style": "cyan"},
-]
-
-
-def _format_employee_row(employee):
-    """Formats a row for the employees table."""
-    return (
-        str(employee.employee_id),
-        f"{employee.first_name} {employee.last_name}",
-        employee.email,
-        employee.phone_number,
-        employee.department.value,
-        employee.department.value,
-    )
+EMPLOYEE_COLUMNS = {
+    "id": ({"header": "Employee ID", "justify": "center", "style": "cyan",
+            "no_wrap": True},
+           ("employee_id",), lambda employee: str(employee.employee_id)),
+    # Sorted by last name
+    "name": ({"header": "Full Name", "style": "green"},
+             ("last_name", "first_name"),
+             lambda employee: f"{employee.first_name} {employee.last_name}"),
+    "email": ({"header": "Email", "style": "magenta"},
+              ("email",), lambda employee: employee.email),
+    "phone": ({"header": "Phone Number", "style": "yellow"},
+              ("phone_number",), lambda employee: employee.phone_number),
+    "department": ({"header": "Department", "style": "blue"},
+                   ("department",), lambda employee: employee.department.value),
+    "role": ({"header": "Role", "style": "cyan"},
+             ("department",), lambda employee: employee.department.value),
+}
 
 # --- Public Functions (Simple and Clean) ---
 
 
-def list_clients():
+def list_clients(columns=None, sort=None, where=None):
     """Lists all clients by calling the generic display table function."""
-    _display_table("Client List", get_all_clients, CLIENT_COLUMNS, _format_client_row)
+    _display_list(
+        "Client List",
+        lambda **query: get_all_clients(projection=True, where=where, **query),
+        CLIENT_COLUMNS, columns, sort,
+    )
 
 
-def list_contracts(not_signed: bool = False, not_paid: bool = False):
+def list_contracts(not_signed: bool = False, not_paid: bool = False,
+                   columns=None, sort=None, where=None, include_archived: bool = False):
     """Lists all contracts by calling the generic display table function."""
-    _display_table("Contract List", lambda: get_all_contracts(not_signed=not_signed, not_paid=not_paid),
-                   CONTRACT_COLUMNS, _format_contract_row)
+    _display_list(
+        "Contract List",
+        lambda **query: get_all_contracts(
+            not_signed=not_signed, not_paid=not_paid, projection=True, where=where,
+            include_archived=include_archived, **query,
+        ),
+        CONTRACT_COLUMNS,
+        columns or _default_columns(CONTRACT_COLUMNS, include_archived), sort,
+    )
 
 
-def list_events(no_support: bool = False, my_events: bool = False):
+def list_events(no_support: bool = False, my_events: bool = False,
+                columns=None, sort=None, where=None, include_archived: bool = False):
     """Lists all events by calling the generic display table function."""
-    _display_table("Event List", lambda: get_all_events(no_support=no_support, my_events=my_events),
-                   EVENT_COLUMNS, _format_event_row)
+    _display_list(
+        "Event List",
+        lambda **query: get_all_events(
+            no_support=no_support, my_events=my_events, projection=True, where=where,
+            include_archived=include_archived, **query,
+        ),
+        EVENT_COLUMNS,
+        columns or _default_columns(EVENT_COLUMNS, include_archived), sort,
+    )
 
 
-def list_employees():
+def list_employees(columns=None, sort=None, where=None):
     """Lists all employees by calling the generic display table function."""
-    _display_table("Employee List", get_all_employees,
-                   EMPLOYEE_COLUMNS, _format_employee_row)
+    _display_list(
+        "Employee List",
+        lambda **query: get_all_employees(projection=True, where=where, **query),
+        EMPLOYEE_COLUMNS, columns, sort,
+    )
@@ -0,0 +1,269 @@
+from EpicEventsCRM.utils.validators import validate_positive_amount
+from EpicEventsCRM.utils.permissions import has_permission
+from EpicEventsCRM.models.contract_model import Contract
+from EpicEventsCRM.models.payment_model import Payment
+from EpicEventsCRM.models.employee_model import DepartmentEnum
+from sqlalchemy import select, update, insert, bindparam, case
+from collections import defaultdict
+from auth import get_current_user
+from db.database import get_db
+from EpicEventsCRM.views.messages import display_error
+from rich.console import Console
+from rich.panel import Panel
+from rich import box
+import sentry_sdk
+import math
+import csv
+
+
+console = Console()
+
+# Number of payments sent to the database per executemany round-trip
+PAYMENT_BATCH_SIZE = 1000
+
+# Float error allowed when a payment settles a balance: a larger excess is an
+# overpayment, and a smaller balance left is settled
+PAYMENT_TOLERANCE = 1e-9
+
+
+class PaymentError(ValueError):
+    """Raised when a payment cannot be applied to its contract."""
+
+
+def _parse_amount(amount) -> float:
+    """Converts and validates a payment amount."""
+    try:
+        amount = float(amount)
+    except (TypeError, ValueError):
+        raise PaymentError(f"Invalid amount: {amount!r}")
+    if not math.isfinite(amount):
+        raise PaymentError(f"Invalid amount: {amount!r}")
+    validate_positive_amount(amount, "amount")
+    if amount == 0:
+        raise PaymentError("Payment amount must be greater than zero.")
+    return amount
+
+
+def _settled(remaining):
+    """The new balance, a float error left by the last payment counting as zero."""
+    return case((remaining < PAYMENT_TOLERANCE, 0.0), else_=remaining)
+
+
+def apply_payment(db, contract_id: int, amount: float, recorded_by_id=None,
+                  sales_contact_id=None) -> float:
+    """
+    Records a single payment and decrements the contract balance atomically.
+
+    The balance is maintained by one guarded
+    ``UPDATE ... SET remaining_amount = remaining_amount - :amount`` which
+    takes the row lock itself, so concurrent payments can never overdraw a
+    contract. With ``sales_contact_id``, only the contracts of that employee
+    may be paid. Returns the new remaining amount. The caller commits.
+    """
+    amount = _parse_amount(amount)
+    guards = [
+        Contract.contract_id == contract_id,
+        Contract.remaining_amount + PAYMENT_TOLERANCE >= amount,
+    ]
+    if sales_contact_id is not None:
+        guards.append(Contract.sales_contact_id == sales_contact_id)
+    new_remaining = db.execute(
+        update(Contract)
+        .where(*guards)
+        .values(
+            remaining_amount=_settled(Contract.remaining_amount - amount),
+            version_id=Contract.version_id + 1,
+        )
+        .returning(Contract.remaining_amount)
+    ).scalar_one_or_none()
+
+    if new_remaining is None:
+        contract = db.execute(
+            select(Contract.remaining_amount, Contract.sales_contact_id).where(
+                Contract.contract_id == contract_id
+            )
+        ).one_or_none()
+        if contract is None:
+            raise PaymentError(f"Contract {contract_id} not found.")
+        if sales_contact_id not in (None, contract.sales_contact_id):
+            raise PaymentError(
+                f"Contract {contract_id} is not one of your contracts."
+            )
+        raise PaymentError(
+            f"Payment of {amount:.2f}€ exceeds the remaining amount "
+            f"({contract.remaining_amount:.2f}€) of contract {contract_id}."
+        )
+
+    db.execute(
+        insert(Payment),
+        [{"contract_id": contract_id, "amount": amount,
+          "recorded_by_id": recorded_by_id}],
+    )
+    return new_remaining
+
+
+def apply_payment_batch(db, payments, recorded_by_id=None) -> int:
+    """
+    Records a batch of ``(contract_id, amount)`` payments.
+
+    The affected contracts are locked with a single ``SELECT ... FOR UPDATE``,
+    then balances are decremented in SQL and the ledger rows inserted with one
+    executemany each. Returns the number of payments recorded. The caller
+    commits; nothing is written if any payment is invalid.
+    """
+    rows = []
+    totals = defaultdict(float)
+    for contract_id, amount in payments:
+        amount = _parse_amount(amount)
+        rows.append({"contract_id": int(contract_id), "amount": amount,
+                     "recorded_by_id": recorded_by_id})
+        totals[int(contract_id)] += amount
+
+    if not rows:
+        return 0
+
+    balances = dict(
+        db.execute(
+            select(Contract.contract_id, Contract.remaining_amount)
+            .where(Contract.contract_id.in_(totals))
+            .with_for_update()
+        ).all()
+    )
+
+    for contract_id, total in totals.items():
+        if contract_id not in balances:
+            raise PaymentError(f"Contract {contract_id} not found.")
+        if total > balances[contract_id] + PAYMENT_TOLERANCE:
+            raise PaymentError(
+                f"Payments of {total:.2f}€ exceed the remaining amount "
+                f"({balances[contract_id]:.2f}€) of contract {contract_id}."
+            )
+
+    contracts = Contract.__table__
+    db.execute(
+        update(contracts)
+        .where(contracts.c.contract_id == bindparam("paid_contract_id"))
+        .values(
+            remaining_amount=_settled(
+                contracts.c.remaining_amount - bindparam("paid")
+            ),
+            version_id=contracts.c.version_id + 1,
+        ),
+        [{"paid_contract_id": cid, "paid": total} for cid, total in totals.items()],
+    )
+    db.execute(insert(Payment), rows)
+    return len(rows)
+
+
+def read_payments_file(file_path: str):
+    """Yields ``(line_number, contract_id, amount)`` from a CSV payments file."""
+    with open(file_path, newline="") as f:
+        reader = csv.DictReader(f)
+        missing = {"contract_id", "amount"} - set(reader.fieldnames or [])
+        if missing:
+            raise PaymentError(
+                f"Missing column(s) in payments file: {', '.join(sorted(missing))}"
+            )
+        for row in reader:
+            try:
+                contract_id = int(row["contract_id"])
+            except (TypeError, ValueError):
+                raise PaymentError(
+                    f"Line {reader.line_num}: invalid contract ID "
+                    f"{row['contract_id']!r}"
+                )
+            yield reader.line_num, contract_id, row["amount"]
+
+
+def record_payment(contract_id: int, amount: float):
+    """Records a payment against a contract and shows the new balance."""
+    current_user = get_current_user()
+
+    if not current_user:
+        display_error("Authentication required.")
+        return
+
+    if not has_permission(current_user, "record_payment"):
+        display_error("Insufficient permissions.")
+        return
+
+    db = next(get_db())
+    try:
+        # Sales staff may only record payments on their own contracts
+        own_contracts = current_user.department == DepartmentEnum.COMMERCIAL
+        remaining = apply_payment(
+            db, contract_id, amount, recorded_by_id=current_user.employee_id,
+            sales_contact_id=current_user.employee_id if own_contracts else None,
+        )
+        db.commit()
+        console.print(
+            Panel(
+                f"[bold green]Payment recorded for contract {contract_id}. "
+                f"Remaining amount: {remaining:.2f}€[/bold green]",
+                box=box.ROUNDED,
+            )
+        )
+        sentry_sdk.capture_message(
+            f"Payment of {amount} recorded for Contract ID {contract_id}.",
+            level="info",
+        )
+    except ValueError as ve:
+        db.rollback()
+        display_error(str(ve))
+    except Exception as e:
+        db.rollback()
+        display_error(f"Error recording payment: {e}")
+        sentry_sdk.capture_exception(e)
+    finally:
+        db.close()
+
+
+def import_payments(file_path: str):
+    """
+    Imports payments from a CSV file (columns: contract_id, amount).
+    The whole file is applied in one transaction, batch by batch.
+    """
+    current_user = get_current_user()
+
+    if not current_user:
+        display_error("Authentication required.")
+        return
+
+    if not has_permission(current_user, "import_payments"):
+        display_error("Insufficient permissions.")
+        return
+
+    db = next(get_db())
+    imported = 0
+    batch = []
+    try:
+        for _, contract_id, amount in read_payments_file(file_path):
+            batch.append((contract_id, amount))
+            if len(batch) >= PAYMENT_BATCH_SIZE:
+                imported += apply_payment_batch(
+                    db, batch, recorded_by_id=current_user.employee_id
+                )
+                batch = []
+        imported += apply_payment_batch(
+            db, batch, recorded_by_id=current_user.employee_id
+        )
+        db.commit()
+        console.print(
+            Panel(
+                f"[bold green]{imported} payment(s) imported successfully!"
+                "[/bold green]",
+                box=box.ROUNDED,
+            )
+        )
+        sentry_sdk.capture_message(
+            f"{imported} payments imported from '{file_path}'.", level="info"
+        )
+    except (OSError, ValueError) as e:
+        db.rollback()
+        display_error(f"Import aborted, no payment recorded: {e}")
+    except Exception as e:
+        db.rollback()
+        display_error(f"Error importing payments: {e}")
+        sentry_sdk.capture_exception(e)
+    finally:
+        db.close()
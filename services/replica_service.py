@@ -0,0 +1,337 @@
+from EpicEventsCRM.models.employee_model import Employee
+from EpicEventsCRM.models.contract_model import Contract
+from EpicEventsCRM.models.client_model import Client
+from EpicEventsCRM.models.event_model import Event
+from EpicEventsCRM.utils.permissions import has_permission
+from services.updates import UpdateConflictError, display_conflict
+from services.data_access import MAX_TRANSACTION_AGE
+from db.replica import pending_writes, sync_state, decode_changes
+from db.audit import UNAUDITED_COLUMNS, audit_row, audit_value
+from EpicEventsCRM.models.audit_log_model import AuditLog
+from db import replica
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy import select, insert, update, delete
+from sqlalchemy.exc import OperationalError
+from datetime import datetime, timezone
+from auth import get_current_user
+from EpicEventsCRM.views.messages import display_error
+from rich.console import Console
+from rich.table import Table
+from rich import box
+import sentry_sdk
+import json
+
+
+console = Console()
+
+# Number of rows fetched from the central database per query
+SYNC_CHUNK_SIZE = 500
+
+# Replicated entities, in dependency order, with the permission to read them.
+# Employees are always replicated: every other row references one.
+REPLICATED_MODELS = (
+    (Employee, None),
+    (Client, "list_clients"),
+    (Contract, "list_contracts"),
+    (Event, "list_events"),
+)
+
+# Parent entity of the foreign keys that may point to a row created offline
+OFFLINE_FOREIGN_KEYS = {
+    Contract: {"client_id": Client},
+    Event: {"client_id": Client, "contract_id": Contract},
+}
+
+MODELS_BY_NAME = {model.__name__: model for model, _ in REPLICATED_MODELS}
+
+# Stored instead of the password hash of the other employees
+MASKED_PASSWORD_HASH = "!"
+
+
+def replicated_models(user) -> list:
+    """
+    Returns the entities the user may read following ROLE_PERMISSIONS, plus
+    the parents they reference.
+    """
+    models = [
+        model for model, permission in REPLICATED_MODELS
+        if permission is None or has_permission(user, permission)
+    ]
+    if Event in models:
+        models += [m for m in (Client, Contract) if m not in models]
+    if Contract in models and Client not in models:
+        models.append(Client)
+    return [model for model, _ in REPLICATED_MODELS if model in models]
+
+
+def _pk(model):
+    return model.__table__.primary_key.columns.values()[0]
+
+
+def _chunks(items: list, size: int):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def push(central_db, replica_db) -> tuple:
+    """
+    Replays the queued writes on the central database, in order.
+
+    Updates only apply if the central row still has the version it was read
+    at; otherwise they are returned as conflicts and dropped, the central
+    version winning. Rows created offline get their central IDs, and foreign
+    keys to them are remapped. The applied writes are audited with one
+    executemany, their old values taken from the queued ``original``.
+    Returns ``(applied, conflicts)``. The caller commits both sessions.
+    """
+    writes = replica_db.execute(
+        select(pending_writes).order_by(pending_writes.c.write_id)
+    ).all()
+    id_map = {}
+    applied = 0
+    conflicts = []
+    audit_rows = []
+
+    for write in writes:
+        model = MODELS_BY_NAME[write.entity]
+        table = model.__table__
+        pk = _pk(model)
+        changes = decode_changes(model, json.loads(write.changes))
+        for column, parent in OFFLINE_FOREIGN_KEYS.get(model, {}).items():
+            value = changes.get(column)
+            if value is not None and value < 0:
+                changes[column] = id_map[(parent, value)]
+
+        if write.operation == "insert":
+            local_id = changes.pop(pk.key)
+            entity_id = id_map[(model, local_id)] = central_db.execute(
+                insert(table).values(changes).returning(pk)
+            ).scalar_one()
+            applied += 1
+            audit_rows.append(audit_row(model.__name__, entity_id, "create", {
+                key: [None, audit_value(key, value)]
+                for key, value in changes.items()
+                if key not in UNAUDITED_COLUMNS and value is not None
+            }))
+            continue
+
+        result = central_db.execute(
+            update(table)
+            .where(pk == write.entity_id, table.c.version_id == write.base_version)
+            .values(changes | {"version_id": table.c.version_id + 1})
+        )
+        original = decode_changes(model, json.loads(write.original or "{}"))
+        if result.rowcount:
+            applied += 1
+            audited = {
+                key: [audit_value(key, original.get(key)), audit_value(key, value)]
+                for key, value in changes.items()
+                if key not in UNAUDITED_COLUMNS and original.get(key) != value
+            }
+            if audited:
+                audit_rows.append(audit_row(
+                    model.__name__, write.entity_id, "update", audited
+                ))
+            continue
+
+        current = central_db.execute(
+            select(table).where(pk == write.entity_id)
+        ).one_or_none()
+        conflicts.append(UpdateConflictError(model.__name__, write.entity_id, [
+            (key, original.get(key),
+             getattr(current, key) if current is not None else None, value)
+            for key, value in changes.items()
+        ]))
+        # Make the next pull replace the local copy with the central one
+        replica_db.execute(
+            update(table).where(pk == write.entity_id).values(version_id=0)
+        )
+
+    if audit_rows and central_db.info.get("audit", True):
+        central_db.execute(insert(AuditLog.__table__), audit_rows)
+    if writes:
+        replica_db.execute(delete(pending_writes).where(
+            pending_writes.c.write_id <= writes[-1].write_id
+        ))
+        # Rows created offline come back with their central IDs on the next pull
+        for model in reversed(replica.OFFLINE_WRITABLE_MODELS):
+            replica_db.execute(delete(model.__table__).where(_pk(model) < 0))
+    return applied, conflicts
+
+
+def _upsert_statement(table):
+    stmt = sqlite_insert(table)
+    return stmt.on_conflict_do_update(
+        index_elements=list(table.primary_key.columns),
+        set_={
+            column.name: stmt.excluded[column.name]
+            for column in table.columns if not column.primary_key
+        },
+    )
+
+
+def pull(central_db, replica_db, user) -> dict:
+    """
+    Brings the replica up to date with the rows ``user`` may read.
+
+    Rows are fetched by ``updated_at`` high-water mark, less
+    MAX_TRANSACTION_AGE for the transactions still open at the previous pull,
+    and only those whose ``version_id`` differs from the local copy are
+    transferred. The ID lists of both sides are compared to delete the rows
+    removed from the central database, and to fetch rows missing locally or
+    invalidated by a conflict. Returns
+    ``{entity: (copied, deleted)}``. The caller commits.
+    """
+    models = replicated_models(user)
+    report = {}
+    removed = {}
+    for model in models:
+        table = model.__table__
+        pk = _pk(model)
+        state_name = f"{table.name}_updated_at"
+        high_water = _get_state(replica_db, state_name)
+        central_ids = set(central_db.scalars(select(pk)))
+        local = dict(replica_db.execute(
+            select(pk, table.c.version_id).where(pk > 0)
+        ).all())
+
+        upsert = _upsert_statement(table)
+        copied = set()
+        latest = datetime.fromisoformat(high_water) if high_water else None
+
+        def store(rows):
+            nonlocal latest
+            changed = []
+            for row in rows:
+                row = dict(row._mapping)
+                if latest is None or row["updated_at"] > latest:
+                    latest = row["updated_at"]
+                # Rows of the safety margin are fetched again by the next pull
+                if local.get(row[pk.name]) == row["version_id"]:
+                    continue
+                copied.add(row[pk.name])
+                if model is Employee and row["employee_id"] != user.employee_id:
+                    row["password_hash"] = MASKED_PASSWORD_HASH
+                changed.append(row)
+            if changed:
+                replica_db.execute(upsert, changed)
+
+        delta = select(table).order_by(table.c.updated_at, pk)
+        if high_water:
+            delta = delta.where(table.c.updated_at >= (
+                datetime.fromisoformat(high_water) - MAX_TRANSACTION_AGE
+            ))
+        result = central_db.execute(
+            delta.execution_options(yield_per=SYNC_CHUNK_SIZE))
+        for rows in result.partitions():
+            store(rows)
+
+        # Rows created offline then replaced, or reset after a conflict
+        stale = {entity_id for entity_id, version in local.items() if version == 0}
+        extra = sorted(((central_ids - local.keys()) | stale) - copied)
+        for chunk in _chunks(extra, SYNC_CHUNK_SIZE):
+            store(central_db.execute(select(table).where(pk.in_(chunk))))
+
+        if latest is not None:
+            _set_state(replica_db, state_name, latest.isoformat())
+        removed[model] = sorted(local.keys() - central_ids)
+        report[model.__name__] = (len(copied), len(removed[model]))
+
+    for model in reversed(models):
+        for chunk in _chunks(removed[model], SYNC_CHUNK_SIZE):
+            replica_db.execute(delete(model.__table__).where(_pk(model).in_(chunk)))
+    return report
+
+
+def _get_state(replica_db, name: str):
+    return replica_db.execute(
+        select(sync_state.c.value).where(sync_state.c.name == name)
+    ).scalar_one_or_none()
+
+
+def _set_state(replica_db, name: str, value: str):
+    stmt = sqlite_insert(sync_state).values(name=name, value=value)
+    replica_db.execute(stmt.on_conflict_do_update(
+        index_elements=["name"], set_={"value": stmt.excluded.value}
+    ))
+
+
+def sync(central_factory, replica_factory, user) -> dict:
+    """Pushes the queued writes, then pulls the changes of the central database."""
+    central_db = central_factory()
+    replica_db = replica_factory()
+    try:
+        applied, conflicts = push(central_db, replica_db)
+        central_db.commit()
+        replica_db.commit()
+
+        pulled = pull(central_db, replica_db, user)
+        _set_state(replica_db, "last_sync",
+                   datetime.now(timezone.utc).isoformat(timespec="seconds"))
+        _set_state(replica_db, "employee_id", str(user.employee_id))
+        replica_db.commit()
+        return {"applied": applied, "conflicts": conflicts, "pulled": pulled}
+    except Exception:
+        central_db.rollback()
+        replica_db.rollback()
+        raise
+    finally:
+        central_db.close()
+        replica_db.close()
+
+
+def count_pending_writes() -> int:
+    db = replica.get_replica_sessionmaker()()
+    try:
+        return len(db.execute(select(pending_writes.c.write_id)).all())
+    finally:
+        db.close()
+
+
+def sync_replica():
+    """Synchronizes the local replica with the central database."""
+    current_user = get_current_user()
+
+    if not current_user:
+        display_error("Authentication required.")
+        return
+
+    try:
+        report = sync(
+            replica.central_sessionmaker(), replica.get_replica_sessionmaker(),
+            current_user,
+        )
+    except OperationalError as e:
+        display_error(
+            "Central database unreachable. "
+            f"{count_pending_writes()} change(s) remain queued."
+        )
+        sentry_sdk.capture_exception(e)
+        return
+    except Exception as e:
+        display_error(f"Sync failed, nothing was changed: {e}")
+        sentry_sdk.capture_exception(e)
+        return
+
+    table = Table(
+        title="[bold cyan]Replica Sync[/bold cyan]",
+        box=box.ROUNDED,
+        header_style="bold white",
+    )
+    table.add_column("Entity", style="cyan")
+    table.add_column("Copied", justify="right", style="green")
+    table.add_column("Deleted", justify="right", style="red")
+    for entity, (copied, deleted) in report["pulled"].items():
+        table.add_row(entity, str(copied), str(deleted))
+    console.print(table)
+    console.print(
+        f"[bold green]{report['applied']} queued change(s) sent to the central "
+        "database.[/bold green]"
+    )
+    for conflict in report["conflicts"]:
+        display_conflict(conflict)
+    sentry_sdk.capture_message(
+        f"Replica synced for '{current_user.email}': {report['applied']} applied, "
+        f"{len(report['conflicts'])} conflict(s).",
+        level="info",
+    )
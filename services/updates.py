@@ -0,0 +1,321 @@
+from EpicEventsCRM.models.audit_log_model import AuditLog
+from sqlalchemy.orm.exc import StaleDataError
+from sqlalchemy import inspect, select, update, insert, bindparam
+from collections import defaultdict
+from db.audit import audit_row, audit_value
+from db.database import get_db
+from EpicEventsCRM.views.messages import display_error, record_error
+from rich.console import Console
+from rich.table import Table
+from rich.panel import Panel
+from rich import box
+import sentry_sdk
+import csv
+
+
+console = Console()
+
+# Columns whose values must never be displayed in a conflict report
+MASKED_FIELDS = {"password_hash"}
+
+
+class FieldUpdateError(ValueError):
+    """Raised when a non-interactive update cannot be applied."""
+
+
+class UpdateConflictError(Exception):
+    """
+    Raised when a row was modified by someone else between the moment it was
+    read for an interactive update and the moment the changes were committed.
+    """
+
+    def __init__(self, entity: str, entity_id, diff: list):
+        self.entity = entity
+        self.entity_id = entity_id
+        # List of (field, value when read, current value, submitted value)
+        self.diff = diff
+        super().__init__(
+            f"{entity} {entity_id} was modified by another user while you were "
+            "editing it. Your changes were not saved."
+        )
+
+
+def _column_keys(model):
+    mapper = inspect(model)
+    return [
+        attr.key for attr in mapper.column_attrs
+        if attr.columns[0] is not mapper.version_id_col
+    ]
+
+
+def load_for_update(model, entity_id):
+    """
+    Loads a row for an interactive update in a short-lived session.
+
+    The session (and its pooled connection) is released before returning, so
+    no connection or lock is held while the user is answering prompts. The
+    returned instance is detached and only its column attributes may be read.
+    """
+    db = next(get_db())
+    try:
+        return db.get(model, entity_id)
+    finally:
+        db.close()
+
+
+def commit_versioned_update(instance, changes: dict, db=None):
+    """
+    Applies ``changes`` to the row ``instance`` was loaded from, in a short
+    transaction, if nobody changed the row since it was loaded.
+
+    The row is re-read at commit time and its ``version_id`` compared with the
+    one loaded before the prompts; the ORM version check then guards the
+    UPDATE itself. Raises UpdateConflictError on a concurrent modification.
+    """
+    model = type(instance)
+    entity_id = inspect(instance).identity[0]
+    own_session = db is None
+    if own_session:
+        db = next(get_db())
+    try:
+        current = db.get(model, entity_id, populate_existing=True)
+        if current is None:
+            raise LookupError(f"{model.__name__} {entity_id} no longer exists.")
+        if current.version_id != instance.version_id:
+            raise _conflict(instance, current, changes)
+
+        for key, value in changes.items():
+            setattr(current, key, value)
+        try:
+            db.commit()
+        except StaleDataError:
+            db.rollback()
+            raise _conflict(instance, db.get(model, entity_id), changes)
+        return current
+    finally:
+        if own_session:
+            db.close()
+
+
+def _conflict(original, current, changes: dict) -> UpdateConflictError:
+    """Builds the conflict error with the diff of the relevant fields."""
+    model = type(original)
+    diff = []
+    for key in _column_keys(model):
+        before = getattr(original, key)
+        now = getattr(current, key) if current is not None else None
+        mine = changes.get(key, before)
+        if now != before or mine != before:
+            diff.append((key, before, now, mine))
+    return UpdateConflictError(
+        model.__name__, inspect(original).identity[0], diff)
+
+
+def _display_value(field, value):
+    if field in MASKED_FIELDS:
+        return "********"
+    if value is None:
+        return "[dim]None[/dim]"
+    return str(getattr(value, "value", value))
+
+
+def display_conflict(conflict: UpdateConflictError):
+    """Prints a conflict report showing what changed on both sides."""
+    console.print(
+        Panel(f"[bold red]{conflict}[/bold red]", box=box.ROUNDED, style="red")
+    )
+    record_error(str(conflict))
+    table = Table(
+        title="[bold yellow]Conflicting changes[/bold yellow]",
+        box=box.ROUNDED,
+        header_style="bold white",
+    )
+    table.add_column("Field", style="cyan")
+    table.add_column("When you started", style="blue")
+    table.add_column("Now in database", style="magenta")
+    table.add_column("Your value", style="green")
+
+    for field, before, now, mine in conflict.diff:
+        table.add_row(
+            field,
+            _display_value(field, before),
+            _display_value(field, now),
+            _display_value(field, mine),
+        )
+    console.print(table)
+    console.print(
+        "[bold yellow]Run the update again to apply your changes on top of "
+        "the current values.[/bold yellow]"
+    )
+
+
+# --- Non-interactive (flag and file driven) updates ---
+
+def parse_bool(value) -> bool:
+    """Parses a boolean written as true/false, yes/no, y/n or 1/0."""
+    if isinstance(value, bool):
+        return value
+    normalized = str(value).strip().lower()
+    if normalized in {"true", "yes", "y", "1"}:
+        return True
+    if normalized in {"false", "no", "n", "0"}:
+        return False
+    raise ValueError(f"Invalid boolean value: {value!r}")
+
+
+def apply_field_updates(db, model, updates: list, check=None, check_columns=()):
+    """
+    Applies partial updates without loading ORM instances or relationships.
+
+    ``updates`` is a list of ``(label, entity_id, changes)``, the optional
+    label prefixing error messages (e.g. the file line). The target rows
+    are locked with one ``SELECT`` of the primary key and ``check_columns``;
+    ``check(row, changes)`` may raise ValueError to reject a change; its
+    ``changes`` also hold those of the previous updates of the same row,
+    which the stored ``row`` does not show. The updates of each row are
+    merged in order, the last value of a column winning, and rows that
+    change the same set of columns are then written with a single
+    executemany ``UPDATE`` that only sets those columns and bumps
+    ``version_id``. The changes are audited with one more executemany: the
+    values they replace are read by the locking ``SELECT``. The caller commits. Returns the
+    number of rows updated.
+    """
+    table = model.__table__
+    pk = table.primary_key.columns.values()[0]
+    ids = {entity_id for _, entity_id, _ in updates}
+    check_keys = {column.key for column in check_columns}
+    changed_columns = [
+        table.c[key]
+        for key in sorted({key for _, _, changes in updates for key in changes})
+        if key not in check_keys
+    ]
+    current = {
+        row[0]: row
+        for row in db.execute(
+            select(pk, *check_columns, *changed_columns)
+            .where(pk.in_(ids)).with_for_update()
+        )
+    }
+
+    accepted = defaultdict(dict)
+    for label, entity_id, changes in updates:
+        prefix = f"{label}: " if label else ""
+        if entity_id not in current:
+            raise FieldUpdateError(f"{prefix}{model.__name__} {entity_id} not found.")
+        accepted[entity_id].update(changes)
+        if check:
+            try:
+                check(current[entity_id], accepted[entity_id])
+            except ValueError as e:
+                raise FieldUpdateError(f"{prefix}{e}")
+
+    groups = defaultdict(list)
+    for entity_id, changes in accepted.items():
+        groups[tuple(sorted(changes))].append(
+            {"target_id": entity_id,
+             **{f"new_{key}": value for key, value in changes.items()}}
+        )
+
+    for keys, params in groups.items():
+        db.execute(
+            update(table)
+            .where(pk == bindparam("target_id"))
+            .values(
+                {key: bindparam(f"new_{key}") for key in keys}
+                | {"version_id": table.c.version_id + 1}
+            ),
+            params,
+        )
+
+    if db.info.get("audit", True):
+        audit_rows = []
+        values = {entity_id: dict(row._mapping) for entity_id, row in current.items()}
+        for _, entity_id, changes in updates:
+            changed = {
+                key: [audit_value(key, values[entity_id][key]), audit_value(key, value)]
+                for key, value in changes.items() if values[entity_id][key] != value
+            }
+            values[entity_id].update(changes)
+            if changed:
+                audit_rows.append(
+                    audit_row(model.__name__, entity_id, "update", changed))
+        if audit_rows:
+            db.execute(insert(AuditLog.__table__), audit_rows)
+    return len(updates)
+
+
+def read_update_file(file_path: str, id_column: str):
+    """
+    Yields ``(label, entity_id, values)`` from a CSV update file.
+    Blank cells are left out of ``values`` so the column is kept unchanged.
+    """
+    with open(file_path, newline="") as f:
+        reader = csv.DictReader(f)
+        if id_column not in (reader.fieldnames or []):
+            raise FieldUpdateError(f"Missing column '{id_column}' in update file.")
+        for row in reader:
+            label = f"Line {reader.line_num}"
+            try:
+                entity_id = int(row.pop(id_column))
+            except (TypeError, ValueError):
+                raise FieldUpdateError(f"{label}: invalid {id_column}.")
+            values = {
+                key: value.strip() for key, value in row.items()
+                if key and value is not None and value.strip() != ""
+            }
+            yield label, entity_id, values
+
+
+def collect_file_updates(file_path: str, id_column: str, to_changes) -> list:
+    """
+    Reads a CSV update file and validates every line with ``to_changes``.
+    Returns the ``(label, entity_id, changes)`` list for run_field_updates.
+    """
+    updates = []
+    for label, entity_id, values in read_update_file(file_path, id_column):
+        try:
+            updates.append((label, entity_id, to_changes(values)))
+        except ValueError as e:
+            raise FieldUpdateError(f"{label}: {e}")
+    return updates
+
+
+def reject_unknown_fields(values: dict, allowed: set):
+    """Raises ValueError if ``values`` contains a field that cannot be updated."""
+    unknown = set(values) - allowed
+    if unknown:
+        raise ValueError(f"Unknown field(s): {', '.join(sorted(unknown))}")
+
+
+def run_field_updates(model, updates: list, check=None, check_columns=()):
+    """
+    Applies non-interactive updates in one transaction and reports the result.
+    Nothing is written if any of the updates is rejected.
+    """
+    updates = [update_ for update_ in updates if update_[2]]
+    if not updates:
+        console.print(
+            Panel("[bold yellow]No changes to apply.[/bold yellow]", box=box.ROUNDED)
+        )
+        return
+
+    name = model.__name__
+    db = next(get_db())
+    try:
+        count = apply_field_updates(db, model, updates, check, check_columns)
+        db.commit()
+        if count == 1:
+            message = f"{name} ID {updates[0][1]} updated successfully."
+        else:
+            message = f"{count} {name.lower()} updates applied successfully."
+        console.print(Panel(f"[bold green]{message}[/bold green]", box=box.ROUNDED))
+        sentry_sdk.capture_message(message, level="info")
+    except ValueError as ve:
+        db.rollback()
+        display_error(f"Update aborted, nothing saved: {ve}")
+    except Exception as e:
+        db.rollback()
+        display_error(f"Error updating {name.lower()}: {e}")
+        sentry_sdk.capture_exception(e)
+    finally:
+        db.close()
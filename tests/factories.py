@@ -0,0 +1,36 @@
+from EpicEventsCRM.models import Employee, DepartmentEnum, Client, Contract
+
+
+def make_employee(db, department=DepartmentEnum.COMMERCIAL, email="sales@epic.com"):
+    employee = Employee(
+        first_name="Alice",
+        last_name="Martin",
+        email=email,
+        phone_number="0600000000",
+        department=department,
+        password_hash="not-a-real-hash",
+    )
+    db.add(employee)
+    db.commit()
+    return employee
+
+
+def make_contract(db, sales_contact, total=1000.0, remaining=1000.0,
+                  email="client@acme.com"):
+    client = Client(
+        full_name="Bob Client",
+        email=email,
+        phone_number="0611111111",
+        company_name="Acme",
+        sales_contact=sales_contact,
+    )
+    contract = Contract(
+        total_amount=total,
+        remaining_amount=remaining,
+        is_signed=True,
+        client=client,
+        sales_contact=sales_contact,
+    )
+    db.add(contract)
+    db.commit()
+    return contract
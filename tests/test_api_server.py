@@ -0,0 +1,97 @@
+from EpicEventsCRM.models import DepartmentEnum
+from config import JWT_SECRET, JWT_ALGORITHM
+from services.api_server import ApiServer, ROUTES
+from tests.factories import make_employee, make_contract
+from datetime import datetime, timedelta, timezone
+import http.client
+import threading
+import asyncio
+import json
+import jwt
+import pytest
+
+
+@pytest.fixture
+def api(session_factory):
+    """Runs the API server on a free localhost port in a background thread."""
+    loop = asyncio.new_event_loop()
+    server = ApiServer(port=0, workers=2)
+    loop.run_until_complete(server.start())
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    yield server
+    asyncio.run_coroutine_threadsafe(server.close(), loop).result()
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+    loop.close()
+
+
+def _token(employee_id, expires_in=3600):
+    return jwt.encode(
+        {"employee_id": employee_id,
+         "exp": datetime.now(timezone.utc) + timedelta(seconds=expires_in)},
+        JWT_SECRET, algorithm=JWT_ALGORITHM,
+    )
+
+
+def _get(server, path, token=None):
+    connection = http.client.HTTPConnection("127.0.0.1", server.port, timeout=5)
+    headers = {"Authorization": f"Bearer {token}"} if token else {}
+    connection.request("GET", path, headers=headers)
+    response = connection.getresponse()
+    body = json.loads(response.read())
+    connection.close()
+    return response.status, body
+
+
+def test_list_contracts_with_filters_pagination_and_fields(api, db_session):
+    manager = make_employee(db_session, DepartmentEnum.MANAGEMENT)
+    paid = make_contract(db_session, manager, remaining=0.0)
+    unpaid = make_contract(db_session, manager, remaining=10.0, email="b@acme.com")
+
+    status, body = _get(api, "/contracts?fields=contract_id,remaining_amount",
+                        _token(manager.employee_id))
+    assert status == 200
+    assert body["data"] == [
+        {"contract_id": paid.contract_id, "remaining_amount": 0.0},
+        {"contract_id": unpaid.contract_id, "remaining_amount": 10.0},
+    ]
+
+    status, body = _get(api, "/contracts?not_paid=true&limit=1",
+                        _token(manager.employee_id))
+    assert status == 200
+    assert [row["contract_id"] for row in body["data"]] == [unpaid.contract_id]
+    assert body["data"][0]["sales_contact"] == "Alice Martin"
+
+
+def test_requests_require_a_valid_bearer_token(api, db_session):
+    manager = make_employee(db_session, DepartmentEnum.MANAGEMENT)
+
+    assert _get(api, "/clients")[0] == 401
+    assert _get(api, "/clients", "not-a-jwt")[0] == 401
+    assert _get(api, "/clients", _token(manager.employee_id, expires_in=-10))[0] == 401
+    assert _get(api, "/health")[0] == 200
+
+
+def test_role_permissions_and_bad_parameters(api, db_session):
+    sales = make_employee(db_session, DepartmentEnum.COMMERCIAL)
+    token = _token(sales.employee_id)
+
+    status, body = _get(api, "/employees", token)
+    assert status == 403
+    assert body == {"error": "You do not have permission to perform this action."}
+    assert _get(api, "/clients?limit=0", token)[0] == 400
+    assert _get(api, "/clients?color=red", token)[0] == 400
+    assert _get(api, "/clients?fields=password", token)[0] == 400
+    assert _get(api, "/unknown", token)[0] == 404
+
+
+def test_permission_is_checked_before_the_query(api, db_session, monkeypatch):
+    sales = make_employee(db_session, DepartmentEnum.COMMERCIAL)
+
+    def wrapped_query(**kwargs):
+        raise RuntimeError("Database error while retrieving employees")
+
+    route = (wrapped_query,) + ROUTES["/employees"][1:]
+    monkeypatch.setitem(ROUTES, "/employees", route)
+    assert _get(api, "/employees", _token(sales.employee_id))[0] == 403
@@ -0,0 +1,67 @@
+from EpicEventsCRM.models import DepartmentEnum, Contract, Event
+from services.archive_service import archive_records, count_archivable
+from services.data_access import (
+    get_all_contracts,
+    get_all_events,
+    get_contracts_changed_since,
+)
+from tests.factories import make_employee, make_contract
+from datetime import datetime
+import pytest
+
+
+def _event(db, contract, end):
+    db.add(Event(
+        event_name=f"Event ending {end:%Y-%m-%d}", contract=contract,
+        client=contract.client, support_contact=contract.sales_contact,
+        location="Paris", attendees=10,
+        event_start_date=end.replace(hour=8), event_end_date=end,
+    ))
+
+
+@pytest.fixture
+def history(db_session):
+    manager = make_employee(db_session, DepartmentEnum.MANAGEMENT)
+    closed = make_contract(db_session, manager, remaining=0, email="a@acme.com")
+    unpaid = make_contract(db_session, manager, remaining=10, email="b@acme.com")
+    running = make_contract(db_session, manager, remaining=0, email="c@acme.com")
+    for contract in (closed, unpaid, running):
+        contract.date_created = datetime(2023, 1, 1)
+    _event(db_session, closed, datetime(2023, 6, 1, 18))
+    _event(db_session, unpaid, datetime(2023, 6, 2, 18))
+    _event(db_session, running, datetime(2023, 6, 3, 18))
+    _event(db_session, running, datetime(2024, 6, 3, 18))
+    db_session.commit()
+    return manager, closed, unpaid, running
+
+
+def test_archive_records_closed_contracts_and_past_events(db_session, history):
+    manager, closed, unpaid, running = history
+    before = datetime(2024, 1, 1)
+    version = closed.version_id
+    assert count_archivable(db_session, before) == {"contracts": 1, "events": 3}
+
+    assert archive_records(db_session, before) == {"contracts": 1, "events": 3}
+    db_session.commit()
+
+    db_session.expire_all()
+    assert db_session.get(Contract, closed.contract_id).version_id == version + 1
+    assert [c.contract_id for c in get_all_contracts(current_user=manager)] == [
+        unpaid.contract_id, running.contract_id,
+    ]
+    assert len(get_all_contracts(include_archived=True, current_user=manager)) == 3
+    rows = get_all_events(projection=True, current_user=manager)
+    assert [row.event_name for row in rows] == ["Event ending 2024-06-03"]
+    rows = get_all_events(projection=True, include_archived=True,
+                          current_user=manager)
+    assert sum(row.archived_at is not None for row in rows) == 3
+    # Archiving is a change for the delta fetch
+    changed = get_contracts_changed_since(datetime(2000, 1, 1), current_user=manager)
+    assert closed.contract_id in [c.contract_id for c in changed]
+
+    assert archive_records(db_session, before) == {"contracts": 0, "events": 0}
+
+
+def test_archive_date_cannot_be_in_the_future(db_session):
+    with pytest.raises(ValueError, match="future"):
+        archive_records(db_session, datetime(2999, 1, 1))
@@ -0,0 +1,86 @@
+from EpicEventsCRM.models import AuditLog, Client, Contract, DepartmentEnum
+from services.updates import apply_field_updates
+from services.audit_service import get_audit_trail
+from tests.factories import make_employee, make_contract
+from db.audit import AuditLogError, set_actor
+from sqlalchemy import event, select
+import json
+import pytest
+
+
+@pytest.fixture
+def actor(db_session):
+    employee = make_employee(db_session, DepartmentEnum.MANAGEMENT)
+    set_actor(employee.employee_id)
+    yield employee
+    set_actor(None)
+
+
+def _trail(db, entity, entity_id):
+    return [
+        (entry.operation, json.loads(entry.changes), first_name)
+        for entry, first_name, _ in get_audit_trail(db, entity, entity_id)
+    ]
+
+
+def test_orm_changes_are_audited_in_one_insert_per_flush(db_session, actor):
+    contract = make_contract(db_session, actor)
+    other = make_employee(db_session, email="other@epic.com")
+    statements = []
+    event.listen(db_session.get_bind(), "before_cursor_execute",
+                 lambda *args: statements.append(args[2]))
+
+    contract.remaining_amount = 400.0
+    contract.is_signed = False
+    contract.sales_contact = other
+    contract.client.company_name = "Acme Corp"
+    db_session.commit()
+
+    assert len([s for s in statements if s.startswith("INSERT INTO audit_log")]) == 1
+    trail = _trail(db_session, "Contract", contract.contract_id)
+    assert trail[0][0] == "create" and trail[0][2] == "Alice"
+    assert trail[1] == ("update", {
+        "remaining_amount": [1000.0, 400.0],
+        "is_signed": [True, False],
+        "sales_contact_id": [actor.employee_id, other.employee_id],
+    }, "Alice")
+    assert _trail(db_session, "Client", contract.client_id)[-1][1] == {
+        "company_name": ["Acme", "Acme Corp"],
+    }
+
+
+def test_field_updates_are_audited(db_session, actor):
+    contract = make_contract(db_session, actor)
+    apply_field_updates(db_session, Contract, [
+        ("Line 2", contract.contract_id, {"remaining_amount": 800.0}),
+        ("Line 3", contract.contract_id, {"remaining_amount": 500.0,
+                                          "total_amount": 1000.0}),
+    ], check_columns=(Contract.total_amount,))
+    db_session.commit()
+
+    updates = [changes for operation, changes, _ in
+               _trail(db_session, "Contract", contract.contract_id)
+               if operation == "update"]
+    assert updates == [
+        {"remaining_amount": [1000.0, 800.0]},
+        {"remaining_amount": [800.0, 500.0]},
+    ]
+
+
+def test_deletes_are_audited_and_the_trail_is_append_only(db_session, actor):
+    employee = make_employee(db_session, email="leaving@epic.com")
+    employee_id = employee.employee_id
+    db_session.delete(employee)
+    db_session.commit()
+
+    operation, changes, _ = _trail(db_session, "Employee", employee_id)[-1]
+    assert operation == "delete"
+    assert changes["email"] == ["leaving@epic.com", None]
+    assert changes["password_hash"] == ["********", None]
+
+    entry = db_session.scalars(select(AuditLog)).first()
+    entry.operation = "tampered"
+    with pytest.raises(AuditLogError):
+        db_session.commit()
+    db_session.rollback()
+    assert db_session.scalar(select(Client)) is None
@@ -0,0 +1,87 @@
+from config import JWT_SECRET, JWT_ALGORITHM
+from tests.factories import make_employee
+import pytest
+import time
+import jwt
+import auth
+
+
+@pytest.fixture
+def token_file(tmp_path, monkeypatch):
+    path = tmp_path / ".epicevents_token"
+    monkeypatch.setattr(auth, "TOKEN_FILE", str(path))
+    monkeypatch.setattr(auth, "_token_file_cache", None)
+    auth._verified_claims.cache_clear()
+    return path
+
+
+def _token(employee_id, token_type, lifetime):
+    return jwt.encode(
+        {"employee_id": employee_id, "type": token_type,
+         "exp": int(time.time()) + lifetime},
+        JWT_SECRET, algorithm=JWT_ALGORITHM,
+    )
+
+
+def test_claims_are_verified_once_but_expiry_is_checked(token_file, monkeypatch):
+    token = _token(1, "access", 60)
+    decodes = []
+    real_decode = jwt.decode
+    monkeypatch.setattr(auth.jwt, "decode",
+                        lambda *a, **kw: decodes.append(a) or real_decode(*a, **kw))
+
+    assert auth.verify_token(token)["employee_id"] == 1
+    assert auth.verify_token(token)["employee_id"] == 1
+    assert len(decodes) == 1
+
+    later = time.time() + 120
+    monkeypatch.setattr(auth.time, "time", lambda: later)
+    assert auth.verify_token(token) is None
+
+
+def test_refresh_token_is_not_an_access_token(token_file):
+    assert auth.verify_token(_token(1, "refresh", 60)) is None
+    # Tokens issued before refresh tokens existed have no type
+    legacy = jwt.encode({"employee_id": 1, "exp": int(time.time()) + 60},
+                        JWT_SECRET, algorithm=JWT_ALGORITHM)
+    assert auth.verify_token(legacy)["employee_id"] == 1
+
+
+def test_expired_access_token_is_renewed_silently(db_session, token_file, capsys):
+    employee = make_employee(db_session)
+    refresh = _token(employee.employee_id, "refresh", 3600)
+    auth.save_token(_token(employee.employee_id, "access", -10), refresh)
+
+    assert auth.get_current_user().employee_id == employee.employee_id
+    assert "expired" not in capsys.readouterr().out
+    assert auth.verify_token(auth.load_token())
+    assert auth._read_token_file()["refresh_token"] == refresh
+
+
+def test_session_expires_with_the_refresh_token(db_session, token_file, capsys):
+    employee = make_employee(db_session)
+    auth.save_token(_token(employee.employee_id, "access", -10),
+                    _token(employee.employee_id, "refresh", -10))
+
+    assert auth.get_current_user() is None
+    assert "Session expired" in capsys.readouterr().out
+    assert not token_file.exists()
+
+
+def test_token_file_is_read_again_only_when_it_changes(token_file, monkeypatch):
+    # Token file written by a version without refresh tokens
+    token_file.write_text("first-token")
+    assert auth.load_token() == "first-token"
+
+    opened = []
+    real_open = open
+    monkeypatch.setattr("builtins.open",
+                        lambda *a, **kw: opened.append(a) or real_open(*a, **kw))
+    assert auth.load_token() == "first-token"
+    assert opened == []
+
+    auth.save_token("second-token")
+    assert auth.load_token() == "second-token"
+    assert opened == []
+    auth.delete_token()
+    assert auth.load_token() is None
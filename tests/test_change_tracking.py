@@ -0,0 +1,63 @@
+from EpicEventsCRM.models import DepartmentEnum, Client, Contract
+from services.data_access import get_clients_changed_since
+from services.payment_service import apply_payment_batch
+from tests.factories import make_employee, make_contract
+from sqlalchemy import update
+from datetime import datetime
+
+
+LONG_AGO = datetime(2020, 1, 1)
+
+
+def _age(db, model, pk, when=LONG_AGO):
+    # An explicit value takes precedence over the onupdate default
+    db.execute(update(model).where(pk).values(created_at=when, updated_at=when))
+    db.commit()
+
+
+def test_timestamps_are_set_on_insert(db_session):
+    seller = make_employee(db_session)
+    contract = make_contract(db_session, seller)
+    assert contract.created_at is not None
+    assert contract.updated_at == contract.created_at
+    assert contract.client.updated_at is not None
+    # Dates given by the database when each row is inserted
+    assert contract.date_created == contract.created_at
+    assert contract.client.last_contact_date == contract.client.created_at
+    later = make_contract(db_session, seller, email="later@acme.com")
+    assert later.date_created > contract.date_created
+
+
+def test_orm_and_core_updates_refresh_updated_at(db_session):
+    seller = make_employee(db_session)
+    contract = make_contract(db_session, seller)
+    _age(db_session, Contract, Contract.contract_id == contract.contract_id)
+    _age(db_session, Client, Client.client_id == contract.client_id)
+
+    contract.client.company_name = "Acme Group"
+    db_session.commit()
+    assert contract.client.updated_at > LONG_AGO
+    assert contract.client.created_at == LONG_AGO
+
+    apply_payment_batch(db_session, [(contract.contract_id, 100)])
+    db_session.commit()
+    db_session.refresh(contract)
+    assert contract.updated_at > LONG_AGO
+
+
+def test_clients_changed_since(db_session):
+    manager = make_employee(db_session, DepartmentEnum.MANAGEMENT)
+    old = make_contract(db_session, manager, email="old@acme.com").client
+    recent = make_contract(db_session, manager, email="recent@acme.com").client
+    _age(db_session, Client, Client.client_id == old.client_id)
+    _age(db_session, Client, Client.client_id == recent.client_id,
+         datetime(2024, 6, 1))
+
+    since = datetime(2024, 1, 1)
+    changed = get_clients_changed_since(since, current_user=manager)
+    assert [c.client_id for c in changed] == [recent.client_id]
+
+    changed = get_clients_changed_since(LONG_AGO, current_user=manager)
+    assert [c.client_id for c in changed] == [old.client_id, recent.client_id]
+    assert len(get_clients_changed_since(LONG_AGO, limit=1,
+                                         current_user=manager)) == 1
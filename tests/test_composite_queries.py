@@ -0,0 +1,67 @@
+from EpicEventsCRM.models import DepartmentEnum, Event
+from services.composite_queries import (
+    run_concurrently,
+    gather_queries,
+    count_related_records,
+)
+from tests.factories import make_employee, make_contract
+from datetime import datetime
+import asyncio
+import time
+import auth
+import pytest
+
+
+def test_queries_overlap_and_results_are_merged():
+    def slow(value):
+        time.sleep(0.2)
+        return value
+
+    started = time.perf_counter()
+    results = run_concurrently({
+        "a": lambda: slow(1),
+        "b": lambda: slow(2),
+        "c": lambda: slow(3),
+    })
+    assert results == {"a": 1, "b": 2, "c": 3}
+    assert time.perf_counter() - started < 0.5
+
+
+def test_first_error_is_raised():
+    def fail():
+        raise RuntimeError("database unreachable")
+
+    with pytest.raises(RuntimeError, match="unreachable"):
+        run_concurrently({"ok": lambda: 1, "broken": fail})
+
+
+def test_gather_queries_on_the_event_loop():
+    async def value(v):
+        await asyncio.sleep(0)
+        return v
+
+    results = asyncio.run(gather_queries({"x": value(1), "y": value(2)}))
+    assert results == {"x": 1, "y": 2}
+
+
+def test_status_counts_related_records(db_session, monkeypatch, capsys):
+    seller = make_employee(db_session)
+    support = make_employee(db_session, DepartmentEnum.SUPPORT, email="s@epic.com")
+    contract = make_contract(db_session, seller)
+    make_contract(db_session, seller, email="other@acme.com")
+    db_session.add(Event(
+        event_name="Launch", contract=contract, client=contract.client,
+        support_contact=support, location="Paris", attendees=10,
+        event_start_date=datetime(2030, 1, 1), event_end_date=datetime(2030, 1, 2),
+    ))
+    db_session.commit()
+
+    assert count_related_records(seller.employee_id) == {
+        "clients": 2, "contracts": 2, "events": 0,
+    }
+    assert count_related_records(support.employee_id)["events"] == 1
+
+    monkeypatch.setattr(auth, "get_current_user", lambda: seller)
+    auth.status()
+    output = capsys.readouterr().out
+    assert "Clients: 2" in output and "Events: 0" in output
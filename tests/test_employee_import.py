@@ -0,0 +1,93 @@
+from services.employee_service import (
+    read_employees_file, insert_employees, hash_passwords,
+)
+from EpicEventsCRM.models import Employee, DepartmentEnum
+from EpicEventsCRM.models.employee_model import ph
+from tests.factories import make_employee
+from sqlalchemy import select, func
+import pytest
+
+
+HEADER = "first_name,last_name,email,phone_number,department,password\n"
+
+
+def _write(tmp_path, *lines):
+    path = tmp_path / "employees.csv"
+    path.write_text(HEADER + "".join(line + "\n" for line in lines))
+    return str(path)
+
+
+def test_read_employees_file_validates_every_line(tmp_path):
+    rows = read_employees_file(_write(
+        tmp_path,
+        "Jane,Doe,Jane@Epic.com,0600000001,support,secret1",
+        "John,Roe,john@epic.com,0600000002,Management,secret2",
+    ))
+    assert [row["email"] for row in rows] == ["jane@epic.com", "john@epic.com"]
+    assert rows[0]["department"] is DepartmentEnum.SUPPORT
+
+    with pytest.raises(ValueError, match="Line 3: Invalid department"):
+        read_employees_file(_write(
+            tmp_path,
+            "Jane,Doe,jane@epic.com,0600000001,SUPPORT,secret1",
+            "John,Roe,john@epic.com,0600000002,ACCOUNTING,secret2",
+        ))
+    with pytest.raises(ValueError, match="Line 3: Email jane@epic.com already used"):
+        read_employees_file(_write(
+            tmp_path,
+            "Jane,Doe,jane@epic.com,0600000001,SUPPORT,secret1",
+            "Janet,Doe,JANE@epic.com,0600000002,SUPPORT,secret2",
+        ))
+
+
+def test_hash_passwords_in_processes_keeps_the_order():
+    hashes = list(hash_passwords(["first", "second", "third"], workers=2))
+    assert all(ph.verify(h, p) for h, p in zip(hashes, ["first", "second", "third"]))
+    assert len(set(hashes)) == 3
+
+
+def test_insert_employees_in_batches(db_session, tmp_path, monkeypatch):
+    monkeypatch.setattr("services.employee_service.EMPLOYEE_BATCH_SIZE", 2)
+    monkeypatch.setattr("services.employee_service.hash_password",
+                        lambda password: f"hashed-{password}")
+    rows = read_employees_file(_write(tmp_path, *(
+        f"First{i},Last{i},user{i}@epic.com,060000000{i},COMMERCIAL,pw{i}"
+        for i in range(5)
+    )))
+
+    assert insert_employees(db_session, rows, workers=1) == 5
+    db_session.commit()
+    stored = db_session.scalar(
+        select(Employee).where(Employee.email == "user3@epic.com"))
+    assert stored.password_hash == "hashed-pw3"
+    assert stored.version_id == 1
+
+
+def test_insert_employees_writes_nothing_before_every_hash(
+        db_session, tmp_path, monkeypatch):
+    monkeypatch.setattr("services.employee_service.EMPLOYEE_BATCH_SIZE", 2)
+
+    def hash_password(password):
+        if password == "pw4":
+            raise RuntimeError("hashing failed")
+        return f"hashed-{password}"
+
+    monkeypatch.setattr("services.employee_service.hash_password", hash_password)
+    rows = read_employees_file(_write(tmp_path, *(
+        f"First{i},Last{i},user{i}@epic.com,060000000{i},COMMERCIAL,pw{i}"
+        for i in range(5)
+    )))
+
+    with pytest.raises(RuntimeError):
+        insert_employees(db_session, rows, workers=1)
+    assert db_session.scalar(select(func.count(Employee.employee_id))) == 0
+
+
+def test_insert_employees_refuses_registered_emails(db_session, tmp_path):
+    make_employee(db_session, email="taken@epic.com")
+    rows = read_employees_file(_write(
+        tmp_path, "Jane,Doe,taken@epic.com,0600000001,SUPPORT,secret1"))
+
+    with pytest.raises(ValueError, match="already registered: taken@epic.com"):
+        insert_employees(db_session, rows, workers=1)
+    assert db_session.scalar(select(func.count(Employee.employee_id))) == 1
@@ -0,0 +1,134 @@
+from services.updates import FieldUpdateError, apply_field_updates, collect_file_updates
+from services.contract_service import _contract_changes, _check_contract_amounts
+from services.employee_service import _employee_changes
+from EpicEventsCRM.models import Contract, DepartmentEnum
+from tests.factories import make_employee, make_contract
+from epicevents import _dispatch_update
+import click
+import pytest
+
+
+def _contract_updates(db, updates):
+    return apply_field_updates(
+        db, Contract, updates,
+        check=_check_contract_amounts,
+        check_columns=(Contract.total_amount, Contract.remaining_amount),
+    )
+
+
+def test_apply_field_updates_only_sets_given_columns(db_session):
+    contract = make_contract(db_session, make_employee(db_session), remaining=800.0)
+    contract.is_signed = False
+    db_session.commit()
+    version = contract.version_id
+
+    _contract_updates(db_session, [
+        ("Contract", contract.contract_id, _contract_changes({"is_signed": True}))
+    ])
+    db_session.commit()
+    db_session.expire_all()
+
+    saved = db_session.get(Contract, contract.contract_id)
+    assert saved.is_signed is True
+    assert saved.remaining_amount == 800.0
+    assert saved.version_id == version + 1
+
+
+def test_apply_field_updates_checks_merged_amounts(db_session):
+    contract = make_contract(db_session, make_employee(db_session), total=100.0,
+                             remaining=50.0)
+
+    with pytest.raises(FieldUpdateError, match="Remaining amount"):
+        _contract_updates(db_session, [
+            ("Line 2", contract.contract_id, {"remaining_amount": 150.0})
+        ])
+
+
+def test_apply_field_updates_checks_previous_lines_of_the_same_row(db_session):
+    contract = make_contract(db_session, make_employee(db_session), total=1000.0,
+                             remaining=50.0)
+
+    with pytest.raises(FieldUpdateError, match="Line 3: Remaining amount"):
+        _contract_updates(db_session, [
+            ("Line 2", contract.contract_id, {"total_amount": 100.0}),
+            ("Line 3", contract.contract_id, {"remaining_amount": 500.0}),
+        ])
+
+
+def test_apply_field_updates_last_line_of_a_row_wins(db_session):
+    contract = make_contract(db_session, make_employee(db_session), total=100.0,
+                             remaining=10.0)
+    version = contract.version_id
+
+    _contract_updates(db_session, [
+        ("Line 2", contract.contract_id,
+         {"total_amount": 500.0, "remaining_amount": 50.0}),
+        ("Line 3", contract.contract_id, {"total_amount": 700.0}),
+        ("Line 4", contract.contract_id,
+         {"total_amount": 900.0, "remaining_amount": 60.0}),
+        ("Line 5", contract.contract_id, {"is_signed": True}),
+    ])
+    db_session.commit()
+    db_session.expire_all()
+
+    saved = db_session.get(Contract, contract.contract_id)
+    assert (saved.total_amount, saved.remaining_amount) == (900.0, 60.0)
+    assert saved.is_signed is True
+    assert saved.version_id == version + 1
+
+
+def test_apply_field_updates_unknown_id(db_session):
+    with pytest.raises(FieldUpdateError, match="Line 3: Contract 99 not found"):
+        _contract_updates(db_session, [("Line 3", 99, {"is_signed": True})])
+
+
+def test_update_file_is_applied_in_one_transaction(db_session, tmp_path):
+    employee = make_employee(db_session)
+    first = make_contract(db_session, employee)
+    second = make_contract(db_session, employee, email="other@acme.com")
+    path = tmp_path / "contracts.csv"
+    path.write_text(
+        "contract_id,remaining_amount,is_signed\n"
+        f"{first.contract_id},0,no\n"
+        f"{second.contract_id},250,\n"
+    )
+
+    updates = collect_file_updates(path, "contract_id", _contract_changes)
+    assert _contract_updates(db_session, updates) == 2
+    db_session.commit()
+    db_session.expire_all()
+
+    assert db_session.get(Contract, first.contract_id).remaining_amount == 0
+    assert db_session.get(Contract, first.contract_id).is_signed is False
+    assert db_session.get(Contract, second.contract_id).remaining_amount == 250.0
+    assert db_session.get(Contract, second.contract_id).is_signed is True
+
+
+def test_update_file_rejects_unknown_columns(tmp_path):
+    path = tmp_path / "contracts.csv"
+    path.write_text("contract_id,client_id\n1,2\n")
+
+    with pytest.raises(FieldUpdateError, match="Line 2: Unknown field"):
+        collect_file_updates(path, "contract_id", _contract_changes)
+
+
+def test_employee_department_accepts_names_values_and_members():
+    for value in (" support ", "Support", DepartmentEnum.SUPPORT):
+        assert _employee_changes({"department": value}) == {
+            "department": DepartmentEnum.SUPPORT,
+        }
+    with pytest.raises(ValueError, match="Invalid department ' sales '"):
+        _employee_changes({"department": " sales "})
+
+
+@pytest.mark.parametrize("entity_id, fields", [
+    (1, {"total_amount": None}),
+    (None, {"total_amount": 10.0}),
+])
+def test_from_file_cannot_be_combined_with_an_id_or_fields(entity_id, fields):
+    def never(*args, **kwargs):
+        raise AssertionError("no update path may run")
+
+    with pytest.raises(click.UsageError, match="--from-file cannot be combined"):
+        _dispatch_update(entity_id, "updates.csv", fields, never, never, never,
+                         "CONTRACT_ID")
@@ -0,0 +1,81 @@
+from EpicEventsCRM.models import DepartmentEnum, Contract, Employee, Event
+from services.filter_expressions import compile_filter, tokenize, FilterError
+from services.data_access import get_all_contracts, get_all_employees
+from tests.factories import make_employee, make_contract
+from sqlalchemy import select
+from datetime import datetime
+import pytest
+
+
+def test_tokenize():
+    assert tokenize('total_amount>=10.5 and client.email ~ "a\\"b"') == [
+        ("name", "total_amount", 1), ("op", ">=", 13), ("number", "10.5", 15),
+        ("keyword", "and", 20), ("name", "client.email", 24), ("op", "~", 37),
+        ("string", 'a"b', 39),
+    ]
+
+
+def test_precedence_and_parentheses():
+    sql = str(compile_filter(
+        Contract, "total_amount < 1 or is_signed = true and not (remaining_amount > 0)"
+    ))
+    assert sql.startswith("contracts.total_amount < ")
+    assert " OR contracts.is_signed = true AND contracts.remaining_amount <= " in sql
+
+
+def test_relation_conditions_run_server_side():
+    sql = str(compile_filter(Contract, 'client.company_name ~ "50%"'))
+    assert "EXISTS (SELECT 1" in sql and "LIKE lower(" in sql
+
+
+def test_values_are_typed():
+    condition = compile_filter(Event, 'event_start_date >= "2030-01-01 08:00"')
+    assert condition.right.value == datetime(2030, 1, 1, 8)
+    condition = compile_filter(Employee, "department = Support")
+    assert condition.right.value is DepartmentEnum.SUPPORT
+
+
+@pytest.mark.parametrize("text, message", [
+    ("password_hash = 'x'", "Unknown field 'password_hash'"),
+    ("sales_contact.password_hash = 'x'", "Unknown field"),
+    ("payments.amount > 1", "Unknown relation 'payments'"),
+    ('total_amount > "many"', "Invalid value 'many'"),
+    ("total_amount ~ 'x'", "only applies to text"),
+    ("date_created > 2025", "expects a quoted date"),
+    ("(total_amount > 1", "Unexpected end"),
+    ("total_amount > 1 1", "Unexpected '1'"),
+    ("total_amount ; 1", "Unexpected character"),
+    ("client = 1", "is an entity"),
+    ("  ", "empty"),
+])
+def test_invalid_filters(text, message):
+    with pytest.raises(FilterError, match=message):
+        compile_filter(Contract, text)
+
+
+def test_filters_list_queries(db_session):
+    manager = make_employee(db_session, DepartmentEnum.MANAGEMENT)
+    make_employee(db_session, DepartmentEnum.SUPPORT, email="support@epic.com")
+    paid = make_contract(db_session, manager, total=500, remaining=0)
+    big = make_contract(db_session, manager, total=5000, remaining=2000,
+                        email="big@globex.com")
+    big.client.company_name = "Globex"
+    db_session.commit()
+
+    rows = get_all_contracts(
+        where='remaining_amount > 1000 and client.company_name ~ "glob"',
+        projection=True, current_user=manager,
+    )
+    assert [row.contract_id for row in rows] == [big.contract_id]
+    contracts = get_all_contracts(where="remaining_amount = 0", current_user=manager)
+    assert [contract.contract_id for contract in contracts] == [paid.contract_id]
+    assert [e.email for e in get_all_employees(
+        where="department = support", current_user=manager
+    )] == ["support@epic.com"]
+
+    # Same text: compiled once
+    assert compile_filter(Contract, "remaining_amount = 0") is compile_filter(
+        Contract, "remaining_amount = 0")
+    assert db_session.scalars(
+        select(Contract).where(compile_filter(Contract, "sales_contact is null"))
+    ).all() == []
@@ -0,0 +1,64 @@
+from EpicEventsCRM.models import DepartmentEnum
+from services.data_access import get_all_contracts, select_contracts, select_events
+from services.list_services import (
+    list_contracts, parse_columns, parse_sort, CONTRACT_COLUMNS,
+)
+from services import list_services
+from tests.factories import make_employee, make_contract
+from rich.console import Console
+import pytest
+
+
+def test_narrow_listing_needs_no_join():
+    sql = str(select_contracts(
+        projection=True, fields=["contract_id", "total_amount"]
+    )).upper()
+    assert "JOIN" not in sql
+    assert "REMAINING_AMOUNT" not in sql
+
+    sql = str(select_events(
+        projection=True, fields=["event_id"], sort=[("client_name", False)]
+    )).upper()
+    assert sql.count("JOIN") == 1 and "ORDER BY CLIENTS.FULL_NAME" in sql
+
+
+def test_sort_is_applied_in_sql(db_session):
+    manager = make_employee(db_session, DepartmentEnum.MANAGEMENT)
+    for email, remaining in (("a@acme.com", 10), ("b@acme.com", 30),
+                             ("c@acme.com", 20)):
+        make_contract(db_session, manager, remaining=remaining, email=email)
+
+    rows = get_all_contracts(
+        projection=True, fields=["contract_id", "remaining_amount"],
+        sort=[("remaining_amount", True)], current_user=manager,
+    )
+    assert [row.remaining_amount for row in rows] == [30, 20, 10]
+    assert rows[0]._fields == ("contract_id", "remaining_amount")
+
+
+def test_unknown_field_is_rejected():
+    with pytest.raises(ValueError, match="Unknown field"):
+        select_contracts(projection=True, fields=["password_hash"])
+
+
+def test_option_parsing():
+    assert parse_columns(CONTRACT_COLUMNS, "id, total") == ["id", "total"]
+    assert parse_sort(CONTRACT_COLUMNS, "status,id:desc") == [
+        ("status", False), ("id", True),
+    ]
+    with pytest.raises(ValueError, match="Unknown column"):
+        parse_columns(CONTRACT_COLUMNS, "id,secret")
+    with pytest.raises(ValueError, match="Invalid sort"):
+        parse_sort(CONTRACT_COLUMNS, "id:up")
+
+
+def test_selected_columns_are_rendered(db_session, monkeypatch, capsys):
+    manager = make_employee(db_session, DepartmentEnum.MANAGEMENT)
+    make_contract(db_session, manager)
+    monkeypatch.setattr("services.data_access.get_current_user", lambda: manager)
+    monkeypatch.setattr(list_services, "console", Console(width=200))
+
+    list_contracts(columns=["client", "remaining"], sort=[("client", False)])
+    output = capsys.readouterr().out
+    assert "Bob Client" in output and "1000.00€" in output
+    assert "Contract ID" not in output and "Sales Contact" not in output
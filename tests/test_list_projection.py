@@ -0,0 +1,51 @@
+from EpicEventsCRM.models import DepartmentEnum, Event
+from services.data_access import (
+    get_all_clients,
+    get_all_contracts,
+    get_all_events,
+    select_contracts,
+    CONTRACT_ROW_FIELDS,
+)
+from services import list_services
+from tests.factories import make_employee, make_contract
+from sqlalchemy.engine import Row
+from rich.console import Console
+from datetime import datetime
+
+
+def test_projection_rows_carry_joined_names(db_session):
+    manager = make_employee(db_session, DepartmentEnum.MANAGEMENT)
+    make_contract(db_session, manager)
+
+    [row] = get_all_contracts(projection=True, current_user=manager)
+    assert isinstance(row, Row)
+    assert row._fields == tuple(CONTRACT_ROW_FIELDS)
+    assert (row.client_name, row.sales_contact_name) == ("Bob Client", "Alice Martin")
+    [client] = get_all_clients(projection=True, current_user=manager)
+    assert client.company_name == "Acme"
+
+
+def test_each_related_table_is_joined_once(db_session):
+    sql = str(select_contracts(not_paid=True, projection=True)).upper()
+    assert sql.count("JOIN CLIENTS") == 1 and sql.count("JOIN EMPLOYEES") == 1
+
+
+def test_event_rows_are_rendered(db_session, monkeypatch, capsys):
+    manager = make_employee(db_session, DepartmentEnum.MANAGEMENT)
+    support = make_employee(db_session, DepartmentEnum.SUPPORT, email="s@epic.com")
+    contract = make_contract(db_session, manager)
+    db_session.add(Event(
+        event_name="Launch", contract=contract, client=contract.client,
+        support_contact=support, location="Paris", attendees=10,
+        event_start_date=datetime(2030, 1, 1), event_end_date=datetime(2030, 1, 2),
+    ))
+    db_session.commit()
+
+    [row] = get_all_events(projection=True, current_user=manager)
+    assert row.support_contact_name == "Alice Martin"
+
+    monkeypatch.setattr("services.data_access.get_current_user", lambda: manager)
+    monkeypatch.setattr(list_services, "console", Console(width=200))
+    list_services.list_events()
+    output = capsys.readouterr().out
+    assert "Launch" in output and "Bob Client" in output
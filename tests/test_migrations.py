@@ -0,0 +1,116 @@
+from sqlalchemy import create_engine, event, inspect, text
+from db.migrations.ops import Operations
+from db.initialize_db import initialize_database
+from EpicEventsCRM.models import Base
+from db import migrations, database
+import pytest
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'crm.db'}")
+    yield engine
+    engine.dispose()
+
+
+def _schema(engine) -> dict:
+    inspector = inspect(engine)
+    return {
+        table: (
+            sorted(column["name"] for column in inspector.get_columns(table)),
+            sorted(index["name"] for index in inspector.get_indexes(table)),
+        )
+        for table in inspector.get_table_names()
+        if table != migrations.migrations_table.name
+    }
+
+
+def test_migrations_build_the_schema_of_the_models(engine):
+    applied = migrations.upgrade(engine, echo=lambda message: None)
+
+    assert [m.version for m in applied] == [
+        m.version for m in migrations.load_migrations()
+    ]
+    assert migrations.upgrade(engine) == []
+    models = create_engine("sqlite://")
+    Base.metadata.create_all(models)
+    assert _schema(engine) == _schema(models)
+
+
+def test_existing_rows_are_backfilled(engine):
+    # A database created before the migrations, with the baseline schema
+    migrations.upgrade(engine, "0001", echo=lambda message: None)
+    with engine.begin() as connection:
+        connection.execute(migrations.migrations_table.delete())
+        connection.execute(text(
+            "INSERT INTO employees (first_name, last_name, email, password_hash, "
+            "phone_number, department) VALUES ('Alice', 'Smith', 'a@epic.com', "
+            "'x', '0600000000', 'COMMERCIAL')"
+        ))
+        connection.execute(text(
+            "INSERT INTO clients (full_name, email, phone_number, company_name, "
+            "date_created, sales_contact_id) VALUES ('Bob', 'b@acme.com', "
+            "'0600000001', 'Acme', '2024-01-02 10:00:00.000000', 1)"
+        ))
+        # Inserted without the Python default of date_created
+        connection.execute(text(
+            "INSERT INTO clients (full_name, email, phone_number, company_name, "
+            "sales_contact_id) VALUES ('Dan', 'd@acme.com', '0600000003', 'Acme', 1)"
+        ))
+
+    migrations.upgrade(engine, echo=lambda message: None)
+
+    with engine.begin() as connection:
+        client, undated = connection.execute(
+            text("SELECT * FROM clients ORDER BY client_id")
+        ).mappings()
+        assert client["version_id"] == 1
+        assert client["created_at"] == "2024-01-02 10:00:00.000000"
+        assert client["updated_at"] is not None
+        assert undated["date_created"] == undated["created_at"]
+        assert undated["last_contact_date"] == undated["created_at"]
+        # Rows inserted after the migration get the defaults as well
+        connection.execute(text(
+            "INSERT INTO employees (first_name, last_name, email, password_hash, "
+            "phone_number, department) VALUES ('Carl', 'Jones', 'c@epic.com', "
+            "'x', '0600000002', 'SUPPORT')"
+        ))
+        assert connection.execute(text(
+            "SELECT COUNT(*) FROM employees WHERE created_at IS NULL"
+        )).scalar() == 0
+    assert migrations.applied_versions(engine) == {
+        m.version for m in migrations.load_migrations()
+    }
+
+
+def test_backfill_updates_in_batches(engine):
+    updates = []
+    event.listen(
+        engine, "before_cursor_execute",
+        lambda conn, cursor, statement, *args: updates.append(statement)
+        if statement.startswith("UPDATE") else None,
+    )
+    with engine.begin() as connection:
+        connection.execute(
+            text("CREATE TABLE items (item_id INTEGER PRIMARY KEY, n INT)")
+        )
+        connection.execute(text("INSERT INTO items (n) VALUES (NULL)"), [{}] * 5)
+
+        op = Operations(connection)
+        assert op.backfill("items", "item_id", {"n": "0"}, "n IS NULL", 2) == 5
+    assert len(updates) == 3
+
+
+def test_new_database_is_created_from_the_models(tmp_path, monkeypatch, capsys):
+    engine = create_engine(f"sqlite:///{tmp_path / 'new.db'}")
+    monkeypatch.setattr(database, "engine", engine)
+
+    initialize_database()
+
+    assert "created successfully" in capsys.readouterr().out
+    assert migrations.applied_versions(engine) == {
+        m.version for m in migrations.load_migrations()
+    }
+    initialize_database()
+    assert "0 migration(s) applied" in capsys.readouterr().out
+    engine.dispose()
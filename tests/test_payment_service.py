@@ -0,0 +1,121 @@
+from services.payment_service import (
+    PaymentError,
+    apply_payment,
+    apply_payment_batch,
+    read_payments_file,
+)
+from EpicEventsCRM.models import Contract, Payment
+from tests.factories import make_employee, make_contract
+from sqlalchemy import select, func
+import pytest
+
+
+def test_apply_payment_decrements_remaining_amount(db_session):
+    employee = make_employee(db_session)
+    contract = make_contract(db_session, employee, remaining=500.0)
+
+    remaining = apply_payment(
+        db_session, contract.contract_id, 200, employee.employee_id)
+    db_session.commit()
+
+    assert remaining == 300.0
+    assert db_session.get(Contract, contract.contract_id).remaining_amount == 300.0
+    assert db_session.scalar(select(func.count(Payment.payment_id))) == 1
+
+
+def test_apply_payment_rejects_overpayment(db_session):
+    employee = make_employee(db_session)
+    contract = make_contract(db_session, employee, remaining=100.0)
+
+    with pytest.raises(PaymentError):
+        apply_payment(db_session, contract.contract_id, 150)
+    db_session.rollback()
+
+    assert db_session.get(Contract, contract.contract_id).remaining_amount == 100.0
+    assert db_session.scalar(select(func.count(Payment.payment_id))) == 0
+
+
+def test_apply_payment_restricted_to_sales_contact(db_session):
+    seller = make_employee(db_session)
+    other = make_employee(db_session, email="other@epic.com")
+    contract = make_contract(db_session, seller, remaining=100.0)
+
+    with pytest.raises(PaymentError, match="not one of your contracts"):
+        apply_payment(db_session, contract.contract_id, 10,
+                      sales_contact_id=other.employee_id)
+    assert apply_payment(db_session, contract.contract_id, 10,
+                         sales_contact_id=seller.employee_id) == 90.0
+
+
+def test_apply_payment_batch_never_leaves_a_negative_balance(db_session):
+    contract = make_contract(db_session, make_employee(db_session), remaining=0.3)
+
+    apply_payment_batch(db_session, [(contract.contract_id, 0.1),
+                                     (contract.contract_id, 0.2)])
+    db_session.commit()
+    db_session.expire_all()
+
+    assert db_session.get(Contract, contract.contract_id).remaining_amount == 0
+
+
+def test_apply_payment_batch_rejects_an_excess_beyond_float_error(db_session):
+    contract = make_contract(db_session, make_employee(db_session), remaining=0.30)
+
+    with pytest.raises(PaymentError, match="exceed"):
+        apply_payment_batch(db_session, [(contract.contract_id, 0.304)])
+    with pytest.raises(PaymentError, match="exceeds"):
+        apply_payment(db_session, contract.contract_id, 0.304)
+    # The same float error as the batch is tolerated
+    assert apply_payment(db_session, contract.contract_id,
+                         0.1 + 0.2) == 0
+
+
+@pytest.mark.parametrize("amount", ["nan", "inf", float("-inf")])
+def test_non_finite_amounts_are_rejected(db_session, amount):
+    contract = make_contract(db_session, make_employee(db_session))
+
+    with pytest.raises(PaymentError, match="Invalid amount"):
+        apply_payment(db_session, contract.contract_id, amount)
+
+
+def test_apply_payment_unknown_contract(db_session):
+    with pytest.raises(PaymentError, match="not found"):
+        apply_payment(db_session, 999, 10)
+
+
+def test_apply_payment_batch_aggregates_per_contract(db_session):
+    employee = make_employee(db_session)
+    first = make_contract(db_session, employee, remaining=1000.0)
+    second = make_contract(db_session, employee, remaining=50.0,
+                           email="other@acme.com")
+
+    count = apply_payment_batch(
+        db_session,
+        [(first.contract_id, 100), (second.contract_id, 50),
+         (first.contract_id, 250.5)],
+    )
+    db_session.commit()
+    db_session.expire_all()
+
+    assert count == 3
+    assert db_session.get(Contract, first.contract_id).remaining_amount == 649.5
+    assert db_session.get(Contract, second.contract_id).remaining_amount == 0
+
+
+def test_apply_payment_batch_is_all_or_nothing(db_session):
+    employee = make_employee(db_session)
+    contract = make_contract(db_session, employee, remaining=100.0)
+
+    with pytest.raises(PaymentError):
+        apply_payment_batch(
+            db_session, [(contract.contract_id, 60), (contract.contract_id, 60)])
+    db_session.rollback()
+
+    assert db_session.get(Contract, contract.contract_id).remaining_amount == 100.0
+
+
+def test_read_payments_file(tmp_path):
+    path = tmp_path / "payments.csv"
+    path.write_text("contract_id,amount\n1,10.5\n2,20\n")
+
+    assert list(read_payments_file(path)) == [(2, 1, "10.5"), (3, 2, "20")]
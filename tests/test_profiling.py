@@ -0,0 +1,60 @@
+from services.data_access import get_all_clients
+from tests.factories import make_employee, make_contract
+from EpicEventsCRM.models import DepartmentEnum, Client
+from db.profiling import statement_shape, start_profiling, stop_profiling
+import json
+import pytest
+
+
+@pytest.fixture
+def profiler():
+    profiler = start_profiling()
+    yield profiler
+    stop_profiling()
+
+
+def test_statement_shape_collapses_whitespace_and_in_lists():
+    assert statement_shape("SELECT *\n  FROM t WHERE id IN (?, ?, ?)") == (
+        "SELECT * FROM t WHERE id IN (?)"
+    )
+
+
+def test_statements_and_hydrated_rows_are_recorded(db_session, profiler):
+    manager = make_employee(db_session, DepartmentEnum.MANAGEMENT)
+    make_contract(db_session, manager)
+    db_session.refresh(manager)
+
+    profiler.begin_command("list-clients")
+    get_all_clients(current_user=manager)
+
+    report = profiler.to_dict()
+    command = report["commands"][-1]
+    assert command["command"] == "list-clients"
+    # One SELECT with the sales contact joined in
+    assert command["statements"] == 1
+    assert command["rows_hydrated"] == {"Client": 1, "Employee": 1}
+    assert command["repeated_statements"] == []
+
+
+def test_n_plus_one_pattern_is_reported(db_session, session_factory, profiler,
+                                        tmp_path):
+    manager = make_employee(db_session, DepartmentEnum.MANAGEMENT)
+    for i in range(5):
+        make_contract(db_session, manager, email=f"c{i}@acme.com")
+
+    profiler.begin_command("lazy")
+    db = session_factory()
+    for client in db.query(Client).all():
+        # One lazy load per client
+        client.contracts
+    db.close()
+
+    repeated = profiler.repeated_statements("lazy")
+    assert len(repeated) == 1 and repeated[0][1] == 5
+
+    path = tmp_path / "profile.json"
+    stop_profiling(str(path))
+    report = json.loads(path.read_text())
+    lazy = next(c for c in report["commands"] if c["command"] == "lazy")
+    assert lazy["repeated_statements"][0]["count"] == 5
+    assert report["slowest_statements"]
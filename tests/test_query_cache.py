@@ -0,0 +1,81 @@
+from EpicEventsCRM.models import DepartmentEnum, Client, TableVersion
+from services.data_access import get_all_clients, get_all_contracts
+from services.payment_service import apply_payment_batch
+from tests.factories import make_employee, make_contract
+from db import query_cache
+from sqlalchemy import update
+import pytest
+
+
+@pytest.fixture
+def cache():
+    yield query_cache.enable_query_cache()
+    query_cache.disable_query_cache()
+
+
+def test_repeated_list_is_served_from_cache(db_session, cache):
+    manager = make_employee(db_session, DepartmentEnum.MANAGEMENT)
+    make_contract(db_session, manager)
+
+    first = get_all_clients(current_user=manager)
+    assert get_all_clients(current_user=manager) is first
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_orm_and_core_writes_invalidate(db_session, cache):
+    manager = make_employee(db_session, DepartmentEnum.MANAGEMENT)
+    contract = make_contract(db_session, manager)
+    get_all_clients(current_user=manager)
+    get_all_contracts(not_paid=True, current_user=manager)
+
+    make_contract(db_session, manager, email="other@acme.com")
+    assert len(get_all_clients(current_user=manager)) == 2
+
+    apply_payment_batch(db_session, [(contract.contract_id, 1000)])
+    db_session.commit()
+    assert len(get_all_contracts(not_paid=True, current_user=manager)) == 1
+    assert cache.hits == 0
+
+
+def test_version_counter_catches_other_writers(db_session, cache):
+    manager = make_employee(db_session, DepartmentEnum.MANAGEMENT)
+    make_contract(db_session, manager)
+    get_all_clients(current_user=manager)
+
+    # Another process: the row and the counter change, no local hook runs
+    connection = db_session.connection()
+    connection.execute(update(Client).values(company_name="Renamed"))
+    connection.execute(update(TableVersion).where(
+        TableVersion.table_name == "clients"
+    ).values(version=TableVersion.version + 1))
+    db_session.info.pop("changed_tables", None)
+    db_session.commit()
+
+    assert get_all_clients(current_user=manager)[0].company_name == "Renamed"
+    assert cache.hits == 0
+
+
+def test_key_includes_role(db_session, cache):
+    manager = make_employee(db_session, DepartmentEnum.MANAGEMENT)
+    seller = make_employee(db_session, email="seller@epic.com")
+    make_contract(db_session, seller)
+
+    get_all_clients(current_user=manager)
+    get_all_clients(current_user=seller)
+    assert (cache.hits, cache.misses) == (0, 2)
+
+
+def test_disk_cache_is_shared_across_runs(db_session, tmp_path):
+    manager = make_employee(db_session, DepartmentEnum.MANAGEMENT)
+    make_contract(db_session, manager)
+    try:
+        query_cache.enable_query_cache(cache_dir=str(tmp_path))
+        get_all_clients(current_user=manager)
+        query_cache.disable_query_cache()
+
+        cache = query_cache.enable_query_cache(cache_dir=str(tmp_path))
+        clients = get_all_clients(current_user=manager)
+        assert cache.hits == 1
+        assert clients[0].sales_contact.email == manager.email
+    finally:
+        query_cache.disable_query_cache()
@@ -0,0 +1,64 @@
+from EpicEventsCRM.utils.rate_limiter import LoginRateLimiter, LoginThrottledError
+from EpicEventsCRM.models.employee_model import ph
+from tests.factories import make_employee
+import pytest
+import auth
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_bucket_refuses_attempts_until_it_refills(tmp_path):
+    clock = Clock()
+    limiter = LoginRateLimiter(str(tmp_path / "attempts"),
+                               rules={"email": (2, 60), "host": (10, 1)}, clock=clock)
+    limiter.acquire("a@epic.com", "host")
+    limiter.acquire("A@epic.com", "host")
+    with pytest.raises(LoginThrottledError) as error:
+        limiter.acquire("a@epic.com", "host")
+    assert error.value.retry_after == pytest.approx(60)
+    # Other emails have their own bucket; the counters are shared through the file
+    LoginRateLimiter(str(tmp_path / "attempts"), clock=clock).acquire("b@epic.com")
+
+    clock.now += 60
+    limiter.acquire("a@epic.com", "host")
+
+
+def test_failures_back_off_exponentially(monkeypatch):
+    monkeypatch.setattr("EpicEventsCRM.utils.rate_limiter.BACKOFF_AFTER", 2)
+    clock = Clock()
+    limiter = LoginRateLimiter(None, rules={"email": (100, 1), "host": (100, 1)},
+                               clock=clock)
+    limiter.record_failure("a@epic.com")
+    limiter.acquire("a@epic.com")
+    limiter.record_failure("a@epic.com")
+    limiter.record_failure("a@epic.com")
+    with pytest.raises(LoginThrottledError) as error:
+        limiter.acquire("a@epic.com")
+    assert error.value.retry_after == pytest.approx(4)
+
+    limiter.record_success("a@epic.com")
+    limiter.acquire("a@epic.com")
+
+
+def test_throttled_login_skips_the_password_check(db_session, monkeypatch):
+    employee = make_employee(db_session)
+    limiter = LoginRateLimiter(None, rules={"email": (1, 60), "host": (10, 1)})
+    monkeypatch.setattr(auth, "login_limiter", limiter)
+    checks = []
+    monkeypatch.setattr(type(employee), "verify_password",
+                        lambda self, password: checks.append(password) or False)
+
+    assert auth.authenticate(employee.email, "wrong") is None
+    with pytest.raises(LoginThrottledError):
+        auth.authenticate(employee.email, "wrong")
+    assert checks == ["wrong"]
+
+
+def test_dummy_hash_costs_as_much_as_a_real_one():
+    assert not ph.check_needs_rehash(auth.DUMMY_PASSWORD_HASH)
@@ -0,0 +1,185 @@
+from EpicEventsCRM.models import (
+    AuditLog, Base, Employee, Client, Contract, DepartmentEnum,
+)
+from db.replica import (
+    make_replica_sessionmaker, initialize_replica, pending_writes,
+    OfflineWriteError,
+)
+from db.database import configure_sqlite
+from services.replica_service import sync, pull, MASKED_PASSWORD_HASH
+from tests.factories import make_employee, make_contract
+from sqlalchemy import create_engine, select, update
+from sqlalchemy.orm import sessionmaker
+from datetime import timedelta
+import json
+import pytest
+
+
+@pytest.fixture
+def central(tmp_path):
+    engine = configure_sqlite(create_engine(f"sqlite:///{tmp_path / 'central.db'}"))
+    Base.metadata.create_all(engine)
+    yield sessionmaker(bind=engine)
+    engine.dispose()
+
+
+@pytest.fixture
+def local(tmp_path):
+    engine = configure_sqlite(create_engine(f"sqlite:///{tmp_path / 'replica.db'}"))
+    initialize_replica(engine)
+    yield make_replica_sessionmaker(engine)
+    engine.dispose()
+
+
+@pytest.fixture
+def seller(central):
+    db = central()
+    seller = make_employee(db)
+    make_employee(db, DepartmentEnum.SUPPORT, email="support@epic.com")
+    make_contract(db, seller)
+    db.refresh(seller)
+    db.expunge(seller)
+    db.close()
+    return seller
+
+
+def _rows(factory, model):
+    db = factory()
+    try:
+        return db.scalars(select(model).order_by(*model.__mapper__.primary_key)).all()
+    finally:
+        db.close()
+
+
+def test_pull_copies_only_deltas(central, local, seller):
+    report = sync(central, local, seller)["pulled"]
+    assert report == {"Employee": (2, 0), "Client": (1, 0),
+                      "Contract": (1, 0), "Event": (0, 0)}
+    employees = _rows(local, Employee)
+    assert employees[0].password_hash == "not-a-real-hash"
+    assert employees[1].password_hash == MASKED_PASSWORD_HASH
+
+    db = central()
+    db.execute(update(Contract).values(remaining_amount=10.0,
+                                       version_id=Contract.version_id + 1))
+    db.commit()
+    replica_db = local()
+    assert pull(db, replica_db, seller)["Contract"] == (1, 0)
+    assert pull(db, replica_db, seller)["Contract"] == (0, 0)
+    replica_db.commit()
+    replica_db.close()
+    db.close()
+    assert _rows(local, Contract)[0].remaining_amount == 10.0
+
+
+def test_pull_fetches_rows_committed_late(central, local, seller):
+    sync(central, local, seller)
+    high_water = _rows(local, Contract)[0].updated_at
+
+    # A transaction started before the sync and committed after it
+    db = central()
+    db.execute(update(Contract).values(
+        remaining_amount=20.0, version_id=Contract.version_id + 1,
+        updated_at=high_water - timedelta(seconds=30),
+    ))
+    db.commit()
+    db.close()
+
+    assert sync(central, local, seller)["pulled"]["Contract"] == (1, 0)
+    assert _rows(local, Contract)[0].remaining_amount == 20.0
+
+
+def test_offline_creations_are_replayed_with_central_ids(central, local, seller):
+    sync(central, local, seller)
+
+    db = local()
+    client = Client(full_name="New Client", email="new@acme.com",
+                    phone_number="0600000001", company_name="New",
+                    sales_contact_id=seller.employee_id)
+    db.add(Contract(total_amount=500.0, remaining_amount=500.0, is_signed=False,
+                    client=client, sales_contact_id=seller.employee_id))
+    db.commit()
+    assert client.client_id < 0
+    client.company_name = "Renamed"
+    db.commit()
+    queued = db.execute(select(pending_writes.c.operation)).scalars().all()
+    db.close()
+    # The later update was folded into the queued insert
+    assert queued == ["insert", "insert"]
+
+    result = sync(central, local, seller)
+    assert result["applied"] == 2 and result["conflicts"] == []
+
+    contracts = _rows(central, Contract)
+    clients = _rows(central, Client)
+    assert clients[-1].company_name == "Renamed" and clients[-1].client_id > 0
+    assert contracts[-1].client_id == clients[-1].client_id
+    assert [c.client_id for c in _rows(local, Client)] == [
+        c.client_id for c in clients]
+
+
+def test_concurrent_update_is_reported_as_conflict(central, local, seller):
+    sync(central, local, seller)
+
+    db = local()
+    db.scalars(select(Client)).one().company_name = "Offline name"
+    db.commit()
+    db.close()
+
+    db = central()
+    db.scalars(select(Client)).one().company_name = "Central name"
+    db.commit()
+    db.close()
+
+    result = sync(central, local, seller)
+    assert result["applied"] == 0
+    (conflict,) = result["conflicts"]
+    assert ("company_name", "Acme", "Central name", "Offline name") in conflict.diff
+    # The central version wins, in both databases
+    assert _rows(central, Client)[0].company_name == "Central name"
+    assert _rows(local, Client)[0].company_name == "Central name"
+
+
+def test_offline_update_without_conflict_is_applied(central, local, seller):
+    sync(central, local, seller)
+
+    db = local()
+    db.scalars(select(Contract)).one().is_signed = False
+    db.commit()
+    db.close()
+
+    assert sync(central, local, seller)["applied"] == 1
+    contract = _rows(central, Contract)[0]
+    assert contract.is_signed is False and contract.version_id == 2
+
+
+def test_pushed_writes_are_audited(central, local, seller):
+    sync(central, local, seller)
+    db = central()
+    before = len(db.scalars(select(AuditLog)).all())
+    db.close()
+
+    db = local()
+    db.scalars(select(Contract)).one().is_signed = False
+    db.add(Client(full_name="New Client", email="new@acme.com",
+                  phone_number="0600000001", company_name="New",
+                  sales_contact_id=seller.employee_id))
+    db.commit()
+    db.close()
+    sync(central, local, seller)
+
+    created, updated = _rows(central, AuditLog)[before:]
+    assert (updated.entity, updated.operation) == ("Contract", "update")
+    assert json.loads(updated.changes) == {"is_signed": [True, False]}
+    assert (created.entity, created.operation) == ("Client", "create")
+    assert created.entity_id == _rows(central, Client)[-1].client_id
+    assert json.loads(created.changes)["company_name"] == [None, "New"]
+
+
+def test_employees_cannot_be_changed_offline(central, local, seller):
+    sync(central, local, seller)
+    db = local()
+    db.get(Employee, seller.employee_id).first_name = "Changed"
+    with pytest.raises(OfflineWriteError):
+        db.commit()
+    db.close()
@@ -0,0 +1,80 @@
+from EpicEventsCRM.models import DepartmentEnum, Event
+from services.data_access import (
+    get_all_clients,
+    get_all_contracts,
+    get_all_events,
+    get_clients_changed_since,
+)
+from services import data_access
+from tests.factories import make_employee, make_contract
+from datetime import datetime
+import pytest
+
+
+@pytest.fixture
+def portfolio(db_session, monkeypatch):
+    monkeypatch.setattr(data_access, "ROW_SCOPING", True)
+    manager = make_employee(db_session, DepartmentEnum.MANAGEMENT, email="m@epic.com")
+    alice = make_employee(db_session, email="alice@epic.com")
+    bob = make_employee(db_session, email="bob@epic.com")
+    support = make_employee(db_session, DepartmentEnum.SUPPORT, email="s@epic.com")
+    other_support = make_employee(db_session, DepartmentEnum.SUPPORT,
+                                  email="t@epic.com")
+    mine = make_contract(db_session, alice, email="mine@acme.com")
+    make_contract(db_session, bob, email="theirs@acme.com")
+    for contact in (support, other_support):
+        db_session.add(Event(
+            event_name=f"Event of {contact.email}", contract=mine,
+            client=mine.client,
+            support_contact=contact, location="Paris", attendees=10,
+            event_start_date=datetime(2030, 1, 1), event_end_date=datetime(2030, 1, 2),
+        ))
+    db_session.commit()
+    return manager, alice, support, mine
+
+
+def test_commercial_sees_own_portfolio(portfolio):
+    manager, alice, _, mine = portfolio
+    clients = get_all_clients(current_user=alice)
+    assert [c.client_id for c in clients] == [mine.client_id]
+    rows = get_all_contracts(projection=True, current_user=alice)
+    assert [(r.contract_id, r.client_name) for r in rows] == [
+        (mine.contract_id, "Bob Client"),
+    ]
+    assert len(get_clients_changed_since(datetime(2000, 1, 1), current_user=alice)) == 1
+    assert len(get_all_clients(current_user=manager)) == 2
+
+
+def test_support_sees_own_events(portfolio):
+    manager, alice, support, _ = portfolio
+    events = get_all_events(projection=True, current_user=support)
+    assert [e.event_name for e in events] == ["Event of s@epic.com"]
+    # Only the scoped entities are restricted
+    assert len(get_all_clients(current_user=support)) == 2
+    assert len(get_all_events(current_user=alice)) == 2
+
+
+def test_scoping_is_optional(portfolio, monkeypatch):
+    _, alice, _, _ = portfolio
+    monkeypatch.setattr(data_access, "ROW_SCOPING", False)
+    assert len(get_all_clients(current_user=alice)) == 2
+
+
+def test_scope_does_not_hide_related_rows(portfolio, db_session):
+    manager, alice, support, _ = portfolio
+    theirs = get_all_contracts(current_user=manager)[1]
+    db_session.add(Event(
+        event_name="Event of another seller", contract_id=theirs.contract_id,
+        client_id=theirs.client_id, support_contact_id=support.employee_id,
+        location="Lyon", attendees=5,
+        event_start_date=datetime(2031, 1, 1), event_end_date=datetime(2031, 1, 2),
+    ))
+    db_session.commit()
+    # The commercial sees every event, with its client even if not theirs
+    events = get_all_events(current_user=alice)
+    assert {e.client.email for e in events} == {"mine@acme.com", "theirs@acme.com"}
+    rows = get_all_events(projection=True, current_user=alice)
+    assert None not in [r.client_name for r in rows]
+    # The support sees their events with the client of another seller
+    events = get_all_events(current_user=support)
+    assert [e.client.email for e in events] == ["mine@acme.com", "theirs@acme.com"]
@@ -0,0 +1,133 @@
+from EpicEventsCRM.controllers.script_runner import run_script
+from EpicEventsCRM.views.messages import display_error
+import click
+import auth
+import io
+
+
+calls = []
+
+
+@click.group()
+def fake_cli():
+    pass
+
+
+@fake_cli.command(name="greet")
+@click.argument("name")
+def greet(name):
+    calls.append((name, auth.get_current_user()))
+
+
+@fake_cli.command(name="boom")
+def boom():
+    raise RuntimeError("database unavailable")
+
+
+@fake_cli.command(name="missing")
+def missing():
+    display_error("Client not found.")
+
+
+@fake_cli.command(name="status-2")
+@click.pass_context
+def status_2(ctx):
+    ctx.exit(2)
+
+
+@fake_cli.command(name="ask")
+def ask():
+    calls.append((click.prompt("Name"), None))
+
+
+class _FakeSession:
+    def __init__(self, user):
+        self.user = user
+
+    def scalar(self, statement, params):
+        return self.user
+
+    def close(self):
+        pass
+
+
+def _pin(monkeypatch, user):
+    """Fakes a stored token of ``user``; returns the list of token lookups."""
+    lookups = []
+
+    def fake_load_token():
+        lookups.append(user)
+        return "token" if user else None
+
+    monkeypatch.setattr(auth, "load_token", fake_load_token)
+    monkeypatch.setattr(auth, "decode_token", lambda token: {"employee_id": 1})
+    monkeypatch.setattr(auth, "get_db", lambda: iter([_FakeSession(user)]))
+    monkeypatch.setattr(auth.audit, "set_actor", lambda employee_id: None)
+    return lookups
+
+
+def test_run_script_reports_failures_per_line(monkeypatch, capsys):
+    lookups = _pin(monkeypatch, "alice")
+    calls.clear()
+    script = [
+        "# nightly job\n",
+        "greet bob\n",
+        "\n",
+        "boom\n",
+        "unknown-command\n",
+        "greet 'carol smith'\n",
+        "login\n",
+    ]
+
+    failed = run_script(fake_cli, script)
+
+    output = capsys.readouterr().out
+    assert failed == 3
+    assert [name for name, _ in calls] == ["bob", "carol smith"]
+    # The user is resolved once for the whole script
+    assert len(lookups) == 1
+    assert "Line 4" in output and "database unavailable" in output
+    assert "Line 5" in output
+    assert "Line 7" in output
+
+
+def test_run_script_stops_on_error(monkeypatch):
+    _pin(monkeypatch, "alice")
+    calls.clear()
+
+    failed = run_script(fake_cli, ["boom", "greet bob"], stop_on_error=True)
+
+    assert failed == 1
+    assert calls == []
+
+
+def test_run_script_requires_login(monkeypatch):
+    _pin(monkeypatch, None)
+    calls.clear()
+
+    assert run_script(fake_cli, ["greet bob"]) == 1
+    assert calls == []
+
+
+def test_run_script_counts_reported_errors_and_exit_status(monkeypatch, capsys):
+    _pin(monkeypatch, "alice")
+
+    failed = run_script(fake_cli, ["missing", "status-2", "greet bob"])
+
+    output = capsys.readouterr().out
+    assert failed == 2
+    assert "Line 1" in output and "Client not found." in output
+    assert "Line 2" in output and "Exited with status 2." in output
+
+
+def test_prompts_do_not_read_a_script_from_stdin(monkeypatch, capsys):
+    _pin(monkeypatch, "alice")
+    calls.clear()
+    script = io.StringIO("ask\ngreet bob\n")
+    monkeypatch.setattr("sys.stdin", script)
+
+    failed = run_script(fake_cli, script, from_stdin=True)
+
+    assert failed == 1
+    assert [name for name, _ in calls] == ["bob"]
+    assert "Aborted (input required)." in capsys.readouterr().out
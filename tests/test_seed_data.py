@@ -0,0 +1,45 @@
+from EpicEventsCRM.models import Employee, Client, Contract, Event, DepartmentEnum
+from scripts.seed_data import seed, scale_counts, SEED_PASSWORD
+from sqlalchemy import select, func
+
+
+def _count(db, model):
+    return db.scalar(select(func.count()).select_from(model))
+
+
+def test_seed_generates_linked_rows(db_session):
+    counts = scale_counts(200)
+    users = seed(db_session, counts)
+    db_session.commit()
+
+    assert _count(db_session, Employee) == counts["employees"]
+    assert _count(db_session, Client) == 200
+    assert _count(db_session, Contract) == counts["contracts"]
+    assert _count(db_session, Event) == counts["events"]
+
+    # Clients belong to salespeople, events to support on signed contracts
+    assert db_session.scalar(
+        select(func.count()).select_from(Client).join(Client.sales_contact)
+        .where(Employee.department != DepartmentEnum.COMMERCIAL)
+    ) == 0
+    assert db_session.scalar(
+        select(func.count()).select_from(Event).join(Event.contract)
+        .where(Contract.is_signed.is_(False))
+    ) == 0
+
+    manager = db_session.get(Employee, users[DepartmentEnum.MANAGEMENT])
+    assert manager.department == DepartmentEnum.MANAGEMENT
+    assert manager.verify_password(SEED_PASSWORD)
+
+
+def test_seed_appends_and_is_reproducible(db_session):
+    seed(db_session, scale_counts(50), seed_value=1)
+    first = db_session.scalars(select(Contract.total_amount)).all()
+    seed(db_session, scale_counts(50), seed_value=1)
+    db_session.commit()
+
+    assert _count(db_session, Client) == 100
+    amounts = db_session.scalars(
+        select(Contract.total_amount).order_by(Contract.contract_id)
+    ).all()
+    assert amounts[len(first):] == first
@@ -0,0 +1,48 @@
+from EpicEventsCRM.models import Base, Client
+from db.database import configure_sqlite, is_sqlite, engine_options
+from sqlalchemy import create_engine
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+import pytest
+
+
+@pytest.fixture
+def file_engine(tmp_path):
+    engine = configure_sqlite(create_engine(f"sqlite:///{tmp_path / 'crm.db'}"))
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+def test_is_sqlite():
+    assert is_sqlite("sqlite:///crm.db")
+    assert is_sqlite("sqlite+aiosqlite:///crm.db")
+    assert not is_sqlite("postgresql+psycopg2://localhost/crm")
+
+
+def test_server_side_prepared_statements_with_psycopg3():
+    options = engine_options("postgresql+psycopg://localhost/crm")
+    assert options["connect_args"]["prepare_threshold"] >= 0
+    assert engine_options("postgresql+psycopg2://localhost/crm") == {}
+    assert engine_options("sqlite:///crm.db") == {}
+
+
+def test_pragmas_are_applied_to_every_connection(file_engine):
+    with file_engine.connect() as connection:
+        def pragma(name):
+            return connection.exec_driver_sql(f"PRAGMA {name}").scalar()
+
+        assert pragma("journal_mode") == "wal"
+        # NORMAL
+        assert pragma("synchronous") == 1
+        assert pragma("foreign_keys") == 1
+        assert pragma("cache_size") == -64000
+        assert pragma("busy_timeout") == 5000
+
+
+def test_foreign_keys_are_enforced(file_engine):
+    with Session(file_engine) as db:
+        db.add(Client(full_name="Bob", email="bob@acme.com", phone_number="06",
+                      company_name="Acme", sales_contact_id=999))
+        with pytest.raises(IntegrityError):
+            db.commit()
@@ -0,0 +1,39 @@
+from services.updates import (
+    UpdateConflictError,
+    load_for_update,
+    commit_versioned_update,
+)
+from EpicEventsCRM.models import Contract
+from tests.factories import make_employee, make_contract
+import pytest
+
+
+def test_commit_versioned_update_applies_changes(db_session):
+    contract = make_contract(db_session, make_employee(db_session))
+    loaded = load_for_update(Contract, contract.contract_id)
+
+    commit_versioned_update(loaded, {"is_signed": False, "remaining_amount": 10.0})
+
+    db_session.expire_all()
+    saved = db_session.get(Contract, contract.contract_id)
+    assert saved.remaining_amount == 10.0
+    assert saved.is_signed is False
+    assert saved.version_id == loaded.version_id + 1
+
+
+def test_commit_versioned_update_detects_concurrent_edit(db_session):
+    contract = make_contract(db_session, make_employee(db_session))
+    loaded = load_for_update(Contract, contract.contract_id)
+
+    # Someone else saves the contract while the first user is typing
+    contract.remaining_amount = 400.0
+    db_session.commit()
+
+    with pytest.raises(UpdateConflictError) as excinfo:
+        commit_versioned_update(loaded, {"remaining_amount": 900.0})
+
+    diff = {field: (before, now, mine)
+            for field, before, now, mine in excinfo.value.diff}
+    assert diff["remaining_amount"] == (1000.0, 400.0, 900.0)
+    db_session.expire_all()
+    assert db_session.get(Contract, contract.contract_id).remaining_amount == 400.0